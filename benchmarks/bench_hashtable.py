@@ -0,0 +1,59 @@
+# Microbenchmark comparing ChainHashTable and OpenAddressHashTable against the built-in dict for insert, search and
+# remove at growing sizes. Run from the repository root:
+#     python -m benchmarks.bench_hashtable [size ...]
+import random
+import sys
+import time
+
+from wgups.hashtable import ChainHashTable, OpenAddressHashTable
+
+SIZES = [1000, 10000, 50000, 200000]
+
+
+# dict wrapped in the hash table interface so every table runs the same benchmark code.
+class DictTable:
+    def __init__(self):
+        self.d = {}
+
+    def insert(self, key, item):
+        self.d[key] = item
+
+    def search(self, key):
+        return self.d.get(key)
+
+    def remove(self, key):
+        self.d.pop(key, None)
+
+
+# Returns the seconds taken to call fn once for every key.
+def timed(fn, keys):
+    start = time.perf_counter()
+    for k in keys:
+        fn(k)
+    return time.perf_counter() - start
+
+
+def run(size, make_table):
+    rng = random.Random(size)
+    keys = list(range(1, size + 1))
+    rng.shuffle(keys)
+    lookups = [rng.randint(1, 2 * size) for i in range(size)]  # roughly half hits, half misses
+    table = make_table()
+    insert = timed(lambda k: table.insert(k, k), keys)
+    search = timed(table.search, lookups)
+    remove = timed(table.remove, keys[:size // 2])
+    return insert, search, remove
+
+
+def main(sizes):
+    tables = [('dict', DictTable), ('ChainHashTable', ChainHashTable), ('OpenAddressHashTable', OpenAddressHashTable)]
+    print("%-22s %9s %14s %14s %14s" % ('table', 'size', 'insert ns/op', 'search ns/op', 'remove ns/op'))
+    for size in sizes:
+        for name, make_table in tables:
+            insert, search, remove = run(size, make_table)
+            print("%-22s %9d %14.0f %14.0f %14.0f" % (
+                name, size, insert / size * 1e9, search / size * 1e9, remove / (size // 2) * 1e9))
+
+
+if __name__ == '__main__':
+    main([int(s) for s in sys.argv[1:]] or SIZES)
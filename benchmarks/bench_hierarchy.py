@@ -0,0 +1,81 @@
+# Point-to-point shortest path queries on a generated street grid (see benchmarks.synthetic.grid_graph): plain
+# Dijkstra stopping at the target (the baseline of the speedups), A* towards it, bidirectional Dijkstra and a
+# contraction hierarchy, which is built once, saved and loaded back before it is queried. Every answer is checked
+# against a full Dijkstra search. Run from the repository root:
+#     python -m benchmarks.bench_hierarchy [--width W] [--queries Q] [--seed S]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import grid_graph
+from wgups.contraction import build_hierarchy, load_hierarchy
+from wgups.graph import astar, bidirectional_dijkstra, coordinate_heuristic, dijkstra
+
+WIDTH = 60
+QUERIES = 200
+
+
+def _option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+
+# Returns (seconds, [result]) of calling query(s, t) for every pair.
+def timed(query, pairs):
+    start = time.perf_counter()
+    results = [query(s, t) for s, t in pairs]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    width = int(_option(argv, '--width', WIDTH))
+    queries = int(_option(argv, '--queries', QUERIES))
+    rng = random.Random(int(_option(argv, '--seed', 0)))
+    graph, coords = grid_graph(width, rng.randrange(1 << 30))
+    cgraph = graph.compact()
+    n = len(cgraph)
+    pairs = [(rng.randrange(n), rng.randrange(n)) for i in range(queries)]
+    # the shortest block is 0.1 miles per grid step, so a tenth of the straight line never overestimates
+    heuristics = {t: coordinate_heuristic(coords, t, 0.1) for s, t in pairs}
+
+    start = time.perf_counter()
+    hierarchy = build_hierarchy(cgraph)
+    built = time.perf_counter() - start
+    path = os.path.join(tempfile.mkdtemp(prefix='wgups-ch-'), 'grid.ch')
+    hierarchy.save(path)
+    start = time.perf_counter()
+    hierarchy = load_hierarchy(path)
+    loaded = time.perf_counter() - start
+    print("%dx%d grid: %d vertices, %d edges, %d shortcuts" % (width, width, n, len(cgraph.targets),
+                                                               hierarchy.shortcut_count))
+    print("    %-24s %10.4f s" % ('build hierarchy', built))
+    print("    %-24s %10.4f s  (%d bytes)" % ('load hierarchy', loaded, os.path.getsize(path)))
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+    # answers come from full searches, so a search stopping early is checked too
+    full, expected = timed(lambda s, t: dijkstra(cgraph, s)[0][t], pairs)
+    runs = [
+        ('dijkstra to target', lambda s, t: dijkstra(cgraph, s, (t,))[0][t]),
+        ('astar', lambda s, t: astar(cgraph, s, t, heuristics[t])[0]),
+        ('bidirectional', lambda s, t: bidirectional_dijkstra(cgraph, s, t)[0]),
+        ('hierarchy distance', hierarchy.distance),
+        ('hierarchy path', lambda s, t: hierarchy.path(s, t)[0]),
+    ]
+    print("    %-24s %14s %10s" % ('query', 'us per query', 'speedup'))
+    print("    %-24s %14.1f" % ('dijkstra full search', full / queries * 1e6))
+    baseline = None
+    for name, query in runs:
+        seconds, results = timed(query, pairs)
+        wrong = sum(1 for got, want in zip(results, expected) if abs(got - want) > 1e-9 and got != want)
+        if baseline is None:
+            baseline = seconds
+        print("    %-24s %14.1f %9.1fx%s" % (name, seconds / queries * 1e6, baseline / seconds,
+                                              '  (%d wrong)' % wrong if wrong else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# Measures memory per package for three ways of holding a manifest: a plain class with a __dict__ (the old Package),
+# the __slots__ Package, and the columnar PackageStore. Packages are generated from the rows of packages.csv with new
+# IDs, so values repeat the way they do in a real day's manifest. Run from the repository root:
+#     python -m benchmarks.bench_package_memory [count]
+import csv
+import gc
+import sys
+import tracemalloc
+
+from wgups.package import Package, PackageStore
+
+
+# The Package class as it was before __slots__, for comparison.
+class DictPackage:
+    def __init__(self, p_id, address, city, state, zipcode, deadline, mass_k, note, truck, status, time_mod):
+        self.p_id = p_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zipcode = zipcode
+        self.deadline = deadline
+        self.mass_k = mass_k
+        self.note = note
+        self.truck = truck
+        self.status = status
+        self.time_mod = time_mod
+
+
+# Yields count package rows cycling through packages.csv. Each field is copied into a fresh string, as csv.reader
+# would produce when reading a file of that size.
+def rows(count):
+    with open('packages.csv', newline='') as f:
+        base = list(csv.reader(f))
+    for i in range(count):
+        row = base[i % len(base)]
+        yield [i + 1] + [''.join(list(field)) for field in row[1:8]]
+
+
+# Returns the bytes still allocated after build(count) returns its result.
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    kept = build(count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def build_dict(count):
+    return [DictPackage(*row, None, "at the hub", '08:00') for row in rows(count)]
+
+
+def build_slots(count):
+    return [Package(*row[:2], sys.intern(row[2]), sys.intern(row[3]), sys.intern(row[4]), sys.intern(row[5]),
+                    *row[6:], None, "at the hub", '08:00') for row in rows(count)]
+
+
+def build_store(count):
+    store = PackageStore()
+    for row in rows(count):
+        store.append(*row, time_mod=480)
+    return store
+
+
+def main(count):
+    print("%-24s %14s %12s" % ('representation', 'total bytes', 'bytes/pkg'))
+    for name, build in (('Package with __dict__', build_dict), ('Package with __slots__', build_slots),
+                        ('PackageStore (columns)', build_store)):
+        size = measure(build, count)
+        print("%-24s %14d %12.1f" % (name, size, size / count))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,186 @@
+# Times each stage of planning a delivery day on synthetic networks (see benchmarks.synthetic) and writes the results
+# to a JSON file on every run, so runs on different commits can be compared and a slowdown in one of the hot paths
+# shows up.
+# Stages, each timed on its own, best of --repeat runs:
+#     load_addresses, load_distance_graph, load_packages - reading the three csv files
+#     compact, dijkstras_short - building the graph's CSR arrays, then one Dijkstra search from the hub
+#     route_stops, plan_fleet - the DeliveryDay path: every package, in manifest order, on loads of TRUCK_CAPACITY
+#         packages, whose stops DeliveryDay.route_stops collects and plan_fleet routes over the distance matrix
+#     timeline - driving those loads on a Timeline
+#     package_status, status_counts, status_codes - --queries status queries of one package, of the counts per state
+#         and of every package at a time (the report path)
+# Run from the repository root:
+#     python -m benchmarks.bench_pipeline [--sizes 100x1000,1000x100000] [--seed S] [--repeat R] [--queries Q]
+#         [--data DIR] [--out results.json] [--compare baseline.json [--threshold 1.25]]
+# --sizes lists addresses x packages pairs (up to 10000x1000000). Networks are written under --data (a temporary
+# folder by default) and reused when the same size and seed are asked for again. Results go to --out, by default
+# RESULTS_DIR/pipeline-<commit>-<date and time>.json. --compare prints each stage's time against a previous results
+# file and exits with status 1 when any stage is slower by more than --threshold times.
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_network
+from wgups.assign import TRUCK_CAPACITY
+from wgups.graph import dijkstras_short
+from wgups.loaders import Dataset, load_addresses, load_distance_graph, load_packages
+from wgups.report import status_codes
+from wgups.router import plan_fleet
+from wgups.simulation import DAY_START, DeliveryDay, Timeline, Truck
+
+SIZES = [(100, 1000), (1000, 100000)]
+TRUCKS = 8
+RESULTS_DIR = '.wgups_bench'
+
+
+# Returns (best seconds, result of the last call) of calling fn repeat times.
+def timed(fn, repeat=1):
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# Trucks carrying every package in manifest order, TRUCK_CAPACITY to a load, loads going to TRUCKS trucks in turn.
+def make_fleet(packages):
+    p_ids = sorted(packages)
+    return [Truck(load_id % TRUCKS, load_id, [packages.search(p_id) for p_id in p_ids[i:i + TRUCK_CAPACITY]])
+            for load_id, i in enumerate(range(0, len(p_ids), TRUCK_CAPACITY), 1)]
+
+
+# Drives every routed load of the fleet on a new Timeline, each of its packages delivered at the stop of its address.
+def drive(fleet, plans, vertex_of):
+    timeline = Timeline()
+    for truck, plan in zip(fleet, plans):
+        at_vertex = {}
+        for pkg in truck.loaded_packages_list:
+            at_vertex.setdefault(vertex_of[pkg.address], []).append(pkg.p_id)
+        timeline.add_trip(truck.truck_id, truck.load_id, plan, [at_vertex.get(stop, []) for stop in plan.stops])
+    return timeline
+
+
+# Runs every stage on one network and returns {stage: seconds}.
+def run(directory, n, m, seed, repeat, queries):
+    rng = random.Random(seed)
+    stages = {}
+    stages['load_addresses'], addresses = timed(lambda: load_addresses(os.path.join(directory, 'addresses.csv')),
+                                                repeat)
+    stages['load_distance_graph'], graph = timed(lambda: load_distance_graph(os.path.join(directory, 'distance.csv')),
+                                                 repeat)
+    stages['load_packages'], packages = timed(lambda: load_packages(os.path.join(directory, 'packages.csv')), repeat)
+
+    stages['compact'] = timed(lambda: graph.compact(), 1)[0]
+    hub = graph.vertex_list[0]
+    stages['dijkstras_short'] = timed(lambda: dijkstras_short(graph, hub), repeat)[0]
+
+    # a DeliveryDay over the files already read; routes use the distance matrix, as the network has no cached
+    # all-pairs matrix and computing one is not part of planning a day.
+    day = DeliveryDay(Dataset(directory).preload(addresses=addresses, graph=graph, packages=packages))
+    fleet = make_fleet(packages)
+    stages['route_stops'], stops = timed(lambda: [day.route_stops(truck) for truck in fleet], repeat)
+    stages['plan_fleet'], plans = timed(lambda: plan_fleet(stops, graph.matrix, workers=day.workers,
+                                                           depot=day.depot, improve=day.improve), repeat)
+
+    vertex_of = {address: i for i, address in enumerate(addresses)}
+    stages['timeline'], timeline = timed(lambda: drive(fleet, plans, vertex_of), repeat)
+
+    end = int(max(trip[2] for trip in timeline.trips.values())) + 1
+    lookups = [(rng.randint(1, m), rng.randrange(DAY_START, end)) for i in range(queries)]
+    times = [rng.randrange(DAY_START, end) for i in range(queries)]
+    stages['package_status'] = timed(lambda: [timeline.package_status(p_id, t) for p_id, t in lookups], repeat)[0]
+    stages['status_counts'] = timed(lambda: [timeline.status_counts(t) for t in times], repeat)[0]
+    report_times = times[:max(1, queries // 1000)]
+    status_codes(timeline, DAY_START)  # imports numpy, when installed, outside the timing
+    stages['status_codes'] = timed(lambda: status_codes(timeline, report_times), repeat)[0]
+    return stages
+
+
+# The commit being measured, when run inside a git checkout.
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+
+# Prints each stage against the same network in a previous results file. Returns the stages slower than threshold
+# times their old time.
+def compare(results, baseline, threshold):
+    old = {(r['addresses'], r['packages'], r['seed']): r['stages'] for r in baseline['runs']}
+    slower = []
+    print("%-12s %-20s %12s %12s %8s" % ('network', 'stage', 'before s', 'after s', 'ratio'))
+    for r in results['runs']:
+        before = old.get((r['addresses'], r['packages'], r['seed']))
+        if before is None:
+            continue
+        network = '%dx%d' % (r['addresses'], r['packages'])
+        for stage, seconds in r['stages'].items():
+            if stage in before and before[stage] > 0:
+                ratio = seconds / before[stage]
+                flag = ' slower' if ratio > threshold else ''
+                print("%-12s %-20s %12.6f %12.6f %8.2f%s" % (network, stage, before[stage], seconds, ratio, flag))
+                if ratio > threshold:
+                    slower.append((network, stage))
+    return slower
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    sizes = SIZES
+    if '--sizes' in argv:
+        sizes = [tuple(int(x) for x in size.split('x')) for size in _option(argv, '--sizes').split(',')]
+    seed = int(_option(argv, '--seed', 0))
+    repeat = int(_option(argv, '--repeat', 1))
+    queries = int(_option(argv, '--queries', 10000))
+    data = _option(argv, '--data')
+    scratch = data is None
+    if scratch:
+        data = tempfile.mkdtemp(prefix='wgups-bench-')
+
+    results = {'commit': git_commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+               'seed': seed, 'repeat': repeat, 'queries': queries, 'runs': []}
+    try:
+        for n, m in sizes:
+            directory = os.path.join(data, '%d-%d-%d' % (n, m, seed))
+            if not os.path.exists(os.path.join(directory, 'packages.csv')):
+                write_network(directory, n, m, seed)
+            stages = run(directory, n, m, seed, repeat, queries)
+            results['runs'].append({'addresses': n, 'packages': m, 'seed': seed, 'stages': stages})
+            print("%d addresses, %d packages" % (n, m))
+            for stage, seconds in stages.items():
+                print("    %-20s %10.4f s" % (stage, seconds))
+    finally:
+        if scratch:
+            shutil.rmtree(data, ignore_errors=True)
+
+    out = _option(argv, '--out')
+    if out is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out = os.path.join(RESULTS_DIR, 'pipeline-%s-%s.json' % (results['commit'] or 'unknown',
+                                                                 time.strftime('%Y%m%d-%H%M%S')))
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print("results written to", out)
+    if '--compare' in argv:
+        with open(_option(argv, '--compare')) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, float(_option(argv, '--threshold', 1.25))):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# Writes a synthetic delivery network in the format of the day's csv files (addresses.csv, distance.csv,
+# packages.csv), at any size and reproducible from a seed. Addresses are points scattered over a square city with the
+# hub (vertex 0) in the middle; the distance between two addresses is their straight-line distance times a detour
+# factor that depends on both ends, so some direct roads are longer than going through a third address and Dijkstra
+# has real work to do. distance.csv is written lower-triangular, which the loader reads as symmetric. Run from the
+# repository root:
+#     python -m benchmarks.synthetic DIRECTORY addresses packages [seed]
+import csv
+import math
+import os
+import random
+import sys
+
+from wgups.graph import Graph, Vertex
+
+CITY = 'Salt Lake City'
+STATE = 'UT'
+CITY_MILES = 20.0  # width of the square city
+DEADLINES = (('9:00 AM', 0.05), ('10:30 AM', 0.25), ('EOD', 0.70))
+
+
+# n distinct street addresses, vertex 0 being the hub.
+def make_addresses(n):
+    return ['4001 South 700 East'] + ['%d S %d E' % (100 + 10 * (i // 200), 100 + 10 * (i % 200)) for i in range(1, n)]
+
+
+# Writes addresses.csv, distance.csv and packages.csv for n_addresses addresses and n_packages packages into
+# directory, creating it if needed. The same seed always gives the same files. Returns the directory.
+# O(n_addresses^2 + n_packages) run-time complexity.
+def write_network(directory, n_addresses, n_packages, seed=0):
+    if n_addresses < 2:
+        raise ValueError("a network needs the hub and at least one other address")
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    names = make_addresses(n_addresses)
+    half = CITY_MILES / 2
+    xs = [half] + [rng.uniform(0, CITY_MILES) for i in range(1, n_addresses)]
+    ys = [half] + [rng.uniform(0, CITY_MILES) for i in range(1, n_addresses)]
+    detour = [rng.uniform(1.0, 1.3) for i in range(n_addresses)]
+
+    with open(os.path.join(directory, 'addresses.csv'), 'w', newline='') as out:
+        out.write(''.join(name + '\n' for name in names))
+
+    hypot = math.hypot
+    with open(os.path.join(directory, 'distance.csv'), 'w', newline='') as out:
+        for i in range(n_addresses):
+            x, y, f = xs[i], ys[i], detour[i]
+            cells = ['%.1f' % max(0.1, hypot(x - xs[j], y - ys[j]) * f * detour[j]) for j in range(i)]
+            cells.append('0')
+            out.write(','.join(cells) + '\n')
+
+    deadlines = [text for text, share in DEADLINES]
+    weights = [share for text, share in DEADLINES]
+    with open(os.path.join(directory, 'packages.csv'), 'w', newline='') as out:
+        writer = csv.writer(out, lineterminator='\n')
+        for p_id in range(1, n_packages + 1):
+            vertex = rng.randrange(1, n_addresses)
+            writer.writerow([p_id, names[vertex], CITY, STATE, 84100 + vertex % 100,
+                             rng.choices(deadlines, weights)[0], rng.randint(1, 90), ''])
+    return directory
+
+
+# A width x width street grid as a Graph: vertex y * width + x at (x, y), two-way blocks between neighbours of 0.1 to
+# 0.2 miles, with share of the blocks missing (closed streets) so shortest paths are not just staircases. Returns
+# (graph, coordinates by vertex id).
+# O(width^2) run-time complexity.
+def grid_graph(width, seed=0, share=0.1):
+    rng = random.Random(seed)
+    g = Graph()
+    vertices = [Vertex(i) for i in range(width * width)]
+    for vertex in vertices:
+        g.add_vertex(vertex)
+    for y in range(width):
+        for x in range(width):
+            i = y * width + x
+            if x + 1 < width and rng.random() >= share:
+                g.add_undirected_edge(vertices[i], vertices[i + 1], round(rng.uniform(0.1, 0.2), 3))
+            if y + 1 < width and rng.random() >= share:
+                g.add_undirected_edge(vertices[i], vertices[i + width], round(rng.uniform(0.1, 0.2), 3))
+    return g, [(i % width, i // width) for i in range(width * width)]
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if len(args) not in (3, 4):
+        sys.exit("usage: python -m benchmarks.synthetic DIRECTORY addresses packages [seed]")
+    write_network(args[0], int(args[1]), int(args[2]), int(args[3]) if len(args) > 3 else 0)
@@ -0,0 +1 @@
+# Regression tests for the wgups package, run from the repository root with python -m pytest (or python -m unittest).
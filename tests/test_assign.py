@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from wgups.assign import LoadSlot, assign_loads, parse_note
+from wgups.loaders import Dataset
+from wgups.simulation import LOAD_SLOTS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ONLY_ON_TRUCK_2 = [3, 18, 36, 38]
+DELAYED = [6, 25, 28, 32]  # until 9:05
+WRONG_ADDRESS = [9]
+GROUP = [13, 14, 15, 16, 19, 20]  # must be delivered together
+
+
+class ParseNoteTest(unittest.TestCase):
+    def test_notes(self):
+        self.assertEqual(parse_note('Can only be on truck 2'), (2, None, [], False))
+        self.assertEqual(parse_note('Delayed on flight---will not arrive to depot until 9:05 am'),
+                         (None, 9 * 60 + 5, [], False))
+        self.assertEqual(parse_note('Must be delivered with 13, 19'), (None, None, [13, 19], False))
+        self.assertEqual(parse_note('Wrong address listed'), (None, None, [], True))
+        self.assertEqual(parse_note(''), (None, None, [], False))
+
+
+class AssignLoadsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = Dataset(ROOT)
+        cls.packages = [cls.dataset.packages.search(p_id) for p_id in sorted(cls.dataset.packages)]
+        cls.dist = cls.dataset.shortest.dist
+
+    def _assign(self, slots):
+        return assign_loads(self.packages, self.dataset.vertex_of, self.dist, slots, time_budget=0.1)
+
+    def _check(self, slots, loads):
+        by_id = {slot.load_id: slot for slot in slots}
+        load_of = {}
+        for load_id, packages in loads.items():
+            self.assertLessEqual(len(packages), by_id[load_id].capacity)
+            for p in packages:
+                self.assertNotIn(p.p_id, load_of)
+                load_of[p.p_id] = load_id
+        self.assertEqual(sorted(load_of), [p.p_id for p in self.packages])
+        for p_id in ONLY_ON_TRUCK_2:
+            self.assertEqual(by_id[load_of[p_id]].truck_id, 2)
+        for p_id in DELAYED + WRONG_ADDRESS:
+            self.assertGreater(by_id[load_of[p_id]].trip, 1)
+        self.assertEqual(len({load_of[p_id] for p_id in GROUP}), 1)
+
+    def test_day_loads(self):
+        self._check(LOAD_SLOTS, self._assign(LOAD_SLOTS))
+
+    def test_tight_capacity(self):
+        # 40 packages in exactly 40 places.
+        slots = [LoadSlot(slot.load_id, slot.truck_id, slot.trip, capacity=10) for slot in LOAD_SLOTS]
+        self._check(slots, self._assign(slots))
+
+    def test_not_enough_capacity(self):
+        slots = [LoadSlot(slot.load_id, slot.truck_id, slot.trip, capacity=9) for slot in LOAD_SLOTS]
+        with self.assertRaises(ValueError):
+            self._assign(slots)
+
+    def test_group_larger_than_any_load(self):
+        # room for 60 packages, but no load fits the six of GROUP.
+        slots = [LoadSlot(i + 1, i % 2 + 1, i // 2 + 1, capacity=5) for i in range(12)]
+        with self.assertRaises(ValueError):
+            self._assign(slots)
+
+    def test_no_truck_2(self):
+        slots = [LoadSlot(1, 1, 1), LoadSlot(2, 1, 2), LoadSlot(3, 1, 3)]
+        with self.assertRaises(ValueError):
+            self._assign(slots)
+
+
+if __name__ == '__main__':
+    unittest.main()
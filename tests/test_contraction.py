@@ -0,0 +1,59 @@
+import os
+import random
+import tempfile
+import unittest
+
+from benchmarks.synthetic import grid_graph
+from wgups.contraction import build_hierarchy, load_hierarchy
+from wgups.graph import dijkstra, dijkstras_short, get_shortest_path
+
+
+class ContractionHierarchyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.graph, coords = grid_graph(20, seed=3)
+        cls.cgraph = cls.graph.compact()
+        cls.hierarchy = build_hierarchy(cls.cgraph)
+        rng = random.Random(3)
+        cls.pairs = [(rng.randrange(400), rng.randrange(400)) for i in range(100)]
+
+    def _check(self, hierarchy):
+        for source, target in self.pairs:
+            expected = dijkstra(self.cgraph, source)[0][target]
+            self.assertAlmostEqual(hierarchy.distance(source, target), expected)
+            distance, path = hierarchy.path(source, target)
+            self.assertAlmostEqual(distance, expected)
+            if path:
+                self.assertEqual((path[0], path[-1]), (source, target))
+                self.assertAlmostEqual(sum(self.cgraph.weight(u, v) for u, v in zip(path, path[1:])), expected)
+
+    def test_matches_dijkstra(self):
+        self._check(self.hierarchy)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.hierarchy.save(os.path.join(directory, 'grid.ch'))
+            loaded = load_hierarchy(path)
+        self.assertEqual(len(loaded), len(self.hierarchy))
+        self.assertEqual(loaded.shortcut_count, self.hierarchy.shortcut_count)
+        self._check(loaded)
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'not.ch')
+            with open(path, 'wb') as out:
+                out.write(b'distance.csv')
+            with self.assertRaises(ValueError):
+                load_hierarchy(path)
+
+    def test_dijkstras_short_with_hierarchy(self):
+        start, end = self.graph.vertex_list[5], self.graph.vertex_list[390]
+        dijkstras_short(self.graph, start)
+        expected = end.distance
+        dijkstras_short(self.graph, start, end, hierarchy=self.hierarchy)
+        self.assertAlmostEqual(end.distance, expected)
+        self.assertTrue(get_shortest_path(self.graph, start, end).startswith('5 -> '))
+
+
+if __name__ == '__main__':
+    unittest.main()
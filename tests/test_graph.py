@@ -0,0 +1,100 @@
+import random
+import unittest
+
+from benchmarks.synthetic import grid_graph
+from wgups import instrument
+from wgups.graph import astar, bidirectional_dijkstra, coordinate_heuristic, dijkstra, dijkstras_short, \
+    get_shortest_path, path_ids
+
+
+# Counters of one dijkstra run with instrumentation switched on for just that run.
+def _counted(cgraph, source, targets=None):
+    was = instrument.ENABLED
+    instrument.reset()
+    instrument.enable()
+    try:
+        dist, pred = dijkstra(cgraph, source, targets)
+    finally:
+        instrument.enable(was)
+    return dist, pred, dict(instrument.counters)
+
+
+class DijkstraTargetsTest(unittest.TestCase):
+    def setUp(self):
+        self.graph, self.coords = grid_graph(30, seed=1)
+        self.cgraph = self.graph.compact()
+
+    def test_stops_once_targets_are_settled(self):
+        full_dist, full_pred, full = _counted(self.cgraph, 0)
+        dist, pred, early = _counted(self.cgraph, 0, targets=[1])
+        self.assertEqual(dist[1], full_dist[1])
+        # vertex 1 is one block away, so only a handful of vertices are settled before it.
+        self.assertLess(early['dijkstra.relaxations'], full['dijkstra.relaxations'] // 20)
+
+    def test_settled_targets_are_exact(self):
+        full_dist, full_pred = dijkstra(self.cgraph, 0)
+        targets = [45, 310, 899]
+        dist, pred = dijkstra(self.cgraph, 0, targets)
+        for t in targets:
+            self.assertEqual(dist[t], full_dist[t])
+
+    def test_no_targets_settles_everything(self):
+        dist, pred, counters = _counted(self.cgraph, 0)
+        self.assertEqual(counters['dijkstra.relaxations'], len(self.cgraph.targets))
+
+
+class PointToPointTest(unittest.TestCase):
+    def setUp(self):
+        self.graph, self.coords = grid_graph(25, seed=2)
+        self.cgraph = self.graph.compact()
+        self.pairs = [(random.Random(i).randrange(625), random.Random(-i).randrange(625)) for i in range(40)]
+
+    def _check_path(self, source, target, distance, path):
+        if distance == float('inf'):
+            self.assertEqual(len(path), 0)
+            return
+        self.assertEqual((path[0], path[-1]), (source, target))
+        self.assertAlmostEqual(sum(self.cgraph.weight(u, v) for u, v in zip(path, path[1:])), distance)
+
+    def test_astar_matches_dijkstra(self):
+        for source, target in self.pairs:
+            expected = dijkstra(self.cgraph, source)[0][target]
+            # blocks are at least 0.1 miles long, one grid unit apart.
+            heuristic = coordinate_heuristic(self.coords, target, scale=0.1)
+            for h in (None, heuristic):
+                distance, path = astar(self.cgraph, source, target, h)
+                self.assertAlmostEqual(distance, expected)
+                self._check_path(source, target, distance, path)
+
+    def test_bidirectional_matches_dijkstra(self):
+        for source, target in self.pairs:
+            expected = dijkstra(self.cgraph, source)[0][target]
+            distance, path = bidirectional_dijkstra(self.cgraph, source, target)
+            self.assertAlmostEqual(distance, expected)
+            self._check_path(source, target, distance, path)
+
+    def test_dijkstras_short_to_end_vertex(self):
+        start, end = self.graph.vertex_list[0], self.graph.vertex_list[624]
+        dijkstras_short(self.graph, start)
+        expected = (end.distance, get_shortest_path(self.graph, start, end))
+        for options in ({}, {'bidirectional': True}):
+            dijkstras_short(self.graph, start, end, **options)
+            self.assertAlmostEqual(end.distance, expected[0])
+            self.assertEqual(get_shortest_path(self.graph, start, end).split(' -> ')[0], '0')
+
+
+class PathIdsTest(unittest.TestCase):
+    def test_walks_predecessors(self):
+        self.assertEqual(list(path_ids([-1, 0, 1, 1], 0, 3)), [0, 1, 3])
+        self.assertEqual(list(path_ids([-1, 0, 1, 1], 2, 2)), [2])
+
+    def test_unreached_target(self):
+        self.assertEqual(len(path_ids([-1, 0, -1], 0, 2)), 0)
+
+    def test_stale_chain_raises(self):
+        with self.assertRaises(ValueError):
+            path_ids([1, 2, 0], 3, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from wgups import multiday
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RelativePathsTest(unittest.TestCase):
+    # A copy of the day's csv files, plus day2.csv with only the first 20 packages, in a directory given relative to
+    # the working directory.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='wgups-days-', dir=os.getcwd())
+        for name in ('addresses.csv', 'distance.csv', 'packages.csv'):
+            shutil.copy(os.path.join(ROOT, name), self.directory)
+        with open(os.path.join(ROOT, 'packages.csv')) as f:
+            lines = f.readlines()
+        with open(os.path.join(self.directory, 'day2.csv'), 'w') as out:
+            out.writelines(lines[:20])
+        self.data = os.path.relpath(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run(self, *argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            multiday.main(['--data', self.data, '--workers', '1', '--json'] + list(argv))
+        return {day['day']: day for day in json.loads(out.getvalue())['days']}
+
+    def test_default_manifest(self):
+        days = self._run()
+        self.assertEqual(days['packages']['packages'], 40)
+
+    def test_manifests_relative_to_working_directory(self):
+        days = self._run(os.path.join(self.data, 'packages.csv'), os.path.join(self.data, 'day2.csv'))
+        self.assertEqual(days['packages']['packages'], 40)
+        self.assertEqual(days['day2']['packages'], 20)
+        self.assertLess(days['day2']['miles'], days['packages']['miles'])
+
+
+if __name__ == '__main__':
+    unittest.main()
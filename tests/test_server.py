@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from wgups.loaders import Dataset
+from wgups.server import StatusService, replay, start_server
+from wgups.simulation import DeliveryDay
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StatusServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = StatusService(DeliveryDay(Dataset(ROOT)).plan())
+
+    def test_package(self):
+        response = self.service.answer({'id': 1, 'type': 'package', 'p_id': 13, 'time': '08:00'})
+        self.assertEqual(response, {'id': 1, 'ok': True, 'result': {'p_id': 13, 'load_id': 1, 'status': 'en route',
+                                                                   'time': response['result']['time']}})
+
+    def test_unknown_ids(self):
+        self.assertEqual(self.service.answer({'id': 2, 'type': 'package', 'p_id': 99, 'time': '10:00'}),
+                         {'id': 2, 'ok': False, 'error': 'missing or unknown 99'})
+        self.assertEqual(self.service.answer({'id': 3, 'type': 'truck', 'truck': 9, 'time': '10:00'}),
+                         {'id': 3, 'ok': False, 'error': 'missing or unknown 9'})
+        self.assertEqual(self.service.answer({'id': 4, 'type': 'package', 'time': '10:00'}),
+                         {'id': 4, 'ok': False, 'error': 'missing or unknown p_id'})
+
+    def test_batch_line(self):
+        line = json.dumps([{'type': 'packages', 'time': '12:00'}, {'type': 'truck', 'truck': 3, 'time': '12:00'}])
+        packages, truck = json.loads(self.service.answer_line(line.encode()))
+        self.assertEqual(packages['result']['counts'], {'at hub': 0, 'en route': 0, 'Delivered': 40})
+        self.assertEqual(truck['result']['status'], 'returned')
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = StatusService(DeliveryDay(Dataset(ROOT)).plan())
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'wgups.sock')
+        # a small line limit, so an oversized request is cheap to send.
+        self.server = await start_server(self.service, path=self.path, limit=4096)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.directory.cleanup()
+
+    async def test_pipelined_queries_answered_in_order(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        queries = [{'id': i, 'type': 'package', 'p_id': i % 40 + 1, 'time': '10:00'} for i in range(200)]
+        writer.write(b''.join(json.dumps(query).encode() + b'\n' for query in queries))
+        await writer.drain()
+        responses = [json.loads(await reader.readline()) for query in queries]
+        writer.close()
+        self.assertEqual([response['id'] for response in responses], list(range(200)))
+        self.assertTrue(all(response['ok'] for response in responses))
+
+    async def test_oversized_line_gets_an_error_and_the_connection_goes_on(self):
+        reader, writer = await asyncio.open_unix_connection(self.path)
+        batch = json.dumps([{'type': 'package', 'p_id': 1, 'time': '10:00'}] * 2000).encode()
+        self.assertGreater(len(batch), 4096)
+        writer.write(batch + b'\n' + json.dumps({'id': 7, 'type': 'packages', 'time': '10:00'}).encode() + b'\n')
+        await writer.drain()
+        too_long, after = json.loads(await reader.readline()), json.loads(await reader.readline())
+        writer.close()
+        self.assertEqual(too_long, {'id': None, 'ok': False, 'error': 'request line longer than 4096 bytes'})
+        self.assertEqual((after['id'], after['ok']), (7, True))
+
+    async def test_replay_reads_responses_over_64_kib(self):
+        workload = os.path.join(self.directory.name, 'workload.jsonl')
+        with open(workload, 'w') as out:
+            out.write(json.dumps({'id': 1, 'type': 'truck', 'truck': 1, 'time': '09:00'}) + '\n\n')
+            # one short request line whose answer, 50 full status reports, is longer than asyncio's default limit.
+            out.write(json.dumps([{'type': 'packages', 'time': '10:00'}] * 50) + '\n')
+        responses = await replay(workload, path=self.path)
+        self.assertEqual(len(responses), 2)
+        self.assertGreater(len(responses[1]), 1 << 16)
+        self.assertEqual(json.loads(responses[0])['result']['load_id'], 1)
+        self.assertTrue(all(response['ok'] for response in json.loads(responses[1])))
+
+
+if __name__ == '__main__':
+    unittest.main()
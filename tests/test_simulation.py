@@ -0,0 +1,104 @@
+import os
+import unittest
+
+from wgups.assign import LoadSlot
+from wgups.loaders import Dataset
+from wgups.package import PackageTable
+from wgups.simulation import LOAD_SLOTS, DeliveryDay
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# packages 13, 14, 15, 16, 19 and 20 must be delivered together (notes of 14, 16 and 20), all on load 1.
+GROUP = [13, 14, 15, 16, 19, 20]
+
+
+# A planned day over the repository's csv files, read afresh so each test has its own packages.
+def planned_day(**options):
+    return DeliveryDay(Dataset(ROOT), **options).plan()
+
+
+class DelayPackageTest(unittest.TestCase):
+    def test_refuses_package_on_departed_load(self):
+        day = planned_day()
+        before = day.late_packages()
+        with self.assertRaises(ValueError):
+            day.delay_package(13, '08:30', '09:00')
+        self.assertEqual(day.packages.search(13).truck, 1)
+        self.assertEqual(day.late_packages(), before)
+
+    def test_moves_the_whole_co_delivery_group(self):
+        day = planned_day()
+        replanned = day.delay_package(13, '07:30', '09:00')
+        self.assertEqual(len(replanned), 2)
+        target = replanned[1]
+        self.assertGreaterEqual(day.timeline.departure(target), 9 * 60)
+        self.assertEqual({day.packages.search(p_id).truck for p_id in GROUP}, {target})
+        loaded = {p.p_id for p in day.trucks[target].loaded_packages_list}
+        self.assertTrue(set(GROUP) <= loaded)
+        self.assertLessEqual(len(loaded), 16)
+        for p_id in GROUP:
+            self.assertGreaterEqual(day.timeline.delivery_time(p_id), 9 * 60)
+
+    def test_moved_group_waits_for_the_package_on_the_same_truck(self):
+        # load 4 is truck 1's second trip; without the group, load 1 brings truck 1 back before 09:23.
+        day = planned_day()
+        self.assertEqual(day.delay_package(13, '07:30', '09:23'), [1, 4])
+        self.assertEqual(day.timeline.departure(4), 9 * 60 + 23)
+        for p_id in GROUP:
+            self.assertEqual(day.timeline.package_status(p_id, 9 * 60 + 22)[0], 'at hub')
+
+    def test_holds_load_when_no_later_load_has_room(self):
+        # every load is already full, so the group cannot move.
+        sizes = {1: 11, 2: 9, 3: 10, 4: 10}
+        day = planned_day(load_slots=[LoadSlot(slot.load_id, slot.truck_id, slot.trip, capacity=sizes[slot.load_id])
+                                      for slot in LOAD_SLOTS])
+        self.assertEqual(day.delay_package(13, '07:30', '09:00'), [1])
+        self.assertEqual(day.timeline.departure(1), 9 * 60)
+        self.assertEqual(day.packages.search(13).truck, 1)
+
+    def test_cancel_package(self):
+        day = planned_day()
+        day.cancel_package(3, '09:00')
+        self.assertEqual(day.packages.search(3).status, 'cancelled')
+        self.assertNotIn(3, [p.p_id for truck in day.trucks.values() for p in truck.loaded_packages_list])
+
+
+class DelayedOnFlightTest(unittest.TestCase):
+    # packages 6 and 25 are delayed on flight until 09:05.
+    def _check_waits(self, day):
+        for p_id in (6, 25):
+            load_id = day.packages.search(p_id).truck
+            self.assertGreaterEqual(day.timeline.departure(load_id), 9 * 60 + 5)
+
+    def test_hand_picked_loads(self):
+        self._check_waits(planned_day())
+
+    def test_auto_assigned_loads(self):
+        self._check_waits(planned_day(auto_assign=True))
+
+    def test_auto_assigned_small_manifest(self):
+        # few packages, so a truck comes back from its first trip long before the delayed ones arrive.
+        dataset = Dataset(ROOT)
+        table = PackageTable()
+        for p_id in (1, 2, 6, 13, 25):
+            table.insert(p_id, dataset.packages.search(p_id))
+        day = DeliveryDay(dataset.with_packages(table), auto_assign=True).plan()
+        self._check_waits(day)
+        for p_id in (6, 25):
+            self.assertGreaterEqual(day.timeline.delivery_time(p_id), 9 * 60 + 5)
+
+
+class DayStartTest(unittest.TestCase):
+    def test_first_loads_leave_at_day_start(self):
+        for day_start in (7 * 60, 8 * 60, 9 * 60 + 15):
+            day = planned_day(day_start=day_start)
+            self.assertEqual([day.timeline.departure(load_id) for load_id in (1, 2)], [day_start, day_start])
+            self.assertEqual([day.trucks[load_id].departure_time for load_id in (1, 2)], [day_start, day_start])
+
+    def test_earlier_start_delivers_earlier(self):
+        early, usual = planned_day(day_start=7 * 60), planned_day()
+        self.assertEqual(early.timeline.delivery_time(13), usual.timeline.delivery_time(13) - 60)
+        self.assertAlmostEqual(early.total_distance, usual.total_distance)
+
+
+if __name__ == '__main__':
+    unittest.main()
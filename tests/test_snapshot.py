@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from wgups.loaders import Dataset
+from wgups.simulation import DeliveryDay
+from wgups.snapshot import cached_day, open_snapshot, restore_day, save_snapshot
+from wgups.speeds import parse_profile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'day.snap')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # A fresh, unplanned day with the options of the tests.
+    def _day(self, **options):
+        return DeliveryDay(Dataset(ROOT), **options)
+
+    def _assert_same_day(self, restored, planned):
+        self.assertEqual(restored.order, planned.order)
+        self.assertEqual(restored.distances, planned.distances)
+        self.assertEqual(restored.timeline.p_ids, planned.timeline.p_ids)
+        self.assertEqual(restored.timeline.departs, planned.timeline.departs)
+        self.assertEqual(restored.timeline.delivers, planned.timeline.delivers)
+        self.assertEqual(restored.late_packages(), planned.late_packages())
+        for load_id, truck in planned.trucks.items():
+            self.assertEqual(restored.timeline.departure(load_id), planned.timeline.departure(load_id))
+            self.assertEqual(restored.trucks[load_id].departure_time, truck.departure_time)
+            self.assertEqual([p.p_id for p in restored.trucks[load_id].loaded_packages_list],
+                             [p.p_id for p in truck.loaded_packages_list])
+        for p_id in planned.packages:
+            was, now = planned.packages.search(p_id), restored.packages.search(p_id)
+            self.assertEqual((now.status, now.truck, now.time_mod), (was.status, was.truck, was.time_mod))
+
+    def test_round_trip(self):
+        options = {'deadline_aware': True, 'day_start': 7 * 60 + 30, 'speed': parse_profile('18,8-9:12')}
+        planned = self._day(**options).plan()
+        planned.delay_package(6, '07:00', '09:05')
+        save_snapshot(planned, self.path)
+        restored = restore_day(open_snapshot(self.path, ROOT), self._day(**options))
+        self._assert_same_day(restored, planned)
+
+    def test_cached_day_restores_matching_options(self):
+        planned = cached_day(self.path, self._day())
+        # a directory without the csv files, so the day can only come from the snapshot.
+        restored = cached_day(self.path, DeliveryDay(Dataset(self.directory.name)))
+        self._assert_same_day(restored, planned)
+
+    def test_cached_day_plans_again_for_other_options(self):
+        cached_day(self.path, self._day())
+        replanned = cached_day(self.path, self._day(day_start=7 * 60))
+        self.assertEqual(replanned.timeline.departure(1), 7 * 60)
+        self.assertEqual(open_snapshot(self.path, ROOT).options['day_start'], 7 * 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
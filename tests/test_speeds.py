@@ -0,0 +1,28 @@
+import unittest
+
+from wgups.speeds import SpeedProfile, parse_profile
+
+
+class SpeedProfileTest(unittest.TestCase):
+    def test_constant_profile(self):
+        profile = SpeedProfile.constant(18)
+        self.assertEqual(profile.arrival(8 * 60, 9), 8 * 60 + 30)
+        self.assertEqual(profile.miles_between(8 * 60, 8 * 60 + 30), 9)
+
+    def test_trip_across_an_hour_change(self):
+        profile = parse_profile('18,7-8:12')
+        # ten minutes at 12 mph (2 miles), then 18 mph for the last 3 miles.
+        self.assertAlmostEqual(profile.arrival(7 * 60 + 50, 5), 8 * 60 + 10)
+        for departure in (7 * 60 + 50, 6 * 60 + 59, 23 * 60 + 30):
+            for miles in (0.5, 5, 40):
+                arrival = profile.arrival(departure, miles)
+                self.assertAlmostEqual(profile.miles_between(departure, arrival), miles)
+
+    def test_bad_profiles(self):
+        for text in ('', 'fast', '18,9-7:10', '18,7-25:10', '0'):
+            with self.assertRaises(ValueError):
+                parse_profile(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import math
+import random
+import unittest
+from array import array
+
+from wgups.matrix import DistanceMatrix
+from wgups.router import plan_route
+from wgups.speeds import parse_profile
+from wgups.windows import late_stops, plan_route_windows
+
+START = 8 * 60
+
+
+# DistanceMatrix of straight-line distances between points.
+def point_matrix(points):
+    n = len(points)
+    return DistanceMatrix(n, array('d', [math.dist(points[i], points[j]) for i in range(n) for j in range(n)]))
+
+
+class PlanRouteWindowsTest(unittest.TestCase):
+    # the depot (0) between three stops on one side and one on the other, driven at 60 mph: one mile a minute.
+    def setUp(self):
+        self.dist = point_matrix([(0, 0), (1, 0), (2, 0), (3, 0), (-3, 0)])
+        self.stops = [1, 2, 3, 4]
+
+    def test_plain_route_kept_without_deadlines(self):
+        plan = plan_route_windows(self.dist, self.stops, {}, START, speed=60)
+        self.assertEqual(plan.stops, plan_route(self.dist, self.stops).stops)
+
+    def test_meets_a_deadline_the_shortest_route_misses(self):
+        deadlines = {4: START + 4}
+        plain = plan_route(self.dist, self.stops)
+        self.assertEqual([v for v, arrival, deadline in late_stops(plain, deadlines, START, 60)], [4])
+        plan = plan_route_windows(self.dist, self.stops, deadlines, START, speed=60)
+        self.assertEqual(late_stops(plan, deadlines, START, 60), [])
+        self.assertEqual(sorted(plan.stops), self.stops)
+
+    def test_unreachable_deadline_is_reported(self):
+        # stop 3 is three miles out, so it cannot be reached two minutes after leaving.
+        deadlines = {4: START + 4, 3: START + 2}
+        plan = plan_route_windows(self.dist, self.stops, deadlines, START, speed=60)
+        late = late_stops(plan, deadlines, START, 60)
+        self.assertEqual([(v, deadline) for v, arrival, deadline in late], [(3, START + 2)])
+        self.assertGreater(late[0][1], START + 2)
+
+    def test_deadlines_under_a_speed_profile(self):
+        # 6 mph from 08:00: stop 4 is 30 minutes away, so it must come first to make 08:40.
+        profile = parse_profile('60,8-9:6')
+        deadlines = {4: START + 40}
+        self.assertNotEqual(late_stops(plan_route(self.dist, self.stops), deadlines, START, profile), [])
+        plan = plan_route_windows(self.dist, self.stops, deadlines, START, speed=profile)
+        self.assertEqual(late_stops(plan, deadlines, START, profile), [])
+
+    def test_deadlines_of_a_feasible_route_are_met(self):
+        for seed in range(20):
+            rng = random.Random(seed)
+            dist = point_matrix([(0, 0)] + [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for i in range(12)])
+            # deadlines a random order of the stops meets, with a little slack, for a third of them.
+            order = list(range(1, 13))
+            rng.shuffle(order)
+            miles, current, deadlines = 0.0, 0, {}
+            for v in order:
+                miles += dist.get(current, v)
+                current = v
+                if rng.random() < 1 / 3:
+                    deadlines[v] = START + miles + 1
+            plan = plan_route_windows(dist, order, deadlines, START, speed=60)
+            self.assertEqual(late_stops(plan, deadlines, START, 60), [], seed)
+            self.assertEqual(sorted(plan.stops), sorted(order))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,3 @@
+# WGUPS delivery routing package: loaders (csv files), graph and matrix (shortest paths), hashtable and package
+# (package storage), assign, router and improve (loads and routes), simulation (the delivery day) and cli (the menu).
+# Importing it does no work; see wgups.cli.main and wgups.simulation.DeliveryDay.
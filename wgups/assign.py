@@ -0,0 +1,252 @@
+import re
+import time
+
+from wgups.clock import END_OF_DAY, parse_deadline
+from wgups.router import plan_route
+
+# Most packages a truck can carry on one trip.
+TRUCK_CAPACITY = 16
+# The local search only tries moving a unit to this many of its closest allowed slots.
+NEAREST_SLOTS = 6
+
+_ONLY_ON_TRUCK = re.compile(r'only be on truck (\d+)', re.I)
+_ARRIVES_AT = re.compile(r'until (\d{1,2}):(\d{2})\s*([ap]m)?', re.I)
+_DELIVER_WITH = re.compile(r'delivered with ([\d,\s]+)', re.I)
+_WRONG_ADDRESS = re.compile(r'wrong address', re.I)
+
+
+# One truck trip that packages can be assigned to. trip 1 leaves the hub at departure (minutes after midnight); later
+# trips leave when the truck is back, so their departure is left as None and any delayed package can ride on them.
+class LoadSlot:
+    def __init__(self, load_id, truck_id, trip=1, departure=8 * 60, capacity=TRUCK_CAPACITY):
+        self.load_id = load_id
+        self.truck_id = truck_id
+        self.trip = trip
+        self.departure = departure if trip == 1 else None
+        self.capacity = capacity
+
+    def __repr__(self):
+        return f'LoadSlot({self.load_id}, truck={self.truck_id}, trip={self.trip})'
+
+
+# The constraints written in a package's note, as (truck_id or None, ready minutes or None, [package IDs it must be
+# delivered with], held). held is True for a wrong address, which keeps the package off first trips until corrected.
+# O(1) run-time complexity.
+def parse_note(note):
+    truck = _ONLY_ON_TRUCK.search(note)
+    arrives = _ARRIVES_AT.search(note)
+    ready = None
+    if arrives:
+        hour, minute = int(arrives.group(1)) % 12, int(arrives.group(2))
+        if (arrives.group(3) or '').lower() == 'pm':
+            hour += 12
+        ready = hour * 60 + minute
+    together = _DELIVER_WITH.search(note)
+    with_ids = [int(x) for x in re.findall(r'\d+', together.group(1))] if together else []
+    return (int(truck.group(1)) if truck else None), ready, with_ids, bool(_WRONG_ADDRESS.search(note))
+
+
+# A set of packages that must travel together, with their combined constraints.
+class _Unit:
+    def __init__(self, packages, vertex_of):
+        self.packages = packages
+        self.size = len(packages)
+        self.vertices = [vertex_of(p) for p in packages]
+        self.truck = None
+        self.ready = None
+        self.held = False
+        self.deadline = min(parse_deadline(p.deadline) for p in packages)
+        for p in packages:
+            truck, ready, with_ids, held = parse_note(p.note)
+            if truck is not None:
+                if self.truck is not None and self.truck != truck:
+                    raise ValueError("packages %s must be together but on trucks %d and %d" % (
+                        [q.p_id for q in packages], self.truck, truck))
+                self.truck = truck
+            if ready is not None:
+                self.ready = max(self.ready or 0, ready)
+            self.held = self.held or held
+
+    def allows(self, slot):
+        if self.size > slot.capacity or (self.truck is not None and slot.truck_id != self.truck):
+            return False
+        if slot.departure is not None and ((self.ready is not None and self.ready > slot.departure) or self.held):
+            return False
+        return True
+
+
+# Splits packages into units: packages named together in a "Must be delivered with" note share a unit (union-find).
+# O(n) run-time complexity.
+def _build_units(packages, vertex_of):
+    by_id = {p.p_id: p for p in packages}
+    parent = {p_id: p_id for p_id in by_id}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for p in packages:
+        for other in parse_note(p.note)[2]:
+            if other in by_id:
+                parent[find(other)] = find(p.p_id)
+    groups = {}
+    for p in packages:
+        groups.setdefault(find(p.p_id), []).append(p)
+    return [_Unit(group, vertex_of) for group in groups.values()]
+
+
+# k-medoids on the distance matrix over the given vertices (with a package count weight each): farthest-first seeding
+# from the depot, then a few rounds of assigning vertices to their nearest medoid and moving each medoid to the vertex
+# of its cluster with the smallest weighted distance to the rest.
+# O(rounds * (V k + sum of cluster size^2)) run-time complexity.
+def k_medoids(dist, weights, k, depot=0, rounds=5):
+    vertices = list(weights)
+    if k >= len(vertices):
+        return vertices + [depot] * (k - len(vertices))
+    medoids = []
+    nearest = {v: dist.get(depot, v) for v in vertices}
+    for i in range(k):
+        far = max(vertices, key=lambda v: (nearest[v] if v not in medoids else -1))
+        medoids.append(far)
+        for v in vertices:
+            nearest[v] = min(nearest[v], dist.get(far, v))
+
+    for r in range(rounds):
+        clusters = [[] for m in medoids]
+        for v in vertices:
+            clusters[min(range(k), key=lambda i: dist.get(medoids[i], v))].append(v)
+        moved = False
+        for i, cluster in enumerate(clusters):
+            if not cluster:
+                continue
+            best = min(cluster, key=lambda m: sum(weights[v] * dist.get(m, v) for v in cluster))
+            if best != medoids[i]:
+                medoids[i] = best
+                moved = True
+        if not moved:
+            break
+    return medoids
+
+
+# Assignment engine that replaces hand-written truck loads. Packages are grouped into units ("Must be delivered
+# with"), checked against their notes ("Can only be on truck N", "Delayed on flight ... until H:MM", "Wrong address
+# listed") and split over the slots without exceeding capacity. Units are seeded with k-medoids clusters, urgent
+# clusters going to first trips, then placed tightest-constrained first on the cheapest allowed slot. A local search
+# then moves and swaps units between slots while that lowers the summed nearest-neighbor tour length plus
+# late_trip_penalty miles for each package with a deadline that rides on a later trip. Returns {load_id: [packages]}.
+# Raises ValueError when the constraints cannot all be met.
+# O(U * S) for the placement and O(time_budget) for the local search, U units and S slots.
+def assign_loads(packages, vertex_of, dist, slots, depot=0, late_trip_penalty=25.0, time_budget=0.5,
+                 max_passes=50):
+    units = _build_units(list(packages), vertex_of)
+    slots = list(slots)
+    weights = {}
+    for unit in units:
+        for v in unit.vertices:
+            weights[v] = weights.get(v, 0) + 1
+
+    # seed: one medoid per slot, the clusters holding the most deadline packages going to the earliest trips.
+    medoids = k_medoids(dist, weights, len(slots), depot)
+    urgency = [0] * len(medoids)
+    for unit in units:
+        if unit.deadline < END_OF_DAY:
+            i = min(range(len(medoids)), key=lambda m: dist.get(medoids[m], unit.vertices[0]))
+            urgency[i] += unit.size
+    order = sorted(range(len(medoids)), key=lambda m: -urgency[m])
+    slot_order = sorted(range(len(slots)), key=lambda s: slots[s].trip)
+    medoid_of = {slot_order[i]: medoids[order[i]] for i in range(len(slots))}
+
+    def penalty(unit, s):
+        if unit.deadline < END_OF_DAY and slots[s].trip > 1:
+            return late_trip_penalty * sum(1 for p in unit.packages if parse_deadline(p.deadline) < END_OF_DAY)
+        return 0.0
+
+    # every slot ordered by how close its medoid is to a vertex, computed once per distinct vertex.
+    rank_cache = {}
+
+    def ranked(v):
+        if v not in rank_cache:
+            rank_cache[v] = sorted(range(len(slots)), key=lambda s: dist.get(medoid_of[s], v))
+        return rank_cache[v]
+
+    allowed = []
+    for unit in units:
+        options = [s for s in ranked(unit.vertices[0]) if unit.allows(slots[s])]
+        if not options:
+            raise ValueError("no truck load can take packages %s" % [p.p_id for p in unit.packages])
+        allowed.append(options)
+
+    # placement, tightest units first (fewest allowed slots, then earliest deadline, then largest).
+    load = [0] * len(slots)
+    members = [[] for s in slots]
+    where = [None] * len(units)
+    for u in sorted(range(len(units)), key=lambda u: (len(allowed[u]), units[u].deadline, -units[u].size)):
+        unit = units[u]
+        choices = sorted(allowed[u][:NEAREST_SLOTS], key=lambda s: dist.get(medoid_of[s], unit.vertices[0]) +
+                         penalty(unit, s)) + allowed[u][NEAREST_SLOTS:]
+        for s in choices:
+            if load[s] + unit.size <= slots[s].capacity:
+                load[s] += unit.size
+                members[s].append(u)
+                where[u] = s
+                break
+        else:
+            raise ValueError("not enough truck capacity for packages %s" % [p.p_id for p in unit.packages])
+
+    # local search balancer.
+    def slot_cost(s, unit_ids):
+        stops = [v for u in unit_ids for v in units[u].vertices]
+        plan = plan_route(dist, stops, depot, improve=False)
+        return plan.total_distance + sum(penalty(units[u], s) for u in unit_ids)
+
+    cost = [slot_cost(s, members[s]) for s in range(len(slots))]
+    stop_at = time.perf_counter() + time_budget
+    for p in range(max_passes):
+        improved = False
+        for u in range(len(units)):
+            if time.perf_counter() > stop_at:
+                break
+            a = where[u]
+            for b in allowed[u][:NEAREST_SLOTS]:
+                if b == a:
+                    continue
+                without = [x for x in members[a] if x != u]
+                # move u from a to b.
+                if load[b] + units[u].size <= slots[b].capacity:
+                    new_a, new_b = slot_cost(a, without), slot_cost(b, members[b] + [u])
+                    if new_a + new_b < cost[a] + cost[b] - 1e-9:
+                        members[a], members[b] = without, members[b] + [u]
+                        load[a] -= units[u].size
+                        load[b] += units[u].size
+                        cost[a], cost[b], where[u] = new_a, new_b, b
+                        improved = True
+                        break
+                # swap u with a unit w of b.
+                for w in members[b]:
+                    if not units[w].allows(slots[a]):
+                        continue
+                    size_change = units[w].size - units[u].size
+                    if load[a] + size_change > slots[a].capacity or load[b] - size_change > slots[b].capacity:
+                        continue
+                    in_a = without + [w]
+                    in_b = [x for x in members[b] if x != w] + [u]
+                    new_a, new_b = slot_cost(a, in_a), slot_cost(b, in_b)
+                    if new_a + new_b < cost[a] + cost[b] - 1e-9:
+                        members[a], members[b] = in_a, in_b
+                        load[a] += size_change
+                        load[b] -= size_change
+                        cost[a], cost[b] = new_a, new_b
+                        where[u], where[w] = b, a
+                        improved = True
+                        break
+                if where[u] != a:
+                    break
+        if not improved or time.perf_counter() > stop_at:
+            break
+
+    result = {}
+    for s, slot in enumerate(slots):
+        result[slot.load_id] = sorted((p for u in members[s] for p in units[u].packages), key=lambda p: p.p_id)
+    return result
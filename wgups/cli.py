@@ -0,0 +1,233 @@
+import sys
+
+from wgups import instrument
+from wgups.clock import format_minutes, parse_hhmm
+from wgups.loaders import load_dataset
+from wgups.report import report_csv, report_json, route_csv, route_json, status_codes, write_report
+from wgups.simulation import AT_HUB, EN_ROUTE, SPEED_MPH, STATES, DeliveryDay
+from wgups.speeds import parse_profile
+
+
+# This method accepts a usertime and prints the status of all packages. The states of all packages at that time come
+# from one status_codes call over the timeline, and the lines are written to the screen in one go.
+# O(n) run-time complexity, n being the number of packages in the day.
+def search_allpackages_by_usertime(day, usertime):
+    t = parse_hhmm(usertime)
+    if t < day.day_start:
+        print("Business hours begin at %s, please enter a later time." % format_minutes(day.day_start))
+    else:
+        print('\n                                              ************************STATUS  OF ALL PACKAGES AT',
+              usertime, '************************')
+        timeline = day.timeline
+        codes = status_codes(timeline, t)
+        lines = []
+        for yuh in sorted(day.packages):
+            i = timeline.row_of.get(yuh)
+            if i is None:  # taken off the trucks, e.g. cancelled
+                pkg = day.packages.search(yuh)
+                lines.append("Package %s | STATUS: %s | %s" % (pkg, pkg.status, format_minutes(pkg.time_mod)))
+                continue
+            state = STATES[codes[i]]
+            if state == AT_HUB:
+                lines.append("Package %s | STATUS: at hub | scheduled departure %s" % (
+                    day.packages.search(yuh), format_minutes(timeline.departs[i])))
+            elif state == EN_ROUTE:
+                lines.append("Package %s | STATUS: en route | est. delivery time: %s" % (
+                    day.packages.search(yuh), format_minutes(timeline.delivers[i])))
+            else:
+                lines.append("Package %s | STATUS: %s | %s" % (
+                    day.packages.search(yuh), state, format_minutes(timeline.delivers[i])))
+        sys.stdout.write('\n'.join(lines) + '\n' if lines else '')
+
+
+# This method accepts a time and a package ID and prints the status of the package at that time.
+# O(1) average run-time complexity, the table search and the timeline lookup are both O(1).
+def search_a_package_by_usertime(day, usertime, p_id):
+    pkg = day.packages.search(p_id)
+    t = parse_hhmm(usertime)
+    if t < day.day_start:
+        print("Business hours begin at %s, please enter a later time." % format_minutes(day.day_start))
+    else:
+        print('\n                                              ************************STATUS OF PACKAGE', p_id, 'AT',
+              usertime, '************************')
+        if p_id not in day.timeline.row_of:
+            print("Package", pkg, "| STATUS: ", pkg.status, "|", format_minutes(pkg.time_mod))
+            return
+        state, minute = day.timeline.package_status(p_id, t)
+        if state == AT_HUB:
+            print("Package", pkg, "| STATUS: at hub | scheduled departure", format_minutes(minute))
+        elif state == EN_ROUTE:
+            print("Package", pkg, "| STATUS: en route  | est. delivery time:", format_minutes(minute))
+        else:
+            print("Package", pkg, "| STATUS: ", state, "|", format_minutes(minute))
+
+
+# print(search_a_package_by_usertime('9:45', 13))
+
+
+# The second loads and the truck that drives them, with the name used in the truck status line.
+second_runs = {4: (1, "Truck #1, Second Run"), 3: (2, "Truck #2, Load 2")}
+
+
+# This method accepts a time and a load number (1-4) and prints the miles the truck has driven by then and the status
+# of each package on the load. A second load (3 or 4) first prints its truck's first load, then, once the second load
+# has left the hub, the truck's total miles. Miles come from the timeline, interpolated along the route.
+# O(k log e) run-time complexity, k being the number of packages on the load and e the number of events.
+def search_a_truck_by_time(day, usertime, truck):
+    t = parse_hhmm(usertime)
+    if t < day.day_start:
+        print("Business hours begin at %s, please enter a later time." % format_minutes(day.day_start))
+        return
+
+    if truck == 1:
+        print("                                                  ------- Status of Truck", truck, "at",
+              usertime, '---',
+              '{:.2f}'.format(day.timeline.load_miles_at(truck, t)),
+              "miles traveled, first trip-------\n")
+    elif truck == 2:
+        print("\n                                                  ------- Status of Truck", truck, "at",
+              usertime, '---',
+              '{:.2f}'.format(day.timeline.load_miles_at(truck, t)),
+              " miles traveled, first trip-------\n")
+    elif truck in second_runs:
+        truck_id, name = second_runs[truck]
+        search_a_truck_by_time(day, usertime, truck_id)
+        if t >= day.timeline.departure(truck):
+            print("\n                                                  ------- Status of", name + ",", "at",
+                  usertime, '---',
+                  '{:.2f}'.format(day.timeline.miles_at(truck_id, t)),
+                  "total miles traveled by Truck #%d-------\n" % truck_id)
+
+    # the truck index returns this load's packages without scanning the whole table.
+    for pkg in day.packages.by_truck(truck):
+        state, minute = day.timeline.package_status(pkg.p_id, t)
+        if state == AT_HUB:
+            print("Package", pkg, "| at hub | scheduled departure", format_minutes(minute))
+        elif state == EN_ROUTE:
+            print("Package", pkg, "| en route  | est. delivery time:", format_minutes(minute))
+        else:
+            print("Package", pkg, "|", state, "|", format_minutes(minute))
+
+
+# This method prints the miles each truck drove and when it reloaded and finished, for the end of the day.
+# O(1) run-time complexity.
+def print_day_report(day):
+    form_trk1 = "{:.2f}".format(day.truck_distance(1))
+    form_trk2 = "{:.2f}".format(day.truck_distance(2))
+
+    total_mega_dist = "{:.2f}".format(day.total_distance)
+    print("\n\n                                                 **************************************************")
+    print("                                                 **   All Deliveries Completed in", total_mega_dist,
+          "Miles   **")
+    print("                                                 **************************************************\n")
+
+    timeline = day.timeline
+    print("Truck #1 miles traveled:", form_trk1,
+          "  |  departed the hub at " + format_minutes(timeline.departure(1)) + "  |  reloaded at " +
+          format_minutes(timeline.return_time(1)),
+          " |  all packages delivered, Truck #1 returned to the hub at " + format_minutes(timeline.return_time(4)))
+    print("Truck #2 miles traveled:", form_trk2,
+          "  |  departed the hub at " + format_minutes(timeline.departure(2)) + "  |  reloaded at " +
+          format_minutes(timeline.return_time(2)),
+          " |  all packages delivered, Truck #2 returned to the hub at " + format_minutes(timeline.return_time(3)))
+    for p_id, deadline, delivery in day.late_packages():
+        print("Package", p_id, "delivered late at", format_minutes(delivery),
+              "(deadline " + format_minutes(deadline) + ")")
+
+
+# Command line entry point: plans the day from the csv files in the current directory (with --auto-assign, the loads
+# are assigned by assign_loads instead of by hand, and with --deadlines loads are routed to meet package deadlines),
+# then asks what to search for and prints the end of day report.
+# With --report HH:MM[,HH:MM...] it instead writes the status of every package at those times to standard output as
+# CSV (or JSON with --json) and returns; --routes likewise writes every load's turn-by-turn route with the miles driven
+# at each vertex. Importing this module does none of this; only calling main() does.
+# --stats prints the stage timers and counters of wgups.instrument to standard error at the end, and
+# --profile cpu[,memory] writes a cProfile/tracemalloc report of the planning run (see wgups.instrument).
+# --speeds MPH[,FROM-TO:MPH...] gives the trucks a speed per hour of the day (see wgups.speeds.parse_profile).
+# --snapshot FILE restores the planned day from FILE while the csv files are unchanged, else plans it and writes FILE.
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if '--stats' in argv:
+        instrument.enable()
+    if '--profile' in argv:
+        instrument.profile(*argv[argv.index('--profile') + 1].split(','))
+    try:
+        _main(argv)
+    finally:
+        if instrument.ENABLED:
+            instrument.print_summary()
+
+
+def _main(argv):
+    speed = parse_profile(argv[argv.index('--speeds') + 1]) if '--speeds' in argv else SPEED_MPH
+    day = DeliveryDay(load_dataset(), auto_assign='--auto-assign' in argv, deadline_aware='--deadlines' in argv,
+                      speed=speed)
+    if '--snapshot' in argv:
+        from wgups.snapshot import cached_day
+        cached_day(argv[argv.index('--snapshot') + 1], day)
+    day.plan()
+    if '--report' in argv:
+        times = argv[argv.index('--report') + 1].split(',')
+        with instrument.stage('report'):
+            data = report_json(day.timeline, times) if '--json' in argv else report_csv(day.timeline, times)
+            write_report(data, sys.stdout.buffer)
+        return
+    if '--routes' in argv:
+        with instrument.stage('report'):
+            write_report(route_json(day) if '--json' in argv else route_csv(day), sys.stdout.buffer)
+        return
+    print("\n                                                           --------------------------------")
+    print("                                                            WGUPS Package Delivery Service   ")
+    print("                                                          ----------------------------------")
+
+    user_selection = input("Please make a selection by typing the number and then Enter. \nFor package information: "
+                           "1\nFor truck information: 2\nTo quit: 3\nYour Selection:")
+    if user_selection == '1':
+        pak_select = input("Please make a selection by typing the number and then Enter. \nFor all packages: "
+                           "1\nFor a single package: 2\nTo quit: 3\nYour Selection:")
+        if pak_select == '1':
+            tyme = input('To search status of all Packages, enter a time in the form HH:MM')
+            while tyme == '':
+                tyme = input('Enter a valid time HH:MM')
+            with instrument.stage('status_print'):
+                search_allpackages_by_usertime(day, tyme)
+        elif pak_select == '2':
+            tyme = input('Enter a time in the form HH:MM')
+            while tyme == '':
+                tyme = input('Enter a valid time HH:MM')
+            pak_id = input('To search a specific package, enter the Package ID')
+            while pak_id == '':
+                pak_id = input('To search a specific package, enter the Package ID')
+            while int(pak_id) > 40:
+                pak_id = input("try again, 40 packages today")
+            with instrument.stage('status_print'):
+                search_a_package_by_usertime(day, tyme, int(pak_id))
+        elif pak_select == '3':
+            return
+        else:
+            print("invalid selection")
+
+    elif user_selection == '2':
+        trk_select = input("Please make a selection by typing the number and then Enter. \nFor all trucks: "
+                           "1\nFor a single truck: 2\nTo quit: 3\nYour Selection:")
+        if trk_select == '1':
+            tyme = input("To search all trucks by a time, please enter a time in the form HH:MM")
+            with instrument.stage('status_print'):
+                search_a_truck_by_time(day, tyme, 4)
+                search_a_truck_by_time(day, tyme, 3)
+        elif trk_select == '2':
+            tyme = input("To search a specific truck by a time, please enter a time in the form HH:MM")
+            truk_id = input('Choose a truck:\n 4:  Truck #1 \n 3:  Truck #2 ')
+            with instrument.stage('status_print'):
+                search_a_truck_by_time(day, tyme, int(truk_id))
+        elif trk_select == '3':
+            return
+        else:
+            print("invalid selection")
+    elif user_selection == '3':
+        return
+    else:
+        print("Invalid Selection, choose again")
+
+    print_day_report(day)
@@ -0,0 +1,61 @@
+from functools import lru_cache
+
+# Times of day are kept as whole minutes after midnight everywhere: package deadlines, departures and deliveries,
+# truck start times and query times. Only a truck's position between two stops keeps fractions of a minute, so its
+# mileage can be interpolated. Text ('HH:MM', or '10:30 AM' / 'EOD' for deadlines) is only parsed where a time comes
+# in from a file or a person and only formatted where one goes out, and both directions are cached: formatting is a
+# tuple lookup for any minute of two days, parsing an lru_cache hit for any text seen before.
+DAY_MINUTES = 24 * 60
+END_OF_DAY = DAY_MINUTES  # deadline of an 'EOD' package
+
+_CLOCK = tuple('%02d:%02d' % divmod(minute, 60) for minute in range(2 * DAY_MINUTES))
+
+
+# Formats minutes after midnight as 'HH:MM', dropping any fraction of a minute.
+# O(1) run-time complexity.
+def format_minutes(minutes):
+    minutes = int(minutes)
+    if 0 <= minutes < len(_CLOCK):
+        return _CLOCK[minutes]
+    return '{:02d}:{:02d}'.format(minutes // 60, minutes % 60)
+
+
+# Converts an 'HH:MM' time of day to minutes after midnight, or returns -1 for None / ''.
+# O(1) run-time complexity.
+@lru_cache(maxsize=4096)
+def parse_hhmm(text):
+    if not text:
+        return -1
+    hour, minute = text.split(':')
+    return int(hour) * 60 + int(minute)
+
+
+# Minutes after midnight for a time given as minutes or as an 'HH:MM' string.
+# O(1) run-time complexity.
+def to_minutes(t):
+    return parse_hhmm(t) if isinstance(t, str) else t
+
+
+# Converts a deadline as written in packages.csv ('10:30 AM', '9:00 AM', 'EOD') to minutes after midnight.
+# O(1) run-time complexity.
+@lru_cache(maxsize=1024)
+def parse_deadline(deadline):
+    text = deadline.strip().upper()
+    if text in ('', 'EOD'):
+        return END_OF_DAY
+    clock, _, meridiem = text.partition(' ')
+    hour, minute = clock.split(':')
+    hour, minute = int(hour) % 12, int(minute)
+    if meridiem == 'PM':
+        hour += 12
+    return hour * 60 + minute
+
+
+# Formats a deadline in minutes after midnight the way packages.csv writes it ('10:30 AM', 'EOD').
+# O(1) run-time complexity.
+@lru_cache(maxsize=1024)
+def format_deadline(minutes):
+    if minutes == END_OF_DAY:
+        return 'EOD'
+    hour = minutes // 60
+    return '%d:%02d %s' % ((hour - 1) % 12 + 1, minutes % 60, 'PM' if hour >= 12 else 'AM')
@@ -0,0 +1,292 @@
+import heapq
+import json
+import os
+import struct
+import sys
+from array import array
+
+from wgups import instrument
+
+# Contraction hierarchies over a CompactGraph: vertices are removed ("contracted") one at a time, least important
+# first, and whenever removing v would lengthen a shortest path u -> v -> x a shortcut edge u -> x is added in its
+# place. A query then only searches upwards in that order, forwards from the source and backwards from the target, and
+# settles a few hundred vertices on a road-like graph instead of most of the graph. Edges point either way, so
+# directed graphs work as well as the undirected ones the csv files give.
+#
+# The built index is a handful of flat arrays and is written to and read from one binary file: MAGIC, then '<IQ'
+# (format version, length of the JSON header), the JSON header, then every array section in the order listed there.
+MAGIC = b'WGUPSCH\0'
+VERSION = 1
+_PREFIX = struct.Struct('<IQ')
+WITNESS_LIMIT = 64  # vertices a witness search may settle before giving up and adding the shortcut anyway
+_SECTIONS = ('rank', 'up_offsets', 'up_targets', 'up_weights', 'down_offsets', 'down_targets', 'down_weights',
+             'shortcut_from', 'shortcut_to', 'shortcut_via')
+
+
+# Flat (offsets, targets, weights) arrays for lists of (target, weight) pairs per vertex.
+# O(V + E) run-time complexity.
+def _csr(lists):
+    offsets, targets, weights = array('l', [0]), array('l'), array('d')
+    for edges in lists:
+        for x, w in edges:
+            targets.append(x)
+            weights.append(w)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+# Contraction of a graph in progress: the edges among vertices not contracted yet, in both directions, and the vertex
+# each shortcut stands in for.
+class _Contraction:
+    def __init__(self, cgraph):
+        n = len(cgraph)
+        self.out = [{} for v in range(n)]  # {x: weight} of the edges v -> x
+        self.inn = [{} for v in range(n)]  # {u: weight} of the edges u -> v
+        self.via = {}  # {(u, x): v} for the shortcut u -> x through v
+        self.contracted = bytearray(n)
+        self.neighbors_contracted = array('l', [0]) * n
+        self.level = array('l', [0]) * n  # 1 + the highest level among contracted neighbours
+        for u in range(n):
+            for x, w in cgraph.neighbors(u):
+                if x != u and w < self.out[u].get(x, float('inf')):
+                    self.out[u][x] = w
+                    self.inn[x][u] = w
+
+    # Shortest distances from u to each of targets avoiding v, each search stopping at limit miles or WITNESS_LIMIT
+    # settled vertices. A distance the search did not reach comes back as infinity, which may only add a shortcut that
+    # was not needed, never lose one.
+    def _witness(self, u, v, targets, limit):
+        dist = {u: 0.0}
+        done = set()
+        heap = [(0.0, u)]
+        left = set(targets)
+        while heap and left and len(done) < WITNESS_LIMIT:
+            d, y = heapq.heappop(heap)
+            if y in done:
+                continue
+            if d > limit:
+                break
+            done.add(y)
+            left.discard(y)
+            for x, w in self.out[y].items():
+                if x != v and d + w < dist.get(x, float('inf')):
+                    dist[x] = d + w
+                    heapq.heappush(heap, (d + w, x))
+        return dist
+
+    # The shortcuts (u, x, weight) contracting v would need.
+    # O(in-degree * witness search) run-time complexity.
+    def shortcuts(self, v):
+        needed = []
+        out = self.out[v]
+        for u, w1 in self.inn[v].items():
+            targets = [x for x in out if x != u]
+            if not targets:
+                continue
+            limit = w1 + max(out[x] for x in targets)
+            dist = self._witness(u, v, targets, limit)
+            for x in targets:
+                w = w1 + out[x]
+                if dist.get(x, float('inf')) > w:
+                    needed.append((u, x, w))
+        return needed
+
+    # Edge difference plus contracted neighbours plus level: the lower, the earlier v is contracted. The last two
+    # spread the contraction evenly over the graph, which keeps the hierarchy shallow.
+    def priority(self, v):
+        return len(self.shortcuts(v)) - len(self.inn[v]) - len(self.out[v]) + self.neighbors_contracted[v] + \
+            self.level[v]
+
+    # Removes v, adding its shortcuts, and returns its remaining edges as (up, down): [(x, w)] of v -> x and
+    # [(u, w)] of u -> v.
+    def contract(self, v):
+        for u, x, w in self.shortcuts(v):
+            if w < self.out[u].get(x, float('inf')):
+                self.out[u][x] = w
+                self.inn[x][u] = w
+                self.via[u, x] = v
+        up, down = list(self.out[v].items()), list(self.inn[v].items())
+        for x, w in up:
+            del self.inn[x][v]
+        for u, w in down:
+            del self.out[u][v]
+        for x in set(self.out[v]) | set(self.inn[v]):
+            self.neighbors_contracted[x] += 1
+            self.level[x] = max(self.level[x], self.level[v] + 1)
+        self.out[v], self.inn[v] = {}, {}
+        self.contracted[v] = 1
+        return up, down
+
+
+# A built contraction hierarchy, answering distance(s, t) and path(s, t) between vertex ids of the graph it was built
+# from. up holds each vertex's edges to later-contracted vertices; down holds, for each vertex, the edges coming into it
+# from later-contracted vertices, so the backward search from a target also only climbs.
+class ContractionHierarchy:
+    def __init__(self, rank, up, down, shortcuts, labels):
+        self.rank = rank  # array('l'), contraction order of each vertex
+        self.up_offsets, self.up_targets, self.up_weights = up
+        self.down_offsets, self.down_targets, self.down_weights = down
+        self.shortcut_from, self.shortcut_to, self.shortcut_via = shortcuts
+        self.labels = labels
+        self.via = {(u, x): v for u, x, v in zip(*shortcuts)}
+
+    def __len__(self):
+        return len(self.rank)
+
+    @property
+    def shortcut_count(self):
+        return len(self.via)
+
+    # Settles one vertex of one side of the query and returns it; returns None once that side's heap is empty or
+    # only holds distances no better than best. A vertex reached more cheaply through a higher one already seen (an
+    # edge of the other direction, in stall) cannot be on the shortest path, so its edges are not relaxed
+    # (stall-on-demand).
+    @staticmethod
+    def _step(heap, dist, pred, edges, stall, best):
+        offsets, targets, weights = edges
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if d >= best:
+                heap.clear()
+                return None
+            s_offsets, s_targets, s_weights = stall
+            for e in range(s_offsets[u], s_offsets[u + 1]):
+                x = s_targets[e]
+                if x in dist and dist[x] + s_weights[e] < d:
+                    return u
+            for e in range(offsets[u], offsets[u + 1]):
+                x = targets[e]
+                alt = d + weights[e]
+                if alt < dist.get(x, float('inf')):
+                    dist[x] = alt
+                    pred[x] = u
+                    heapq.heappush(heap, (alt, x))
+            return u
+        return None
+
+    # Both upward searches; returns (distance, meeting vertex, forward pred, backward pred), meeting vertex -1 and
+    # distance infinity when t cannot be reached from s.
+    # O(k log k) run-time complexity, k being the vertices settled, typically a few hundred.
+    def _search(self, s, t):
+        fdist, bdist = {s: 0.0}, {t: 0.0}
+        fpred, bpred = {}, {}
+        fheap, bheap = [(0.0, s)], [(0.0, t)]
+        best, meet = (0.0, s) if s == t else (float('inf'), -1)
+        up = (self.up_offsets, self.up_targets, self.up_weights)
+        down = (self.down_offsets, self.down_targets, self.down_weights)
+        settled = 0
+        sides = ((fheap, fdist, fpred, up, down, bdist), (bheap, bdist, bpred, down, up, fdist))
+        while fheap or bheap:
+            for heap, dist, pred, edges, stall, other in sides:
+                u = self._step(heap, dist, pred, edges, stall, best)
+                if u is not None:
+                    settled += 1
+                    if u in other and dist[u] + other[u] < best:
+                        best, meet = dist[u] + other[u], u
+        if instrument.ENABLED:
+            instrument.count('hierarchy.queries')
+            instrument.count('hierarchy.settled', settled)
+        return best, meet, fpred, bpred
+
+    # Shortest distance from vertex id s to vertex id t, infinity if there is no path.
+    def distance(self, s, t):
+        return self._search(s, t)[0]
+
+    # Appends the original vertices of edge u -> x, after u, to path, expanding shortcuts.
+    def _unpack(self, u, x, path):
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            v = self.via.get((a, b))
+            if v is None:
+                path.append(b)
+            else:
+                stack.append((v, b))
+                stack.append((a, v))
+
+    # (distance, vertex ids from s to t) over the original edges, (inf, []) if there is no path.
+    # O(k log k + p) run-time complexity, p being the vertices on the path.
+    def path(self, s, t):
+        best, meet, fpred, bpred = self._search(s, t)
+        if meet < 0:
+            return best, []
+        climb = [meet]
+        while climb[-1] != s:
+            climb.append(fpred[climb[-1]])
+        climb.reverse()
+        descent = [meet]
+        while descent[-1] != t:
+            descent.append(bpred[descent[-1]])
+        path = [s]
+        for u, x in zip(climb, climb[1:]):
+            self._unpack(u, x, path)
+        for u, x in zip(descent, descent[1:]):
+            self._unpack(u, x, path)
+        return best, path
+
+    # Writes the index to path (through a temporary file).
+    # O(V + E) run-time complexity.
+    def save(self, path):
+        sections = [getattr(self, name) for name in _SECTIONS]
+        header = json.dumps({'byteorder': sys.byteorder, 'labels': self.labels,
+                             'sections': [[name, data.typecode, len(data)] for name, data in zip(_SECTIONS, sections)]},
+                            separators=(',', ':')).encode()
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC + _PREFIX.pack(VERSION, len(header)) + header)
+            for data in sections:
+                data.tofile(f)
+        os.replace(tmp, path)
+        return path
+
+
+# Reads an index written by ContractionHierarchy.save. Raises ValueError for a file that is not one, or of another
+# version or byte order.
+# O(V + E) run-time complexity.
+def load_hierarchy(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a contraction hierarchy" % path)
+        version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+        if version != VERSION:
+            raise ValueError("%s is contraction hierarchy version %d, expected %d" % (path, version, VERSION))
+        header = json.loads(f.read(length))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError("%s was written on a %s-endian machine" % (path, header['byteorder']))
+        arrays = {}
+        for name, typecode, count in header['sections']:
+            arrays[name] = array(typecode)
+            arrays[name].fromfile(f, count)
+    return ContractionHierarchy(arrays['rank'], [arrays[name] for name in _SECTIONS[1:4]],
+                                [arrays[name] for name in _SECTIONS[4:7]], [arrays[name] for name in _SECTIONS[7:]],
+                                header['labels'])
+
+
+# Contracts every vertex of a CompactGraph, cheapest first by edge difference (lazily re-evaluated when popped), and
+# returns the ContractionHierarchy. Distances and paths from it equal those of dijkstra() on the same graph.
+# Roughly O(V * d^2 * witness search) run-time complexity, d being the degree, which stays small on road-like graphs.
+def build_hierarchy(cgraph):
+    with instrument.stage('build_hierarchy'):
+        n = len(cgraph)
+        work = _Contraction(cgraph)
+        heap = [(work.priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = array('l', [0]) * n
+        ups, downs = [None] * n, [None] * n
+        order = 0
+        while heap:
+            p, v = heapq.heappop(heap)
+            current = work.priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+            rank[v] = order
+            order += 1
+            ups[v], downs[v] = work.contract(v)
+        shortcuts = (array('l', [u for u, x in work.via]), array('l', [x for u, x in work.via]),
+                     array('l', work.via.values()))
+        if instrument.ENABLED:
+            instrument.count('hierarchy.shortcuts', len(work.via))
+    return ContractionHierarchy(rank, _csr(ups), _csr(downs), shortcuts, list(cgraph.labels))
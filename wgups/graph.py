@@ -0,0 +1,452 @@
+import heapq
+import math
+from array import array
+from collections.abc import Mapping
+
+from wgups import instrument
+
+
+# Class for creating a Vertex object, to represent an address to visit. Contains constructor for new vertex
+# object, initialized with distance infinity and a preceding vertex initialized to None to be used in conjunction
+# with Dijkstra's algorithm. Only dijkstras_short still fills in distance and pred_vertex; the array-based dijkstra()
+# keeps its per-run state in its own arrays. __slots__ keeps each Vertex to three fixed fields.
+# O(1) since one Vertex is created each time init is called.
+class Vertex:
+    __slots__ = ('label', 'distance', 'pred_vertex')
+
+    def __init__(self, label):
+        self.label = label
+        self.distance = float('inf')
+        self.pred_vertex = None
+
+    def __str__(self):  # print the data not references
+        return "%s, %f, %s" % (self.label, self.distance, self.pred_vertex)
+
+    def __repr__(self):
+        return f'Vertex({self.label})'  # ,"{self.distance}",{self.pred_vertex})'
+
+
+# Class for creating a graph from a set of Vertices. Contains a dictionary to hold a list of vertices adjacent to
+# each vertex, and another dictionary to hold 'edge-weights' which represent distances between vertices.
+# O(1) since one Vertex is created each time init is called.
+class Graph:
+    def __init__(self):
+        self.adjacency_list = {}  # vertex dictionary {key:value}
+        self.edge_weights = {}  # edge dictionary {key:value}
+        self.vertex_list = []
+        self._compact = None  # cached CompactGraph, dropped whenever the graph changes
+
+    # This method adds a Vertex to the Graph by adding it as a key to adjacency_list dict with value
+    # initialized to an empty list, and the Vertex is also appended to the vertex_list.
+    # O(1) run-time complexity, adding to a dictionary and a list.
+    def add_vertex(self, new_vertex):
+        self.adjacency_list[new_vertex] = []  # {vertex_1: [], vertex_2: [], ...}
+        self.vertex_list.append(new_vertex)
+        self._compact = None
+
+    # This method takes two Vertex objects along with the distance between them and records it in edge_weights.
+    # O(n) run-time complexity, if to_vertex not in self.adjacency_list[from_vertex]:
+    def add_directed_edge(self, from_vertex, to_vertex, distance=1.0):
+        self.edge_weights[(from_vertex.label, to_vertex.label)] = distance
+        if to_vertex not in self.adjacency_list[from_vertex]:
+            self.adjacency_list[from_vertex].append(to_vertex)
+        self._compact = None
+
+    # This method takes two Vertex objects along with the distance between them, calling add_directed_edge twice but
+    # switching the to and from vertices, adding both directions with the same distance.
+    # O(n) run-time complexity, since add_directed_edge is called twice.
+    def add_undirected_edge(self, vertex_a, vertex_b, distance=1.0):
+        # these two directed edges together make up the undirected edge
+        self.add_directed_edge(vertex_a, vertex_b, distance)
+        self.add_directed_edge(vertex_b, vertex_a, distance)
+
+    # Returns the CompactGraph for this graph, building it on first use and reusing it until the graph is changed.
+    # O(V + E) run-time complexity the first time, O(1) afterwards.
+    def compact(self):
+        if self._compact is None:
+            self._compact = CompactGraph.from_graph(self)
+        return self._compact
+
+    def __str__(self):  # print the data not references
+        return "%s, %s" % (self.adjacency_list, self.edge_weights)
+
+
+# Graph whose edges come from a square DistanceMatrix instead of being added one at a time. Vertices are created up
+# front (label == row number) but adjacency_list and edge_weights are read-only views that look entries up in the
+# matrix on demand, so a large network costs no per-edge Python objects until something asks for them. Adding a vertex
+# or edge copies the views into ordinary dictionaries first and then behaves like Graph.
+# O(V) run-time complexity to create.
+class MatrixGraph(Graph):
+    def __init__(self, matrix):
+        super().__init__()
+        self.matrix = matrix
+        self.vertex_list = [Vertex(i) for i in range(matrix.n)]
+        self.adjacency_list = _MatrixAdjacency(self)
+        self.edge_weights = _MatrixEdgeWeights(matrix)
+
+    # Copies the lazy views into plain dictionaries so the graph can be modified.
+    # O(V^2) run-time complexity.
+    def _materialize(self):
+        if isinstance(self.adjacency_list, _MatrixAdjacency):
+            self.adjacency_list = {vertex: self.adjacency_list[vertex] for vertex in self.vertex_list}
+            self.edge_weights = dict(self.edge_weights)
+
+    def add_vertex(self, new_vertex):
+        self._materialize()
+        super().add_vertex(new_vertex)
+
+    def add_directed_edge(self, from_vertex, to_vertex, distance=1.0):
+        self._materialize()
+        super().add_directed_edge(from_vertex, to_vertex, distance)
+
+    def compact(self):
+        if self._compact is None:
+            if isinstance(self.adjacency_list, _MatrixAdjacency):
+                self._compact = CompactGraph.from_matrix(self.matrix)
+            else:
+                self._compact = CompactGraph.from_graph(self)
+        return self._compact
+
+
+# adjacency_list view for MatrixGraph: the neighbors of a vertex are every other vertex with a finite distance.
+class _MatrixAdjacency(Mapping):
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, vertex):
+        row = self.graph.matrix.row(vertex.label)
+        return [self.graph.vertex_list[j] for j, w in enumerate(row) if j != vertex.label and w != float('inf')]
+
+    def __iter__(self):
+        return iter(self.graph.vertex_list)
+
+    def __len__(self):
+        return len(self.graph.vertex_list)
+
+
+# edge_weights view for MatrixGraph, keyed by (from label, to label) like Graph.edge_weights.
+class _MatrixEdgeWeights(Mapping):
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    def __getitem__(self, key):
+        a, b = key
+        if a == b or not (0 <= a < self.matrix.n and 0 <= b < self.matrix.n):
+            raise KeyError(key)
+        w = self.matrix.get(a, b)
+        if w == float('inf'):
+            raise KeyError(key)
+        return w
+
+    def __iter__(self):
+        n = self.matrix.n
+        for a in range(n):
+            row = self.matrix.row(a)
+            for b in range(n):
+                if a != b and row[b] != float('inf'):
+                    yield a, b
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+# Array-backed (CSR) copy of a Graph. Vertices are numbered by their position in graph.vertex_list; the neighbors of
+# vertex v are targets[offsets[v]:offsets[v + 1]] with matching weights in the same slice of weights. Keeping the
+# adjacency in three flat arrays avoids the per-edge tuple lookups in edge_weights during Dijkstra.
+# O(V + E) memory.
+class CompactGraph:
+    def __init__(self, offsets, targets, weights, labels):
+        self.offsets = offsets  # array('l'), length V + 1
+        self.targets = targets  # array('l'), length E
+        self.weights = weights  # array('d'), length E
+        self.labels = labels  # list of Vertex labels, index == vertex id
+        self._reverse = None  # reverse(), once built
+
+    # Builds the CSR arrays from a Graph's adjacency_list and edge_weights.
+    # O(V + E) run-time complexity, every vertex and edge is visited once.
+    @classmethod
+    def from_graph(cls, graph):
+        ids = {}
+        for i, vertex in enumerate(graph.vertex_list):
+            ids[vertex] = i
+        offsets = array('l', [0])
+        targets = array('l')
+        weights = array('d')
+        for vertex in graph.vertex_list:
+            for adj in graph.adjacency_list[vertex]:
+                targets.append(ids[adj])
+                weights.append(graph.edge_weights[(vertex.label, adj.label)])
+            offsets.append(len(targets))
+        labels = [vertex.label for vertex in graph.vertex_list]
+        return cls(offsets, targets, weights, labels)
+
+    # Builds the CSR arrays directly from a square DistanceMatrix, skipping the diagonal and infinite entries.
+    # O(V^2) run-time complexity.
+    @classmethod
+    def from_matrix(cls, matrix):
+        n = matrix.n
+        inf = float('inf')
+        offsets = array('l', [0])
+        targets = array('l')
+        weights = array('d')
+        for i in range(n):
+            row = matrix.row(i)
+            for j in range(n):
+                if j != i and row[j] != inf:
+                    targets.append(j)
+                    weights.append(row[j])
+            offsets.append(len(targets))
+        return cls(offsets, targets, weights, list(range(n)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    # The graph with every edge turned around, for searching backwards from a target. Built on first use and kept.
+    # O(V + E) run-time complexity the first time, O(1) afterwards.
+    def reverse(self):
+        if self._reverse is None:
+            n = len(self)
+            counts = array('l', [0]) * (n + 1)
+            for t in self.targets:
+                counts[t + 1] += 1
+            for v in range(n):
+                counts[v + 1] += counts[v]
+            fill = array('l', counts)
+            targets = array('l', [0]) * len(self.targets)
+            weights = array('d', [0.0]) * len(self.weights)
+            for u in range(n):
+                for e in range(self.offsets[u], self.offsets[u + 1]):
+                    i = fill[self.targets[e]]
+                    targets[i] = u
+                    weights[i] = self.weights[e]
+                    fill[self.targets[e]] = i + 1
+            self._reverse = CompactGraph(counts, targets, weights, self.labels)
+            self._reverse._reverse = self
+        return self._reverse
+
+    # Weight of the lightest edge from u to v, infinity if there is none.
+    # O(d) run-time complexity, d being the out-degree of u.
+    def weight(self, u, v):
+        best = float('inf')
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[e] == v and self.weights[e] < best:
+                best = self.weights[e]
+        return best
+
+    # Yields (neighbor id, edge weight) pairs for vertex v.
+    # O(d) run-time complexity, d being the out-degree of v.
+    def neighbors(self, v):
+        for e in range(self.offsets[v], self.offsets[v + 1]):
+            yield self.targets[e], self.weights[e]
+
+
+# Binary-heap Dijkstra over a CompactGraph. Nothing is written to Vertex objects; instead a distance array and a
+# predecessor array (-1 meaning no predecessor) indexed by vertex id are returned, so several searches can share one
+# graph. Stale heap entries are skipped rather than decreased in place. With targets (vertex ids), the search is
+# one-to-many: it stops as soon as every target is settled, so only the entries of settled vertices, which include
+# every reachable target, are final.
+# O((V + E) log V) run-time complexity, less when the targets are settled early.
+def dijkstra(cgraph, source, targets=None):
+    n = len(cgraph)
+    inf = float('inf')
+    dist = array('d', [inf]) * n
+    pred = array('i', [-1]) * n
+    done = bytearray(n)
+    offsets, adj_targets, weights = cgraph.offsets, cgraph.targets, cgraph.weights
+
+    remaining = None if targets is None else set(targets)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for e in range(offsets[u], offsets[u + 1]):
+            v = adj_targets[e]
+            alt = d + weights[e]
+            if alt < dist[v]:
+                dist[v] = alt
+                pred[v] = u
+                heapq.heappush(heap, (alt, v))
+    if instrument.ENABLED:
+        # every edge out of a settled vertex was relaxed once.
+        instrument.count('dijkstra.runs')
+        instrument.count('dijkstra.relaxations', sum(offsets[u + 1] - offsets[u] for u in range(n) if done[u]))
+    return dist, pred
+
+
+# The vertex ids from source to target along a predecessor array (pred[v] the vertex before v, -1 for none, as
+# dijkstra returns or a row of AllPairs.pred), as an array('l'); empty when target was not reached. A chain longer than
+# the array, which only a predecessor array from another graph or source can give, raises ValueError.
+# O(k) run-time complexity, k being the number of vertices on the path.
+def path_ids(pred, source, target):
+    path = array('l', [target])
+    for step in range(len(pred)):
+        if path[-1] == source:
+            path.reverse()
+            return path
+        v = pred[path[-1]]
+        if v < 0:
+            return array('l')
+        path.append(v)
+    raise ValueError("predecessor chain from %s does not lead back to %s" % (target, source))
+
+
+# A* search from source to target over a CompactGraph. heuristic(v) must never overestimate the distance from v to
+# target (admissible), e.g. coordinate_heuristic for a road graph whose edges are at least as long as the straight
+# line; heuristic=None is plain Dijkstra stopping at target. A vertex whose distance improves after it was expanded is
+# expanded again, so an admissible but inconsistent heuristic still gives the shortest path. Returns (distance, path
+# as an array of vertex ids), (inf, empty array) when target cannot be reached.
+# O((V + E) log V) run-time complexity in the worst case; a good heuristic expands far fewer vertices.
+def astar(cgraph, source, target, heuristic=None):
+    if heuristic is None:
+        dist, pred = dijkstra(cgraph, source, (target,))
+        return dist[target], path_ids(pred, source, target)
+    n = len(cgraph)
+    inf = float('inf')
+    dist = array('d', [inf]) * n
+    pred = array('i', [-1]) * n
+    offsets, targets, weights = cgraph.offsets, cgraph.targets, cgraph.weights
+    expanded = 0
+
+    dist[source] = 0.0
+    heap = [(heuristic(source), 0.0, source)]
+    while heap:
+        f, d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if u == target:
+            break
+        expanded += 1
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            alt = d + weights[e]
+            if alt < dist[v]:
+                dist[v] = alt
+                pred[v] = u
+                heapq.heappush(heap, (alt + heuristic(v), alt, v))
+    if instrument.ENABLED:
+        instrument.count('astar.runs')
+        instrument.count('astar.expanded', expanded)
+    return dist[target], path_ids(pred, source, target)
+
+
+# Heuristic for astar from vertex coordinates (coords[v] == (x, y), in the units of the edge weights times scale): the
+# straight-line distance to target. Admissible whenever no edge is shorter than scale times the straight line between
+# its ends.
+def coordinate_heuristic(coords, target, scale=1.0):
+    tx, ty = coords[target]
+
+    def heuristic(v):
+        x, y = coords[v]
+        return math.hypot(x - tx, y - ty) * scale
+    return heuristic
+
+
+# Bidirectional Dijkstra from source to target: one search forwards from source and one backwards from target over
+# cgraph.reverse(), always advancing the side with the smaller frontier distance, until the two frontiers together
+# cannot beat the best path through a vertex seen from both sides. Returns (distance, path as an array of vertex
+# ids), (inf, empty array) when target cannot be reached.
+# O((V + E) log V) run-time complexity in the worst case; on road-like graphs each side settles roughly half the
+# radius of a one-sided search.
+def bidirectional_dijkstra(cgraph, source, target):
+    inf = float('inf')
+    if source == target:
+        return 0.0, array('l', [source])
+    n = len(cgraph)
+    graphs = (cgraph, cgraph.reverse())
+    dist = (array('d', [inf]) * n, array('d', [inf]) * n)
+    pred = (array('i', [-1]) * n, array('i', [-1]) * n)
+    done = (bytearray(n), bytearray(n))
+    heaps = ([(0.0, source)], [(0.0, target)])
+    dist[0][source] = 0.0
+    dist[1][target] = 0.0
+    best, meet = inf, -1
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if done[side][u]:
+            continue
+        done[side][u] = 1
+        mine, other = dist[side], dist[1 - side]
+        g = graphs[side]
+        for e in range(g.offsets[u], g.offsets[u + 1]):
+            v = g.targets[e]
+            alt = d + g.weights[e]
+            if alt < mine[v]:
+                mine[v] = alt
+                pred[side][v] = u
+                heapq.heappush(heaps[side], (alt, v))
+            if mine[v] + other[v] < best:
+                best, meet = mine[v] + other[v], v
+    if meet < 0:
+        return inf, array('l')
+    forward = path_ids(pred[0], source, meet)
+    backward = path_ids(pred[1], target, meet)
+    backward.reverse()
+    return best, forward + backward[1:]
+
+
+# Dijkstra's Shortest Path Algorithm to find how to deliver based on distances and addresses to visit. Kept as a
+# compatibility wrapper: the search itself runs on the heap-based dijkstra over the graph's cached compact arrays, and
+# the resulting distances and predecessors are then copied onto the Vertex objects for existing callers.
+# Given end_vertex, the query is point-to-point instead: hierarchy.path when a ContractionHierarchy built from
+# g.compact() is passed, else astar with heuristic (a function of vertex_list positions), or bidirectional_dijkstra, or
+# Dijkstra stopping at end_vertex. Every vertex is then reset and only those on the shortest path get distance and
+# pred_vertex, which is all get_shortest_path(g, start_vertex, end_vertex) reads.
+# O((V + E) log V) run-time complexity, far less with a hierarchy.
+def dijkstras_short(g, start_vertex, end_vertex=None, heuristic=None, bidirectional=False, hierarchy=None):
+    cgraph = g.compact()
+    if end_vertex is None:
+        dist, pred = dijkstra(cgraph, g.vertex_list.index(start_vertex))
+        for i, tex in enumerate(g.vertex_list):
+            tex.distance = dist[i]
+            tex.pred_vertex = cgraph.labels[pred[i]] if pred[i] >= 0 else None
+        return
+
+    source, target = g.vertex_list.index(start_vertex), g.vertex_list.index(end_vertex)
+    if hierarchy is not None:
+        distance, path = hierarchy.path(source, target)
+    elif bidirectional:
+        distance, path = bidirectional_dijkstra(cgraph, source, target)
+    else:
+        distance, path = astar(cgraph, source, target, heuristic)
+    for tex in g.vertex_list:
+        tex.distance = float('inf')
+        tex.pred_vertex = None
+    if not path:
+        return
+    travelled = 0.0
+    g.vertex_list[path[0]].distance = 0.0
+    for u, v in zip(path, path[1:]):
+        travelled += cgraph.weight(u, v)
+        g.vertex_list[v].distance = travelled
+        g.vertex_list[v].pred_vertex = cgraph.labels[u]
+
+
+# This method builds a shortest path starting with end_vertex, using the Vertex attribute pred_vertex (filled in by
+# dijkstras_short on g) to find the path back to start_vertex. The path is returned as 'label -> label -> ...'. The
+# labels are collected and joined once, and a vertex without a predecessor, or a chain longer than the graph (left
+# over from a search from another start), raises ValueError instead of looping.
+# O(n) run-time complexity, depending on how many vertices are between start_vertex and end-vertex.
+def get_shortest_path(g, start_vertex, end_vertex):
+    labels = [str(end_vertex.label)]
+    current_v = end_vertex
+    for step in range(len(g.vertex_list)):
+        if current_v is start_vertex:
+            labels.reverse()
+            return " -> ".join(labels)
+        if current_v.pred_vertex is None:
+            break
+        current_v = g.vertex_list[current_v.pred_vertex]
+        labels.append(str(current_v.label))
+    raise ValueError("no path from %s to %s; run dijkstras_short(g, start_vertex) first" % (start_vertex.label,
+                                                                                           end_vertex.label))
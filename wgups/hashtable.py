@@ -0,0 +1,225 @@
+from wgups import instrument
+
+
+# This class creates a chaining hash table to store all packages. Contains a hash table constructor, with methods to
+# add, remove, and search methods. If a collision occurs, the newly added item will be added to the bucket's list (
+# chaining) and when a search is performed the bucket will be found and the list iterated through. The table keeps
+# count of its items and doubles the number of buckets whenever count / buckets passes load_factor, so chains stay
+# short and insert, search and remove are O(1) on average however many packages are loaded.
+# O(n) time complexity (for i in range(initial_buckets)).
+class ChainHashTable:
+    # hash table constructor, with optional initial capacity, assigns each bucket an empty list. 39 was chosen in this
+    # case as the default initial bucket number because that's the number of packages assigned but also accommodates
+    # similar and growing business needs for versatility.
+    def __init__(self, initial_buckets=39, load_factor=0.75):
+        if initial_buckets < 1:
+            raise ValueError("initial_buckets must be at least 1")
+        if load_factor <= 0:
+            raise ValueError("load_factor must be positive")
+        self.load_factor = load_factor
+        self.count = 0
+        self.table = []
+        for i in range(initial_buckets):
+            self.table.append([])
+
+    # Inserts new item into hash table by unique key. Value is updated if key found to exist in table already.
+    # O(1) average time complexity, the bucket list is kept short by resizing.
+    def insert(self, key, item):
+        # The hash function below calculates which bucket the new item will belong to.
+        bucket = hash(key) % len(self.table)
+        bucket_list = self.table[bucket]
+
+        for kv in bucket_list:
+            if kv[0] == key:
+                kv[1] = item
+                return True
+
+        # If key is new, then insert item to the end of bucket list
+        key_value = [key, item]
+        bucket_list.append(key_value)
+        self.count += 1
+        if self.count > self.load_factor * len(self.table):
+            self.resize(2 * len(self.table) + 1)
+        return True
+
+    # Inserts every (key, item) pair. The table is grown once up front for the final count instead of doubling
+    # repeatedly along the way.
+    # O(n) average time complexity, n being the number of pairs.
+    def insert_many(self, pairs):
+        pairs = list(pairs)
+        needed = int((self.count + len(pairs)) / self.load_factor) + 1
+        if needed > len(self.table):
+            self.resize(needed)
+        for key, item in pairs:
+            self.insert(key, item)
+
+    # Search hash table using 'key' as search parameter. If found, the item is returned. If not, None is returned.
+    # O(1) average time complexity.
+    def search(self, key):
+        bucket = hash(key) % len(self.table)
+        bucket_list = self.table[bucket]
+        if instrument.ENABLED:
+            instrument.probe('hashtable', bucket_list, key)
+
+        # search for the key in the bucket list
+        for kv in bucket_list:
+            if kv[0] == key:
+                return kv[1]  # the value that belongs to the key
+        return None  # When key is not found
+
+    # To remove an item with matching key from the table. Returns True if the key was found.
+    # O(1) average time complexity.
+    def remove(self, key):
+        bucket = hash(key) % len(self.table)
+        bucket_list = self.table[bucket]
+
+        for i, kv in enumerate(bucket_list):
+            if kv[0] == key:
+                del bucket_list[i]
+                self.count -= 1
+                return True
+        return False
+
+    # Moves every item into a new table of new_buckets buckets.
+    # O(n) time complexity.
+    def resize(self, new_buckets):
+        old_table = self.table
+        self.table = [[] for i in range(max(1, new_buckets))]
+        for bucket_list in old_table:
+            for kv in bucket_list:
+                self.table[hash(kv[0]) % len(self.table)].append(kv)
+
+    # Yields (key, item) pairs in bucket order.
+    # O(n) time complexity.
+    def items(self):
+        for bucket_list in self.table:
+            for kv in bucket_list:
+                yield kv[0], kv[1]
+
+    def __len__(self):
+        return self.count
+
+    # Iterating over the table yields its keys, like a dict.
+    def __iter__(self):
+        for key, item in self.items():
+            yield key
+
+    def __contains__(self, key):
+        bucket_list = self.table[hash(key) % len(self.table)]
+        for kv in bucket_list:
+            if kv[0] == key:
+                return True
+        return False
+
+
+# Marker left in a slot whose key was removed, so probe sequences passing through it keep going.
+_DELETED = object()
+
+
+# Open-addressing variant of ChainHashTable with the same methods. Keys and items live in two parallel lists instead of
+# per-bucket lists of [key, item] pairs, and collisions are resolved by linear probing. Removed slots are marked
+# _DELETED and reused by later inserts; the table is rebuilt when live items plus markers pass load_factor.
+# O(n) time complexity (for i in range(initial_slots)).
+class OpenAddressHashTable:
+    def __init__(self, initial_slots=64, load_factor=0.6):
+        if initial_slots < 1:
+            raise ValueError("initial_slots must be at least 1")
+        if not 0 < load_factor < 1:
+            raise ValueError("load_factor must be between 0 and 1")
+        self.load_factor = load_factor
+        self.count = 0
+        self.used = 0  # live items plus _DELETED markers
+        self.keys = [None] * initial_slots
+        self.values = [None] * initial_slots
+        self.filled = bytearray(initial_slots)  # 1 where keys[i] holds a key or _DELETED
+
+    # Returns the slot holding key, or -1 if it is not in the table.
+    # O(1) average time complexity.
+    def _find(self, key):
+        size = len(self.keys)
+        i = hash(key) % size
+        keys, filled = self.keys, self.filled
+        while filled[i]:
+            k = keys[i]
+            if k is not _DELETED and k == key:
+                return i
+            i = (i + 1) % size
+        return -1
+
+    # O(1) average time complexity.
+    def insert(self, key, item):
+        size = len(self.keys)
+        i = hash(key) % size
+        reuse = -1
+        while self.filled[i]:
+            k = self.keys[i]
+            if k is _DELETED:
+                if reuse < 0:
+                    reuse = i
+            elif k == key:
+                self.values[i] = item
+                return True
+            i = (i + 1) % size
+        if reuse >= 0:
+            i = reuse
+        else:
+            self.filled[i] = 1
+            self.used += 1
+        self.keys[i] = key
+        self.values[i] = item
+        self.count += 1
+        if self.used > self.load_factor * size:
+            self.resize(max(2 * size, int(self.count / self.load_factor) + 1))
+        return True
+
+    # O(n) average time complexity, n being the number of pairs.
+    def insert_many(self, pairs):
+        pairs = list(pairs)
+        needed = int((self.count + len(pairs)) / self.load_factor) + 1
+        if needed > len(self.keys):
+            self.resize(needed)
+        for key, item in pairs:
+            self.insert(key, item)
+
+    # O(1) average time complexity.
+    def search(self, key):
+        i = self._find(key)
+        return self.values[i] if i >= 0 else None
+
+    # O(1) average time complexity.
+    def remove(self, key):
+        i = self._find(key)
+        if i < 0:
+            return False
+        self.keys[i] = _DELETED
+        self.values[i] = None
+        self.count -= 1
+        return True
+
+    # Re-inserts every live item into new_slots slots, dropping _DELETED markers.
+    # O(n) time complexity.
+    def resize(self, new_slots):
+        old = list(self.items())
+        self.keys = [None] * new_slots
+        self.values = [None] * new_slots
+        self.filled = bytearray(new_slots)
+        self.count = 0
+        self.used = 0
+        for key, item in old:
+            self.insert(key, item)
+
+    # O(n) time complexity.
+    def items(self):
+        for i, k in enumerate(self.keys):
+            if self.filled[i] and k is not _DELETED:
+                yield k, self.values[i]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for key, item in self.items():
+            yield key
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
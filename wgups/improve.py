@@ -0,0 +1,106 @@
+import time
+
+from wgups import instrument
+
+# Moves must shorten the tour by more than this many miles, so rounding noise cannot make the search cycle.
+EPSILON = 1e-9
+
+
+# Length of a trip that starts at start (depot unless given), visits route in order and returns to depot.
+# O(n) run-time complexity, n being the number of stops.
+def route_length(dist, route, depot=0, start=None):
+    total = 0.0
+    prev = depot if start is None else start
+    for v in route:
+        total += dist.get(prev, v)
+        prev = v
+    return total + dist.get(prev, depot)
+
+
+# Post-optimization for a route built by get_best_route. Starting from the given stop order, 2-opt moves (reverse a
+# segment) and Or-opt moves (move a run of 1 to 3 stops elsewhere, optionally reversed) are applied while they shorten
+# the trip from start (depot unless given, e.g. a truck's current stop) back to depot. Candidate moves only create an
+# edge to one of each stop's k nearest neighbors, which skips the many moves that cannot help, and distances are read
+# once into a local table, so finding a move is O(n k). Stops when no move helps, after max_iterations improving moves
+# or after time_budget seconds. Returns the improved stop order and its trip length, which is never longer than the
+# input's.
+# O(max_iterations * n * k) run-time complexity.
+def improve_route(dist, route, depot=0, time_budget=0.05, max_iterations=100, k=8, start=None):
+    route = list(route)
+    if len(route) < 3:
+        return route, route_length(dist, route, depot, start)
+    deadline = time.perf_counter() + time_budget
+
+    # local ids: 0 is the depot, 1..n the stops in their input order and, when the trip starts elsewhere, n + 1 the
+    # start. Ids rather than vertices are used throughout, so a vertex may appear more than once.
+    nodes = [depot] + route + ([] if start is None else [start])
+    n = len(nodes)
+    d = [[dist.get(a, b) for b in nodes] for a in nodes]
+    symmetric = all(d[i][j] == d[j][i] for i in range(n) for j in range(i))
+    near = [sorted((b for b in range(n) if b != a), key=lambda b: (d[a][b], nodes[b]))[:k] for a in range(n)]
+
+    # tour holds local ids from start to depot: tour[0] is the start (the depot for a round trip), tour[-1] the depot.
+    stops = len(route)
+    tour = [0 if start is None else stops + 1] + list(range(1, stops + 1)) + [0]
+
+    # cost of tour[i..j] walked forwards and backwards, needed only when distances are not symmetric.
+    def path_cost(i, j, reverse=False):
+        total = 0.0
+        for t in range(i, j):
+            total += d[tour[t + 1]][tour[t]] if reverse else d[tour[t]][tour[t + 1]]
+        return total
+
+    def two_opt():
+        pos = {v: i for i, v in enumerate(tour[:-1])}
+        for i in range(len(tour) - 2):
+            a, b = tour[i], tour[i + 1]
+            for c in near[a]:
+                j = pos.get(c, -1)
+                if j <= i + 1:
+                    continue
+                e = tour[j + 1]
+                # reverse tour[i+1..j]: edges a-b and c-e become a-c and b-e.
+                delta = d[a][c] + d[b][e] - d[a][b] - d[c][e]
+                if not symmetric:
+                    delta += path_cost(i + 1, j, reverse=True) - path_cost(i + 1, j)
+                if delta < -EPSILON:
+                    tour[i + 1:j + 1] = reversed(tour[i + 1:j + 1])
+                    return True
+        return False
+
+    def or_opt():
+        for length in (1, 2, 3):
+            for i in range(1, len(tour) - length):
+                seg = tour[i:i + length]
+                p, q = tour[i - 1], tour[i + length]
+                removed = d[p][seg[0]] + d[seg[-1]][q] - d[p][q]
+                rest = tour[:i] + tour[i + length:]
+                inner = 0.0 if symmetric else path_cost(i, i + length - 1)
+                for c in near[seg[0]] + near[seg[-1]]:
+                    if c in seg:
+                        continue
+                    for j in (rest.index(c) - 1, rest.index(c)):
+                        if j < 0 or j >= len(rest) - 1:
+                            continue
+                        x, y = rest[j], rest[j + 1]
+                        for rev in (False, True):
+                            s = seg[::-1] if rev else seg
+                            added = d[x][s[0]] + d[s[-1]][y] - d[x][y]
+                            if not symmetric and rev:
+                                added += sum(d[s[t]][s[t + 1]] for t in range(length - 1)) - inner
+                            if added - removed < -EPSILON:
+                                tour[:] = rest[:j + 1] + s + rest[j + 1:]
+                                return True
+        return False
+
+    iterations = 0
+    while iterations < max_iterations and time.perf_counter() < deadline:
+        iterations += 1
+        if not (two_opt() or or_opt()):
+            break
+
+    if instrument.ENABLED:
+        instrument.count('improve_route.calls')
+        instrument.count('improve_route.iterations', iterations)
+    improved = [nodes[v] for v in tour[1:-1]]
+    return improved, route_length(dist, improved, depot, start)
@@ -0,0 +1,163 @@
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Lightweight instrumentation of the planning pipeline: per-stage timers and event counters (Dijkstra runs and edge
+# relaxations, hash table probes, route improvement iterations, ...). Off unless the WGUPS_STATS environment variable
+# is set to anything but '' or '0', or enable() is called; while off, stage() hands back one shared do-nothing context
+# and the hot paths only test the module's ENABLED flag, so the cost is a global lookup per call site.
+#
+# WGUPS_PROFILE=cpu, memory or cpu,memory (or profile()) additionally runs every capture() block, one per planning
+# run, under cProfile and/or tracemalloc and writes a text report per run into WGUPS_PROFILE_DIR (default
+# .wgups_profile).
+
+ENABLED = os.environ.get('WGUPS_STATS', '') not in ('', '0')
+PROFILE = frozenset(mode for mode in os.environ.get('WGUPS_PROFILE', '').replace(' ', '').split(',') if mode)
+PROFILE_DIR = os.environ.get('WGUPS_PROFILE_DIR', '.wgups_profile')
+PROFILE_MODES = ('cpu', 'memory')
+
+counters = Counter()  # {name: count}
+peaks = {}  # {name: largest value seen}
+timers = {}  # {stage: [calls, seconds]}
+_NULL = nullcontext()
+_runs = 0
+
+
+# Turns counting and stage timing on (or off with on=False).
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+# Turns per-run profiling on for the given modes ('cpu', 'memory'), into directory when given; no modes turns it off.
+def profile(*modes, directory=None):
+    global PROFILE, PROFILE_DIR
+    unknown = set(modes) - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError("unknown profile mode(s) %s, expected %s" % (', '.join(sorted(unknown)),
+                                                                      ' or '.join(PROFILE_MODES)))
+    PROFILE = frozenset(modes)
+    if directory is not None:
+        PROFILE_DIR = directory
+
+
+# Clears every counter and timer.
+def reset():
+    counters.clear()
+    peaks.clear()
+    timers.clear()
+
+
+# Adds n to a counter. Callers on hot paths test ENABLED first, so nothing is done while it is off.
+def count(name, n=1):
+    counters[name] += n
+
+
+# Keeps the largest value seen under name.
+def peak(name, value):
+    if value > peaks.get(name, 0):
+        peaks[name] = value
+
+
+# Counts one chained hash table lookup of key in chain (its bucket): a search, the entries compared and the longest
+# chain walked.
+def probe(name, chain, key):
+    probes = len(chain)
+    for i, kv in enumerate(chain):
+        if kv[0] == key:
+            probes = i + 1
+            break
+    counters[name + '.searches'] += 1
+    counters[name + '.probes'] += probes
+    peak(name + '.longest_probe', probes)
+
+
+@contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = timers.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+
+
+# Context manager timing a stage of the pipeline under name; a shared no-op while instrumentation is off.
+# O(1) run-time complexity.
+def stage(name):
+    return _timed(name) if ENABLED else _NULL
+
+
+# Counters, peaks and timers as one JSON-ready dict.
+def summary():
+    return {'counters': dict(counters), 'peaks': dict(peaks),
+            'timers': {name: {'calls': calls, 'seconds': seconds} for name, (calls, seconds) in timers.items()}}
+
+
+# The summary as aligned text lines, stages slowest first.
+def format_summary():
+    lines = ["%-32s %8s %12s" % ('stage', 'calls', 'seconds')]
+    for name, (calls, seconds) in sorted(timers.items(), key=lambda item: -item[1][1]):
+        lines.append("%-32s %8d %12.6f" % (name, calls, seconds))
+    lines.append("%-32s %21s" % ('counter', 'value'))
+    for name in sorted(counters):
+        lines.append("%-32s %21d" % (name, counters[name]))
+    for name in sorted(peaks):
+        lines.append("%-32s %21d" % (name, peaks[name]))
+    return '\n'.join(lines) + '\n'
+
+
+# Writes the summary to a stream (standard error by default).
+def print_summary(out=None):
+    (out or sys.stderr).write(format_summary())
+
+
+# Runs the enclosed block as one profiled run named name when profiling is on, writing
+# PROFILE_DIR/<name>-<pid>-<run>.txt with the cProfile statistics (top 40 functions by cumulative time), the
+# tracemalloc top 25 allocation sites and peak, and the counters. A no-op while PROFILE is empty.
+@contextmanager
+def capture(name):
+    if not PROFILE:
+        yield None
+        return
+    global _runs
+    import io
+    _runs += 1
+    path = os.path.join(PROFILE_DIR, '%s-%d-%d.txt' % (name, os.getpid(), _runs))
+    profiler = None
+    if 'cpu' in PROFILE:
+        import cProfile
+        profiler = cProfile.Profile()
+    tracing = 'memory' in PROFILE
+    if tracing:
+        import tracemalloc
+        tracemalloc.start()
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield path
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+        report = io.StringIO()
+        report.write("%s: %.6f s\n\n" % (name, elapsed))
+        if profiler is not None:
+            import pstats
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(40)
+        if tracing:
+            snapshot = tracemalloc.take_snapshot()
+            current, high = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report.write("memory: %d bytes held, %d bytes peak\n" % (current, high))
+            for stat in snapshot.statistics('lineno')[:25]:
+                report.write("%s\n" % stat)
+            report.write("\n")
+        report.write(format_summary())
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        with open(path, 'w') as out:
+            out.write(report.getvalue())
@@ -0,0 +1,197 @@
+import csv
+import os
+import sys
+
+from wgups import instrument
+from wgups.graph import MatrixGraph
+from wgups.matrix import CACHE_DIR, all_pairs_cached, load_distance_matrix
+from wgups.package import Package, PackageTable
+
+# File names of the day's data, inside a dataset directory.
+PACKAGES_CSV = 'packages.csv'
+ADDRESSES_CSV = 'addresses.csv'
+DISTANCES_CSV = 'distance.csv'
+
+
+# Takes data from a csv file and reads each row into a new package object, inserted into table (a new PackageTable
+# unless one is given). Returns the table.
+# O(n) run-time complexity, for package in packageData:
+def load_packages(fileName, table=None):
+    if table is None:
+        table = PackageTable()
+    with open(fileName) as allPackages:
+        packageData = csv.reader(allPackages, delimiter=',')
+        for package in packageData:
+            pID = int(package[0])
+            pAddress = package[1]
+            # city, state, zipcode and deadline repeat across many packages, so one shared copy of each is kept.
+            pCity = sys.intern(package[2])
+            pState = sys.intern(package[3])
+            pZipcode = sys.intern(package[4])
+            pDeadline = sys.intern(package[5])
+            pMass_k = package[6]
+            pNote = package[7]
+            pTruck = None
+            pStatus = "at the hub"
+            pTime = 8 * 60  # minutes after midnight
+
+            # Creation of each Package object
+            p = Package(pID, pAddress, pCity, pState, pZipcode, pDeadline, pMass_k, pNote, pTruck, pStatus, pTime)
+
+            # Insert the new Package into table.
+            table.insert(pID, p)
+    return table
+
+
+# This method reads the addresses from a csv file into a list, in vertex order. Each row is one address; an address
+# holding commas (split by the csv reader) is joined back together.
+# O(n) run-time complexity, depending on the number of rows in the csv file.
+def load_addresses(fileName):
+    addresses = []
+    with open(fileName, newline='') as allAddresses:
+        addressData = csv.reader(allAddresses, delimiter=',')
+        for addrezz in addressData:
+            if addrezz:
+                addresses.append(','.join(addrezz).strip())
+    return addresses
+
+
+# Canonical form of an address for lookups: surrounding and repeated whitespace removed and case folded, so
+# '1060 Dalton Ave S' and ' 1060  dalton ave s' are the same address.
+# O(n) run-time complexity in the length of the address.
+def normalize_address(address):
+    return ' '.join(address.split()).casefold()
+
+
+# {canonical address: vertex} for addresses in vertex order. An address listed twice keeps its first vertex.
+# O(n) run-time complexity.
+def build_address_index(addresses):
+    index = {}
+    for vertex, address in enumerate(addresses):
+        index.setdefault(normalize_address(address), vertex)
+    return index
+
+
+# This method streams the csv file into a contiguous distance matrix (full or lower-triangular) and creates the Graph
+# from it. The graph's edges are views over the matrix, so no per-edge objects are built up front.
+# O(n^2) run-time complexity, each of the n * n cells is parsed once.
+def load_distance_graph(fileName):
+    return MatrixGraph(load_distance_matrix(fileName))
+
+
+# The three csv files of one delivery day, read only when first used and then kept. packages is the day's live
+# manifest: planning a day updates the status, truck and time of its packages. shortest is the all-pairs matrix,
+# read from the on-disk cache when distance.csv has been seen before, in which case the graph is never built.
+# packages_file names the manifest, packages.csv by default, a file name inside directory; an absolute path may name
+# one anywhere else.
+# O(1) run-time complexity to create, nothing is read until an attribute is used.
+class Dataset:
+    def __init__(self, directory='.', packages_file=PACKAGES_CSV):
+        self.directory = directory
+        self.packages_file = packages_file
+        self._packages = None
+        self._addresses = None
+        self._address_index = None
+        self._graph = None
+        self._shortest = None
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    @property
+    def packages(self):
+        if self._packages is None:
+            with instrument.stage('load_packages'):
+                self._packages = load_packages(self.path(self.packages_file))
+        return self._packages
+
+    @property
+    def addresses(self):
+        if self._addresses is None:
+            with instrument.stage('load_addresses'):
+                self._addresses = load_addresses(self.path(ADDRESSES_CSV))
+        return self._addresses
+
+    # {canonical address: vertex}, built once from addresses.
+    @property
+    def address_index(self):
+        if self._address_index is None:
+            self._address_index = build_address_index(self.addresses)
+        return self._address_index
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            with instrument.stage('load_distance_graph'):
+                self._graph = load_distance_graph(self.path(DISTANCES_CSV))
+        return self._graph
+
+    @property
+    def shortest(self):
+        if self._shortest is None:
+            with instrument.stage('all_pairs'):
+                self._shortest = all_pairs_cached(self.path(DISTANCES_CSV), lambda: self.graph.compact(),
+                                                  cache_dir=self.path(CACHE_DIR))
+        return self._shortest
+
+    # Vertex (row of the distance matrix) of an address, looked up in address_index. Raises ValueError for an address
+    # that is not in addresses.csv.
+    # O(1) average run-time complexity.
+    def vertex_of_address(self, address):
+        if instrument.ENABLED:
+            instrument.count('dataset.address_lookups')
+        vertex = self.address_index.get(normalize_address(address))
+        if vertex is None:
+            raise ValueError("address %r is not in %s" % (address, ADDRESSES_CSV))
+        return vertex
+
+    # Vertex of a package's address.
+    # O(1) average run-time complexity.
+    def vertex_of(self, package):
+        return self.vertex_of_address(package.address)
+
+    # Sets whichever of the parts are given (e.g. read from a snapshot) so they are not loaded from the csv files, and
+    # returns the Dataset. The address index is rebuilt from addresses.
+    # O(V) run-time complexity for the address index.
+    def preload(self, addresses=None, graph=None, shortest=None, packages=None):
+        if addresses is not None:
+            self._addresses = addresses
+            self._address_index = build_address_index(addresses)
+        if graph is not None:
+            self._graph = graph
+        if shortest is not None:
+            self._shortest = shortest
+        if packages is not None:
+            self._packages = packages
+        return self
+
+    # Another day over the same network: a Dataset with its own packages (a PackageTable, or the path of a packages
+    # csv file, relative to the working directory like any other path) that shares the addresses, address index, graph
+    # and shortest paths already loaded here.
+    # O(1) run-time complexity.
+    def with_packages(self, packages):
+        other = Dataset(self.directory, os.path.abspath(packages) if isinstance(packages, str) else self.packages_file)
+        if not isinstance(packages, str):
+            other._packages = packages
+        other._addresses = self._addresses
+        other._address_index = self._address_index
+        other._graph = self._graph
+        other._shortest = self._shortest
+        return other
+
+    def __repr__(self):
+        return f'Dataset({self.directory!r})'
+
+
+# Datasets already opened, by absolute directory.
+_datasets = {}
+
+
+# Returns the Dataset for a directory, the same object on every call so each file is read at most once per process.
+# reload=True drops the cached one and starts again from the files.
+# O(1) run-time complexity.
+def load_dataset(directory='.', reload=False):
+    key = os.path.abspath(directory)
+    if reload or key not in _datasets:
+        _datasets[key] = Dataset(directory)
+    return _datasets[key]
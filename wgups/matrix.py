@@ -0,0 +1,211 @@
+import ast
+import csv
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from wgups.graph import dijkstra, path_ids
+
+# Default folder for cached all-pairs matrices, next to the csv files.
+CACHE_DIR = '.wgups_cache'
+
+_NPY_MAGIC = b'\x93NUMPY'
+_NATIVE = '<' if sys.byteorder == 'little' else '>'
+# array typecode -> .npy dtype description, for the two element types stored here.
+_DESCR = {'d': 'f8', 'i': 'i4'}
+
+
+# Square n x n matrix stored row-major in one flat buffer (an array or a memoryview over a memory-mapped file).
+# Entry (i, j) lives at i * n + j, so a lookup is a single index operation.
+# O(1) run-time complexity for get and row.
+class DistanceMatrix:
+    def __init__(self, n, data):
+        self.n = n
+        self.data = data
+
+    def get(self, i, j):
+        return self.data[i * self.n + j]
+
+    # A read-only slice of row i, without copying when data is a memoryview.
+    def row(self, i):
+        return self.data[i * self.n:(i + 1) * self.n]
+
+    def __len__(self):
+        return self.n
+
+    def __repr__(self):
+        return f'DistanceMatrix({self.n})'
+
+
+# Returns the numbers in one csv row, ignoring blank cells (the empty upper half of a lower-triangular file).
+def _row_values(row):
+    return [float(cell) for cell in row if cell.strip()]
+
+
+# Streams a distance csv file straight into a contiguous DistanceMatrix, one row at a time. Both a full n x n matrix
+# and a lower-triangular one (row i holding only columns 0..i, the rest blank or missing) are accepted; a triangular
+# file is detected by its first row holding a single value. With symmetric=True (the default) the lower triangle is
+# taken as the distance in both directions, the same result the old edge-by-edge loader produced for a full file;
+# symmetric=False keeps a full file exactly as written. typecode 'd' stores float64, 'f' float32 to halve the memory
+# of very large networks.
+# O(n^2) run-time complexity, each cell is parsed once.
+def load_distance_matrix(fileName, typecode='d', symmetric=True):
+    with open(fileName, newline='') as allDistances:
+        distanceData = csv.reader(allDistances, delimiter=',')
+        first = None
+        for row in distanceData:
+            first = _row_values(row)
+            if first:
+                break
+        if not first:
+            return DistanceMatrix(0, array(typecode))
+        width = len(first)  # n for a full file, 1 for a triangular one
+
+        if width > 1 and not symmetric:
+            data = array(typecode, first)
+            rows = 1
+            for row in distanceData:
+                values = _row_values(row)
+                if not values:
+                    continue
+                if len(values) != width:
+                    raise ValueError("%s row %d has %d values, expected %d" % (fileName, rows, len(values), width))
+                data.extend(values)
+                rows += 1
+            if rows != width:
+                raise ValueError("%s has %d rows but %d columns" % (fileName, rows, width))
+            return DistanceMatrix(width, data)
+
+        # row i contributes its first i + 1 values, packed one after the other.
+        packed = array(typecode, first[:1])
+        n = 1
+        for row in distanceData:
+            values = _row_values(row)
+            if not values:
+                continue
+            if len(values) < n + 1 or (width > 1 and len(values) != width):
+                raise ValueError("%s row %d has %d values" % (fileName, n, len(values)))
+            packed.extend(values[:n + 1])
+            n += 1
+        if width > 1 and n != width:
+            raise ValueError("%s has %d rows but %d columns" % (fileName, n, width))
+
+    # entry (i, j) with j <= i sits at i * (i + 1) / 2 + j in packed; the upper half mirrors it.
+    data = array(typecode)
+    for i in range(n):
+        start = i * (i + 1) // 2
+        data.extend(packed[start:start + i + 1])
+        data.extend([packed[j * (j + 1) // 2 + i] for j in range(i + 1, n)])
+    return DistanceMatrix(n, data)
+
+
+# Shortest distances and predecessors between every pair of vertices. dist.get(s, v) is the shortest distance from s
+# to v and pred.get(s, v) is the vertex before v on that path (-1 if none).
+class AllPairs:
+    def __init__(self, dist, pred):
+        self.dist = dist
+        self.pred = pred
+        self._paths = {}  # {s: {v: path}}, filled in by path
+
+    def distance(self, s, v):
+        return self.dist.get(s, v)
+
+    # Vertex ids from s to v along the predecessor row of s, as an array('l') (empty if v cannot be reached).
+    # Paths are memoized per source, so a route that keeps leaving the same stops walks each chain once.
+    # O(k) run-time complexity the first time, k being the vertices on the path, O(1) afterwards.
+    def path(self, s, v):
+        paths = self._paths.setdefault(s, {})
+        if v not in paths:
+            n = self.pred.n
+            paths[v] = path_ids(memoryview(self.pred.data)[s * n:(s + 1) * n], s, v)
+        return paths[v]
+
+    def __len__(self):
+        return self.dist.n
+
+
+# Runs the heap-based Dijkstra once from every vertex of a CompactGraph and packs the results into two flat arrays.
+# O(V (V + E) log V) run-time complexity.
+def all_pairs_shortest_paths(cgraph):
+    n = len(cgraph)
+    dist = array('d')
+    pred = array('i')
+    for s in range(n):
+        d, p = dijkstra(cgraph, s)
+        dist.extend(d)
+        pred.extend(p)
+    return AllPairs(DistanceMatrix(n, dist), DistanceMatrix(n, pred))
+
+
+# SHA-256 of a file's bytes, read in chunks so large csv files are never held in memory at once.
+# O(n) run-time complexity, n being the file size.
+def file_hash(fileName):
+    h = hashlib.sha256()
+    with open(fileName, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Writes a flat array as an n x n .npy file (format version 1.0), readable with numpy.load(path, mmap_mode='r') when
+# numpy is installed. The file is written under a temporary name and moved into place so readers never see a partial
+# matrix.
+# O(n^2) run-time complexity, one pass over the data.
+def write_npy(path, data, n):
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }" % (
+        _NATIVE + _DESCR[data.typecode], n, n)
+    # magic (6) + version (2) + header length (2) + header + newline must be a multiple of 64 bytes.
+    pad = 64 - (10 + len(header) + 1) % 64
+    header = (header + ' ' * (pad % 64) + '\n').encode('latin1')
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header)
+        data.tofile(f)
+    os.replace(tmp, path)
+
+
+# Opens a .npy file written by write_npy and returns a DistanceMatrix over a memory-mapped view of its data, so only
+# the rows that are actually read get paged in. Files written on a machine of the other byte order are copied and
+# swapped instead.
+# O(1) run-time complexity for the mapping itself.
+def open_npy(path):
+    with open(path, 'rb') as f:
+        if f.read(6) != _NPY_MAGIC:
+            raise ValueError("%s is not a .npy file" % path)
+        major = f.read(2)[0]
+        if major != 1:
+            raise ValueError("unsupported .npy version %d in %s" % (major, path))
+        header_len = struct.unpack('<H', f.read(2))[0]
+        header = ast.literal_eval(f.read(header_len).decode('latin1'))
+        offset = f.tell()
+        typecode = {v: k for k, v in _DESCR.items()}[header['descr'][1:]]
+        n = header['shape'][0]
+        if header['descr'][0] != _NATIVE:
+            data = array(typecode)
+            data.fromfile(f, n * n)
+            data.byteswap()
+            return DistanceMatrix(n, data)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    data = memoryview(mm)[offset:offset + n * n * array(typecode).itemsize].cast(typecode)
+    return DistanceMatrix(n, data)
+
+
+# Returns the AllPairs for a distance csv file. The matrices are computed once per distinct file content and stored in
+# cache_dir under the file's content hash; later calls (and later runs) just map the cached .npy files. get_graph is
+# only called on a cache miss and must return the CompactGraph built from that csv file.
+# O(1) on a cache hit, O(V (V + E) log V) on a miss.
+def all_pairs_cached(fileName, get_graph, cache_dir=CACHE_DIR):
+    key = file_hash(fileName)
+    dist_path = os.path.join(cache_dir, key + '.dist.npy')
+    pred_path = os.path.join(cache_dir, key + '.pred.npy')
+    if os.path.exists(dist_path) and os.path.exists(pred_path):
+        return AllPairs(open_npy(dist_path), open_npy(pred_path))
+
+    result = all_pairs_shortest_paths(get_graph())
+    os.makedirs(cache_dir, exist_ok=True)
+    write_npy(dist_path, result.dist.data, result.dist.n)
+    write_npy(pred_path, result.pred.data, result.pred.n)
+    return result
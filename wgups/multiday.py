@@ -0,0 +1,197 @@
+import json
+import os
+import sys
+
+from wgups.assign import TRUCK_CAPACITY, LoadSlot, _build_units
+from wgups.loaders import PACKAGES_CSV, load_dataset
+from wgups.package import PackageTable
+from wgups.simulation import DAY_START, DeliveryDay
+
+
+# A hub trucks leave from and return to: its vertex in the shared distance matrix, how many trucks it runs, how many
+# trips each truck makes and when the first trips leave.
+class Depot:
+    def __init__(self, vertex=0, trucks=2, trips=2, day_start=DAY_START, name=None):
+        self.vertex = vertex
+        self.trucks = trucks
+        self.trips = trips
+        self.day_start = day_start
+        self.name = name if name is not None else 'depot %d' % vertex
+
+    # The depot's LoadSlots for a day of n_packages packages: trips first trips first, with more trips than usual when
+    # the trucks cannot otherwise carry them all.
+    # O(trucks * trips) run-time complexity.
+    def load_slots(self, n_packages=0):
+        trips = max(self.trips, -(-n_packages // (self.trucks * TRUCK_CAPACITY)))
+        return [LoadSlot(trip * self.trucks + truck_id, truck_id, trip + 1, departure=self.day_start)
+                for trip in range(trips) for truck_id in range(1, self.trucks + 1)]
+
+    def __repr__(self):
+        return f'Depot({self.vertex}, trucks={self.trucks}, trips={self.trips})'
+
+
+# Outcome of one depot's deliveries on one day: miles per truck, packages delivered and the late ones, as
+# (p_id, deadline, delivery) in minutes after midnight.
+class DepotDay:
+    def __init__(self, day, depot, truck_miles, packages, late):
+        self.day = day
+        self.depot = depot
+        self.truck_miles = truck_miles
+        self.packages = packages
+        self.late = late
+
+    @property
+    def total_distance(self):
+        return sum(self.truck_miles.values())
+
+    def __repr__(self):
+        return f'DepotDay({self.day!r}, {self.depot!r}, {self.total_distance:.2f})'
+
+
+# Every DepotDay of a planning run, days in the order given, with mileage totals per day and per depot.
+class MultiDayPlan:
+    def __init__(self, results):
+        self.results = results
+
+    # {day: miles over all depots}.
+    def by_day(self):
+        totals = {}
+        for r in self.results:
+            totals[r.day] = totals.get(r.day, 0.0) + r.total_distance
+        return totals
+
+    # {depot: miles over all days}.
+    def by_depot(self):
+        totals = {}
+        for r in self.results:
+            totals[r.depot] = totals.get(r.depot, 0.0) + r.total_distance
+        return totals
+
+    @property
+    def total_distance(self):
+        return sum(r.total_distance for r in self.results)
+
+    # The plan as a JSON-ready dict.
+    def as_dict(self):
+        return {'days': [{'day': r.day, 'depot': r.depot, 'miles': r.total_distance, 'packages': r.packages,
+                          'truck_miles': {str(truck): miles for truck, miles in r.truck_miles.items()},
+                          'late': [list(late) for late in r.late]} for r in self.results],
+                'by_day': self.by_day(), 'by_depot': self.by_depot(), 'total_miles': self.total_distance}
+
+    # Text table of miles for every day and depot, with the totals per day, per depot and overall.
+    def format_totals(self):
+        depots = list(self.by_depot())
+        miles = {(r.day, r.depot): r for r in self.results}
+        width = max([len(depot) for depot in depots] + [10])
+        lines = ["%-16s" % 'day' + ''.join(" %*s" % (width, depot) for depot in depots) + " %*s" % (width, 'total')]
+        for day, total in self.by_day().items():
+            cells = ''.join(" %*.2f" % (width, miles[day, depot].total_distance) if (day, depot) in miles else
+                            " %*s" % (width, '-') for depot in depots)
+            late = sum(len(miles[day, depot].late) for depot in depots if (day, depot) in miles)
+            lines.append("%-16s" % day + cells + " %*.2f" % (width, total) + ("  (%d late)" % late if late else ''))
+        lines.append("%-16s" % 'total' + ''.join(" %*.2f" % (width, t) for t in self.by_depot().values()) +
+                     " %*.2f" % (width, self.total_distance))
+        return '\n'.join(lines) + '\n'
+
+
+# Splits a day's packages between depots: each group of packages that must travel together goes to the depot closest
+# to its addresses, among those running the truck its notes ask for ("Can only be on truck N"). Returns one list of
+# packages per depot, in the order of depots. Raises ValueError when no depot runs a truck a package needs.
+# O(n * D) run-time complexity for n packages and D depots.
+def split_by_depot(packages, depots, vertex_of, dist):
+    shares = [[] for depot in depots]
+    for unit in _build_units(list(packages), vertex_of):
+        allowed = [d for d in range(len(depots)) if unit.truck is None or unit.truck <= depots[d].trucks]
+        if not allowed:
+            raise ValueError("no depot runs truck %d for packages %s" % (unit.truck, [p.p_id for p in unit.packages]))
+        nearest = min(allowed, key=lambda d: sum(dist.get(depots[d].vertex, v) for v in unit.vertices))
+        shares[nearest].extend(unit.packages)
+    for share in shares:
+        share.sort(key=lambda p: p.p_id)
+    return shares
+
+
+# Plans one day's manifest over every depot and returns its DepotDays. The network comes from load_dataset(directory),
+# so in a worker process the all-pairs shortest paths are mapped from the cache the parent filled in, not recomputed.
+def plan_day(directory, day, manifest, depots, improve=True, deadline_aware=False):
+    network = load_dataset(directory)
+    dist = network.shortest.dist
+    today = network.with_packages(manifest)
+    packages = [today.packages.search(p_id) for p_id in sorted(today.packages)]
+    results = []
+    for depot, share in zip(depots, split_by_depot(packages, depots, today.vertex_of, dist)):
+        table = PackageTable()
+        for p in share:
+            table.insert(p.p_id, p)
+        delivery = DeliveryDay(today.with_packages(table), load_slots=depot.load_slots(len(share)), auto_assign=True,
+                               improve=improve, deadline_aware=deadline_aware, depot=depot.vertex,
+                               day_start=depot.day_start)
+        if share:
+            delivery.plan()
+        results.append(DepotDay(day, depot.name, {truck_id: delivery.truck_distance(truck_id) if share else 0.0
+                                                  for truck_id in range(1, depot.trucks + 1)},
+                                len(share), delivery.late_packages() if share else []))
+    return results
+
+
+# Plans several days' manifests for several depots over the network in directory. manifests is a list of packages
+# csv paths (each day named after its file) or a {day: path} dict. The all-pairs shortest paths are computed (or read
+# from the cache) once here and shared by every day; with workers > 1 the days are planned in parallel processes,
+# each mapping the cached matrices. workers=None uses one process per CPU. Returns a MultiDayPlan.
+# O(days * depots * DeliveryDay.plan / workers) run-time complexity.
+def plan_days(directory, manifests, depots=(Depot(),), workers=None, improve=True, deadline_aware=False):
+    if not isinstance(manifests, dict):
+        named = {}
+        for path in manifests:
+            day = name = os.path.splitext(os.path.basename(path))[0]
+            while day in named:  # the same file name twice, e.g. from two folders
+                day = '%s-%d' % (name, len(named) + 1)
+            named[day] = path
+        manifests = named
+    depots = list(depots)
+    load_dataset(directory).shortest  # computed or cached once, before any day is planned
+    days = list(manifests.items())
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(days))
+    if workers <= 1:
+        return MultiDayPlan([r for day, path in days
+                             for r in plan_day(directory, day, path, depots, improve, deadline_aware)])
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(plan_day, directory, day, path, depots, improve, deadline_aware) for day, path in days]
+        return MultiDayPlan([r for f in futures for r in f.result()])
+
+
+def _option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+
+# Entry point, python -m wgups.multiday [--data DIR] [--depots V[,V...]] [--trucks N] [--trips N] [--workers N]
+# [--deadlines] [--json] [MANIFEST ...]: plans every manifest (DIR/packages.csv by default) from each depot vertex
+# (0 by default) over the network in DIR, and prints the miles per day and per depot.
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    with_value = ('--data', '--depots', '--trucks', '--trips', '--workers')
+    manifests = [arg for i, arg in enumerate(argv) if not arg.startswith('--') and (i == 0 or argv[i - 1] not in
+                                                                                     with_value)]
+    directory = _option(argv, '--data', '.')
+    network = load_dataset(directory)
+    depots = [Depot(int(v), int(_option(argv, '--trucks', 2)), int(_option(argv, '--trips', 2)),
+                    name=network.addresses[int(v)]) for v in _option(argv, '--depots', '0').split(',')]
+    workers = _option(argv, '--workers')
+    try:
+        week = plan_days(directory, manifests or [network.path(PACKAGES_CSV)], depots,
+                         None if workers is None else int(workers), deadline_aware='--deadlines' in argv)
+    except ValueError as e:
+        sys.exit("cannot plan: %s" % e)
+    if '--json' in argv:
+        sys.stdout.write(json.dumps(week.as_dict(), indent=1) + '\n')
+    else:
+        sys.stdout.write(week.format_totals())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import csv
+import sys
+from array import array
+from bisect import bisect_right, insort
+
+from wgups.clock import format_deadline, parse_deadline, parse_hhmm
+from wgups.hashtable import ChainHashTable
+
+
+# This class allows the creation of package objects, each has fields to store package data such as address,
+# time of delivery deadline, and special notes; time_mod is the minute after midnight of its last status change.
+# __slots__ stores the eleven fields in fixed slots instead of a per-object __dict__, which roughly halves the size of
+# each Package.
+# O(1) run-time complexity, since one package is created each time init is called.
+class Package:
+    __slots__ = ('p_id', 'address', 'city', 'state', 'zipcode', 'deadline', 'mass_k', 'note', 'truck', 'status',
+                 'time_mod')
+
+    def __init__(self, p_id, address, city, state, zipcode, deadline, mass_k, note, truck, status, time_mod):
+        self.p_id = p_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zipcode = zipcode
+        self.deadline = deadline
+        self.mass_k = mass_k
+        self.note = note
+        self.truck = truck
+        self.status = status
+        self.time_mod = time_mod
+
+    def __str__(self):  # print data items not reference.
+        return "%s | %s | %s | %s | %s | Deadline %s | Kg %s | %s" % (
+            self.p_id, self.address, self.city, self.state, self.zipcode, self.deadline, self.mass_k, self.note)
+
+    def __repr__(self):
+        return f'Package({self.p_id})'  # ,"{self.address}",{self.status})'
+
+
+# ChainHashTable of packages keyed by package ID that also keeps secondary indexes, so packages can be found by
+# address, zipcode, truck or status without scanning the whole table, and by deadline through a sorted list.
+# Each index maps a field value to a dict of {p_id: package}, which keeps insertion order and allows O(1) removal.
+# Deadlines are parsed once, when a package is indexed, into deadline_of ({p_id: minutes after midnight}).
+# Indexed fields must be changed through update() so the indexes follow; other fields can be set directly.
+# O(n) time complexity (for i in range(initial_buckets)).
+class PackageTable(ChainHashTable):
+    INDEXED = ('address', 'zipcode', 'truck', 'status')
+
+    def __init__(self, initial_buckets=39, load_factor=0.75):
+        super().__init__(initial_buckets, load_factor)
+        self.indexes = {field: {} for field in self.INDEXED}
+        self.deadlines = []  # sorted (deadline minutes, p_id) pairs
+        self.deadline_of = {}  # {p_id: deadline minutes}
+
+    def _index(self, item):
+        for field in self.INDEXED:
+            self.indexes[field].setdefault(getattr(item, field), {})[item.p_id] = item
+        self.deadline_of[item.p_id] = parse_deadline(item.deadline)
+        insort(self.deadlines, (self.deadline_of[item.p_id], item.p_id))
+
+    def _unindex(self, item, fields=INDEXED, deadline=True):
+        for field in fields:
+            entries = self.indexes[field].get(getattr(item, field))
+            if entries is not None:
+                entries.pop(item.p_id, None)
+                if not entries:
+                    del self.indexes[field][getattr(item, field)]
+        if deadline:
+            pair = (self.deadline_of.pop(item.p_id), item.p_id)
+            i = bisect_right(self.deadlines, pair) - 1
+            if i >= 0 and self.deadlines[i] == pair:
+                del self.deadlines[i]
+
+    # Inserts or replaces a package, updating every index.
+    # O(1) average time complexity for the hash indexes, O(n) worst case for the deadline list insert.
+    def insert(self, key, item):
+        old = self.search(key)
+        if old is not None:
+            self._unindex(old)
+        super().insert(key, item)
+        self._index(item)
+        return True
+
+    # O(1) average time complexity for the hash indexes, O(n) worst case for the deadline list delete.
+    def remove(self, key):
+        old = self.search(key)
+        if old is None:
+            return False
+        self._unindex(old)
+        return super().remove(key)
+
+    # Changes fields of the package with this ID (e.g. update(5, status='Delivered', truck=2)) and moves it between
+    # index entries as needed. Returns the package, or None if the ID is not in the table.
+    # O(1) average time complexity.
+    def update(self, p_id, **fields):
+        item = self.search(p_id)
+        if item is None:
+            return None
+        indexed = [field for field in fields if field in self.INDEXED]
+        self._unindex(item, indexed, 'deadline' in fields)
+        for field, value in fields.items():
+            setattr(item, field, value)
+        for field in indexed:
+            self.indexes[field].setdefault(getattr(item, field), {})[item.p_id] = item
+        if 'deadline' in fields:
+            self.deadline_of[item.p_id] = parse_deadline(item.deadline)
+            insort(self.deadlines, (self.deadline_of[item.p_id], item.p_id))
+        return item
+
+    # Packages whose field equals value, in the order they were indexed.
+    # O(k) run-time complexity, k being the number of matches.
+    def _lookup(self, field, value):
+        return list(self.indexes[field].get(value, {}).values())
+
+    def by_address(self, address):
+        return self._lookup('address', address)
+
+    def by_zipcode(self, zipcode):
+        return self._lookup('zipcode', zipcode)
+
+    def by_truck(self, truck):
+        return self._lookup('truck', truck)
+
+    def by_status(self, status):
+        return self._lookup('status', status)
+
+    # Packages due at or before the given deadline (minutes after midnight or a string like '10:30 AM'), earliest
+    # deadline first.
+    # O(log n + k) run-time complexity.
+    def by_deadline_before(self, deadline):
+        if isinstance(deadline, str):
+            deadline = parse_deadline(deadline)
+        end = bisect_right(self.deadlines, (deadline, float('inf')))
+        return [self.search(p_id) for minutes, p_id in self.deadlines[:end]]
+
+
+# Append-only table of distinct strings. Each string is stored once and referred to by its position (code), so a
+# column of repeated values such as city names costs one small integer per row.
+class StringPool:
+    def __init__(self):
+        self.strings = []
+        self.codes = {}
+
+    # Returns the code for text, adding it to the pool if it is new.
+    # O(1) average run-time complexity.
+    def code(self, text):
+        c = self.codes.get(text)
+        if c is None:
+            c = self.codes[text] = len(self.strings)
+            self.strings.append(sys.intern(text))
+        return c
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+# Columnar package storage for very large manifests. Every field is a column: text fields are codes into shared
+# StringPools (address, city, state, zipcode, note, status), times are integer minutes after midnight (-1 when not set),
+# mass is a float and the truck number an integer (-1 for none). Row i holds one package. While IDs arrive as 1, 2,
+# 3, ... the row is simply p_id - 1; the first out-of-sequence ID switches to a row_of dictionary. Package objects are
+# only built on request, by package().
+# O(1) memory per package beyond the column entries themselves.
+class PackageStore:
+    TEXT_COLUMNS = ('address', 'city', 'state', 'zipcode', 'note', 'status')
+
+    def __init__(self):
+        self.pools = {name: StringPool() for name in self.TEXT_COLUMNS}
+        self.p_id = array('l')
+        self.address = array('i')
+        self.city = array('i')
+        self.state = array('i')
+        self.zipcode = array('i')
+        self.note = array('i')
+        self.status = array('i')
+        self.deadline = array('h')  # minutes after midnight, END_OF_DAY for 'EOD'
+        self.mass_k = array('d')
+        self.truck = array('h')
+        self.time_mod = array('h')  # delivery (or last status change) time in minutes, -1 if not set
+        self.row_of = None  # {p_id: row}, only once IDs stop being 1..n in order
+
+    # Adds one package given its field values as they appear on a Package.
+    # O(1) average run-time complexity.
+    def append(self, p_id, address, city, state, zipcode, deadline, mass_k, note, truck=None, status="at the hub",
+               time_mod=None):
+        row = len(self.p_id)
+        if self.row_of is None and p_id != row + 1:
+            self.row_of = {q: i for i, q in enumerate(self.p_id)}
+        if self.row_of is not None:
+            self.row_of[p_id] = row
+        self.p_id.append(p_id)
+        for name, value in (('address', address), ('city', city), ('state', state), ('zipcode', zipcode),
+                            ('note', note), ('status', status)):
+            getattr(self, name).append(self.pools[name].code(value))
+        self.deadline.append(parse_deadline(deadline))
+        self.mass_k.append(float(mass_k) if mass_k != '' else 0.0)
+        self.truck.append(-1 if truck is None or truck == "unknown" else int(truck))
+        self.time_mod.append(-1 if time_mod is None else time_mod if isinstance(time_mod, int) else
+                             parse_hhmm(time_mod))
+
+    # Builds a store from packages.csv rows (id, address, city, state, zipcode, deadline, mass, note).
+    # O(n) run-time complexity.
+    @classmethod
+    def from_csv(cls, fileName):
+        store = cls()
+        with open(fileName, newline='') as allPackages:
+            for row in csv.reader(allPackages, delimiter=','):
+                store.append(int(row[0]), *row[1:8])
+        return store
+
+    # Builds a store holding the same data as a sequence of Package objects.
+    # O(n) run-time complexity.
+    @classmethod
+    def from_packages(cls, packages):
+        store = cls()
+        for p in packages:
+            store.append(p.p_id, p.address, p.city, p.state, p.zipcode, p.deadline, p.mass_k, p.note, p.truck,
+                         p.status, p.time_mod)
+        return store
+
+    def __len__(self):
+        return len(self.p_id)
+
+    # Row number of a package ID; raises KeyError if the ID is not stored.
+    # O(1) average run-time complexity.
+    def row(self, p_id):
+        if self.row_of is not None:
+            return self.row_of[p_id]
+        if not 1 <= p_id <= len(self.p_id):
+            raise KeyError(p_id)
+        return p_id - 1
+
+    # Decoded value of a text column at row i.
+    def text(self, name, i):
+        return self.pools[name][getattr(self, name)[i]]
+
+    # Builds a Package object for one package ID, with the deadline formatted back to its csv text.
+    # O(1) average run-time complexity.
+    def package(self, p_id):
+        i = self.row(p_id)
+        t = self.time_mod[i]
+        return Package(p_id, self.text('address', i), self.text('city', i), self.text('state', i),
+                       self.text('zipcode', i), format_deadline(self.deadline[i]), '%g' % self.mass_k[i],
+                       self.text('note', i), self.truck[i] if self.truck[i] >= 0 else None, self.text('status', i),
+                       t if t >= 0 else None)
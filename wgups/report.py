@@ -0,0 +1,167 @@
+import csv
+import io
+import json
+from array import array
+from numbers import Integral
+
+from wgups.clock import format_minutes, to_minutes
+from wgups.simulation import STATES
+
+# Columns of a status report, one row per package per query time.
+REPORT_COLUMNS = ('time', 'p_id', 'load_id', 'status', 'departure', 'delivery')
+# Columns of a route export, one row per vertex a load drives through.
+ROUTE_COLUMNS = ('truck_id', 'load_id', 'seq', 'vertex', 'miles', 'packages', 'address')
+
+_numpy = None
+
+
+# numpy if it is installed, else None. Imported on first use so importing this module stays cheap.
+def _np():
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+# (single, [minutes]) for a query time or a sequence of them, each minutes after midnight or an 'HH:MM' string.
+def _queries(times):
+    if isinstance(times, (str, Integral)):
+        return True, [_minutes(times)]
+    return False, [_minutes(t) for t in times]
+
+
+def _minutes(t):
+    return int(to_minutes(t))
+
+
+# State code (index into STATES: 0 at hub, 1 en route, 2 delivered) of every package on the timeline at the given
+# minute, or at each of a sequence of minutes ('HH:MM' strings are accepted too). Packages are in timeline row order
+# (timeline.p_ids). A package's code is the number of its departure and delivery minutes at or before t, which with
+# numpy is two comparisons over the whole minute columns. Returns an int8 array of shape (n,) or (len(times), n) with
+# numpy, otherwise an array('b') or a list of them.
+# O(n) run-time complexity per query time.
+def status_codes(timeline, times):
+    single, queries = _queries(times)
+    np = _np()
+    if np is not None:
+        departs = np.frombuffer(timeline.departs, dtype=timeline.departs.typecode)
+        delivers = np.frombuffer(timeline.delivers, dtype=timeline.delivers.typecode)
+        t = np.asarray(queries, dtype=departs.dtype)[:, None]
+        codes = (departs <= t).astype(np.int8) + (delivers <= t)
+        return codes[0] if single else codes
+    rows = [array('b', [(d <= t) + (v <= t) for d, v in zip(timeline.departs, timeline.delivers)])
+            for t in queries]
+    return rows[0] if single else rows
+
+
+# Number of packages in each state at each query time, as {state: count} dicts (a list of them for a sequence).
+# O(m log n) run-time complexity for m query times.
+def status_counts(timeline, times):
+    single, queries = _queries(times)
+    counts = [timeline.status_counts(t) for t in queries]
+    return counts[0] if single else counts
+
+
+# The report as CSV bytes with a REPORT_COLUMNS header: for each query time, one row per package in timeline row
+# order. Departure and delivery are 'HH:MM'. Each package's row text for the three states is built once, so every query
+# time only picks one of them per package and joins the lot, with the time as the join separator.
+# O(m n) run-time complexity for m query times.
+def report_csv(timeline, times):
+    queries = _queries(times)[1]
+    codes = status_codes(timeline, queries)
+    heads = ['%d,%d,' % (p_id, load_id) for p_id, load_id in zip(timeline.p_ids, timeline.load_of)]
+    clock = {m: format_minutes(m) for m in set(timeline.departs).union(timeline.delivers)}
+    tails = [',%s,%s\n' % (clock[d], clock[v]) for d, v in zip(timeline.departs, timeline.delivers)]
+    rows = list(zip(*([h + state + t for h, t in zip(heads, tails)] for state in STATES)))
+    parts = [','.join(REPORT_COLUMNS) + '\n']
+    for t, row in zip(queries, codes):
+        if rows:
+            prefix = format_minutes(t) + ','
+            parts.append(prefix + prefix.join(map(tuple.__getitem__, rows, row.tolist())))
+    return ''.join(parts).encode()
+
+
+# The report as JSON bytes in columns: {"times": [...], "states": STATES, "p_id": [...], "load_id": [...],
+# "departure": [...], "delivery": [...], "status": [[state code per package] per query time], "counts": [{state: n}
+# per query time]}. Times are minutes after midnight and status codes index "states".
+# O(m n) run-time complexity for m query times.
+def report_json(timeline, times):
+    queries = _queries(times)[1]
+    codes = status_codes(timeline, queries)
+    report = {
+        'times': queries,
+        'states': list(STATES),
+        'p_id': timeline.p_ids.tolist(),
+        'load_id': timeline.load_of.tolist(),
+        'departure': timeline.departs.tolist(),
+        'delivery': timeline.delivers.tolist(),
+        'status': [row.tolist() for row in codes],
+        'counts': status_counts(timeline, queries),
+    }
+    return json.dumps(report, separators=(',', ':')).encode()
+
+
+# Turn-by-turn route of every load of a planned DeliveryDay, in load order, as (truck_id, load_id, vertices, miles,
+# packages): every vertex driven through from the load's start to its last stop and back to the depot, following the
+# all-pairs shortest paths between stops, the miles driven when each is reached, and the package IDs delivered there
+# ([] when the truck only passes through).
+# O(V) run-time complexity per load, V being the vertices driven through, with each leg's path memoized.
+def route_legs(day):
+    shortest = day.dataset.shortest
+    for load_id in day.order:
+        plan = day.plans[load_id]
+        vertices, miles, packages = array('l', [plan.start]), array('d', [0.0]), [[]]
+        at, driven = plan.start, 0.0
+        for stop, arrival, delivered in zip(list(plan.stops) + [plan.depot],
+                                            list(plan.arrival_miles) + [plan.total_distance],
+                                            list(day.deliveries[load_id]) + [[]]):
+            for v in shortest.path(at, stop)[1:]:
+                vertices.append(v)
+                miles.append(driven + shortest.distance(at, v))
+                packages.append([])
+            miles[-1] = arrival
+            packages[-1].extend(delivered)
+            at, driven = stop, arrival
+        yield day.trucks[load_id].truck_id, load_id, vertices, miles, packages
+
+
+# The routes of a planned day as CSV bytes with a ROUTE_COLUMNS header, one row per vertex of each load in driving
+# order; packages are the IDs delivered at that vertex, separated by spaces.
+# O(V) run-time complexity over every load's vertices.
+def route_csv(day):
+    addresses = day.dataset.addresses
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(ROUTE_COLUMNS)
+    for truck_id, load_id, vertices, miles, packages in route_legs(day):
+        writer.writerows((truck_id, load_id, seq, v, '%.1f' % m, ' '.join(map(str, delivered)), addresses[v])
+                         for seq, (v, m, delivered) in enumerate(zip(vertices, miles, packages)))
+    return out.getvalue().encode()
+
+
+# The routes of a planned day as JSON bytes: {"addresses": [...], "routes": [{"truck_id": ..., "load_id": ...,
+# "vertices": [...], "miles": [...], "stops": [index into vertices of each delivery stop], "packages": [[package IDs]
+# per stop]}]}, addresses being indexed by vertex.
+# O(V) run-time complexity over every load's vertices.
+def route_json(day):
+    routes = []
+    for truck_id, load_id, vertices, miles, packages in route_legs(day):
+        stops = [i for i, delivered in enumerate(packages) if delivered]
+        routes.append({'truck_id': truck_id, 'load_id': load_id, 'vertices': vertices.tolist(),
+                       'miles': [round(m, 1) for m in miles], 'stops': stops,
+                       'packages': [packages[i] for i in stops]})
+    return json.dumps({'addresses': list(day.dataset.addresses), 'routes': routes}, separators=(',', ':')).encode()
+
+
+# Writes report bytes to a path or a binary stream in a single write call.
+# O(n) run-time complexity in the size of the report.
+def write_report(data, target):
+    if hasattr(target, 'write'):
+        target.write(data)
+        return
+    with open(target, 'wb') as out:
+        out.write(data)
@@ -0,0 +1,100 @@
+import os
+from array import array
+
+from wgups.improve import improve_route
+from wgups.matrix import DistanceMatrix
+
+
+# The planned trip for one truck load: stops in driving order, the miles driven when each stop is reached
+# (arrival_miles[i] belongs to stops[i]) and the miles back to the depot from the last stop. The trip starts at the
+# depot unless start says otherwise.
+class RoutePlan:
+    def __init__(self, stops, arrival_miles, return_distance, depot=0, start=None):
+        self.stops = stops
+        self.arrival_miles = arrival_miles
+        self.return_distance = return_distance
+        self.depot = depot
+        self.start = depot if start is None else start
+
+    # Miles for the whole trip, back to the depot.
+    @property
+    def total_distance(self):
+        return (self.arrival_miles[-1] if self.arrival_miles else 0.0) + self.return_distance
+
+    def __repr__(self):
+        return f'RoutePlan({self.stops}, {self.total_distance:.2f})'
+
+
+# Orders stops with the nearest-neighbor rule, starting from start (depot unless given, e.g. where a truck is now)
+# and ending at depot, and hands the result to improve_route unless improve is False. Only dist (any object with
+# get(i, j)) is read, so several routes can be planned at once, in threads or processes, without sharing any state.
+# O(n^2) run-time complexity for the nearest-neighbor order, n being the number of stops, plus the improvement stage.
+def plan_route(dist, stops, depot=0, improve=True, start=None):
+    to_visit = list(dict.fromkeys(stops))
+    order = []
+    current = depot if start is None else start
+    while to_visit:
+        best = min(range(len(to_visit)), key=lambda i: dist.get(current, to_visit[i]))
+        if dist.get(current, to_visit[best]) == float('inf'):
+            raise ValueError("no path from vertex %s to any of %s" % (current, to_visit))
+        current = to_visit.pop(best)
+        order.append(current)
+
+    if improve:
+        order, _ = improve_route(dist, order, depot=depot, start=start)
+
+    arrival_miles = []
+    miles = 0.0
+    current = depot if start is None else start
+    for stop in order:
+        miles += dist.get(current, stop)
+        arrival_miles.append(miles)
+        current = stop
+    return RoutePlan(order, arrival_miles, dist.get(current, depot), depot, start)
+
+
+# The distance matrix of a worker process, attached to the parent's shared memory block by _attach_matrix.
+_worker_dist = None
+_worker_shm = None
+
+
+def _attach_matrix(name, n, typecode):
+    global _worker_dist, _worker_shm
+    from multiprocessing import shared_memory
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    size = n * n * array(typecode).itemsize
+    _worker_dist = DistanceMatrix(n, _worker_shm.buf[:size].cast(typecode))
+
+
+def _plan_in_worker(stops, depot, improve):
+    return plan_route(_worker_dist, stops, depot, improve)
+
+
+# Plans every load (a list of vertex ids per truck) and returns the RoutePlans in the same order. With workers > 1 the
+# loads are planned in a process pool; the distance matrix is copied once into a shared memory block that every worker
+# maps, instead of being pickled for each task. workers=None uses one process per CPU; workers=1 plans in this process
+# (the process pool modules are only imported when a pool is used).
+# O(L * plan_route / workers) run-time complexity for L loads.
+def plan_fleet(loads, dist, workers=None, depot=0, improve=True):
+    loads = [list(stops) for stops in loads]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(loads))
+    if workers <= 1:
+        return [plan_route(dist, stops, depot, improve) for stops in loads]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    data = dist.data
+    typecode = data.typecode if isinstance(data, array) else data.format
+    raw = memoryview(data).cast('B')
+    shm = shared_memory.SharedMemory(create=True, size=max(1, raw.nbytes))
+    try:
+        shm.buf[:raw.nbytes] = raw
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_matrix,
+                                 initargs=(shm.name, dist.n, typecode)) as pool:
+            futures = [pool.submit(_plan_in_worker, stops, depot, improve) for stops in loads]
+            return [f.result() for f in futures]
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import sys
+
+from wgups.clock import format_minutes, parse_hhmm
+from wgups.loaders import load_dataset
+from wgups.simulation import AT_HUB, SPEED_MPH, DeliveryDay
+from wgups.speeds import parse_profile
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Responses are left to the transport until this many bytes are waiting, then the server waits for the client to read.
+HIGH_WATER = 1 << 16
+# Longest request or response line either side reads (asyncio's default is 64 KiB, less than one answer for a few
+# thousand packages).
+LINE_LIMIT = 1 << 24
+
+
+# Answers the status queries of the command line menu for one planned DeliveryDay, as JSON-ready dicts. Query times
+# are 'HH:MM' strings or minutes after midnight. Queries always read the day's current timeline, so they follow any
+# re-planning done on the day.
+# O(1) run-time complexity to create.
+class StatusService:
+    def __init__(self, day):
+        self.day = day.plan()
+        self._p_ids = (None, [])  # (timeline, its package IDs sorted)
+
+    @property
+    def timeline(self):
+        return self.day.timeline
+
+    @property
+    def p_ids(self):
+        if self._p_ids[0] is not self.timeline:
+            self._p_ids = (self.timeline, sorted(self.timeline.row_of))
+        return self._p_ids[1]
+
+    def _minutes(self, t):
+        if isinstance(t, str):
+            return parse_hhmm(t)
+        if isinstance(t, int) and not isinstance(t, bool):
+            return t
+        raise ValueError("time must be 'HH:MM' or minutes after midnight")
+
+    def _package(self, p_id, t):
+        state, minute = self.timeline.package_status(p_id, t)
+        return {'p_id': p_id, 'load_id': self.timeline.load_of[self.timeline.row_of[p_id]], 'status': state,
+                'time': format_minutes(minute)}
+
+    # Status of one package (search_a_package_by_usertime).
+    # O(1) average run-time complexity.
+    def package_at(self, p_id, t):
+        t = self._minutes(t)
+        if p_id not in self.timeline.row_of:
+            raise KeyError(p_id)
+        return self._package(p_id, t)
+
+    # Status of every package on the timeline, by package ID, with the number in each state
+    # (search_allpackages_by_usertime).
+    # O(n) run-time complexity, after the first query on a timeline.
+    def packages_at(self, t):
+        t = self._minutes(t)
+        return {'time': format_minutes(t), 'counts': self.timeline.status_counts(t),
+                'packages': [self._package(p_id, t) for p_id in self.p_ids]}
+
+    # Miles driven by the truck of a load, on that load and in total, and the status of the load's packages
+    # (search_a_truck_by_time).
+    # O(k + log e) run-time complexity, k packages on the load, e events of the truck.
+    def truck_at(self, load_id, t):
+        t = self._minutes(t)
+        if load_id not in self.timeline.trips:
+            raise KeyError(load_id)
+        truck_id = self.timeline.trips[load_id][0]
+        left = t >= self.timeline.departure(load_id)
+        return {'load_id': load_id, 'truck_id': truck_id, 'time': format_minutes(t),
+                'departure': format_minutes(self.timeline.departure(load_id)),
+                'status': AT_HUB if not left else
+                          'returned' if t >= self.timeline.return_time(load_id) else 'en route',
+                'load_miles': round(self.timeline.load_miles_at(load_id, t), 2),
+                'truck_miles': round(self.timeline.miles_at(truck_id, t), 2),
+                'packages': [self._package(pkg.p_id, t) for pkg in self.day.packages.by_truck(load_id)]}
+
+    # Answers one query dict: {"type": "package", "p_id": 5, "time": "10:00"}, {"type": "packages", "time": ...} or
+    # {"type": "truck", "truck": 3, "time": ...}. "id" (or "request_id") is echoed back. Returns the response dict,
+    # {"id": ..., "ok": true, "result": ...} or {"id": ..., "ok": false, "error": "..."}; never raises.
+    # O(1) run-time complexity per query apart from the query itself.
+    def answer(self, query):
+        if not isinstance(query, dict):
+            return {'id': None, 'ok': False, 'error': "a query must be a JSON object"}
+        query_id = query.get('id', query.get('request_id'))
+        try:
+            kind = query.get('type')
+            if kind == 'package':
+                result = self.package_at(int(query['p_id']), query['time'])
+            elif kind == 'packages':
+                result = self.packages_at(query['time'])
+            elif kind == 'truck':
+                result = self.truck_at(int(query['truck']), query['time'])
+            else:
+                raise ValueError("unknown query type %r" % (kind,))
+        except KeyError as e:
+            return {'id': query_id, 'ok': False, 'error': "missing or unknown %s" % e.args[0]}
+        except (TypeError, ValueError) as e:
+            return {'id': query_id, 'ok': False, 'error': str(e)}
+        return {'id': query_id, 'ok': True, 'result': result}
+
+    # Answers one request line: a query object, or a JSON array of them (a batch), answered with one line holding the
+    # array of responses. Returns the response line as bytes ending in a newline.
+    # O(b) queries for a batch of b.
+    def answer_line(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = {'id': None, 'ok': False, 'error': "invalid JSON: %s" % e}
+        else:
+            if isinstance(request, list):
+                response = [self.answer(query) for query in request]
+            else:
+                response = self.answer(request)
+        return json.dumps(response, separators=(',', ':')).encode() + b'\n'
+
+
+# Reads one line, newline included (without it for a last line cut off by the end of the stream, b'' at the end).
+# A line longer than the reader's limit is read to its end and dropped, and None returned in its place.
+async def _read_line(reader):
+    try:
+        return await reader.readuntil(b'\n')
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except asyncio.LimitOverrunError as e:
+        skip = e.consumed
+    while True:
+        try:
+            await reader.readexactly(skip)
+            await reader.readuntil(b'\n')
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as e:
+            skip = e.consumed
+
+
+# Serves one connection: every non-blank line read gets exactly one response line, in order, a line longer than the
+# server's limit an error response. Clients may pipeline, sending many lines without waiting; responses are queued on
+# the transport and the server only waits for the client to read them once HIGH_WATER bytes are pending.
+async def _serve_client(service, reader, writer, limit=LINE_LIMIT):
+    try:
+        while True:
+            line = await _read_line(reader)
+            if line is None:
+                response = {'id': None, 'ok': False, 'error': "request line longer than %d bytes" % limit}
+                writer.write(json.dumps(response, separators=(',', ':')).encode() + b'\n')
+                continue
+            if not line:
+                break
+            if not line.strip():
+                continue
+            writer.write(service.answer_line(line))
+            if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                await writer.drain()
+        await writer.drain()
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
+
+
+# Starts the query server for service on a Unix socket at path, or else on TCP host:port, reading request lines of up
+# to limit bytes. Returns the asyncio Server.
+async def start_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, limit=LINE_LIMIT):
+    def handler(reader, writer):
+        return _serve_client(service, reader, writer, limit)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path, limit=limit)
+    return await asyncio.start_server(handler, host, port, limit=limit)
+
+
+# Sends every non-blank line of a JSON lines file to a running server in one pipelined burst and returns the response
+# lines in order. Responses are read while the requests are still being sent, so a long workload cannot fill both
+# directions of the socket and stall. Response lines may be up to limit bytes long.
+async def replay(fileName, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, limit=LINE_LIMIT):
+    with open(fileName, 'rb') as workload:
+        lines = [line.rstrip(b'\r\n') + b'\n' for line in workload if line.strip()]
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path, limit=limit)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=limit)
+
+    async def read_responses():
+        return [await reader.readline() for line in lines]
+
+    try:
+        responses = asyncio.ensure_future(read_responses())
+        writer.write(b''.join(lines))
+        await writer.drain()
+        return await responses
+    finally:
+        writer.close()
+
+
+def _option(argv, name, default=None):
+    return argv[argv.index(name) + 1] if name in argv else default
+
+
+# Entry point, python -m wgups.server [--host H] [--port P | --unix PATH] [--auto-assign] [--deadlines]
+# [--speeds PROFILE] [--snapshot FILE]: plans the day once (or restores it from the snapshot FILE, see
+# wgups.snapshot.cached_day), then answers queries until interrupted. With --replay FILE it is instead a client that
+# replays FILE against a running server and prints the responses.
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    host = _option(argv, '--host', DEFAULT_HOST)
+    port = int(_option(argv, '--port', DEFAULT_PORT))
+    path = _option(argv, '--unix')
+    workload = _option(argv, '--replay')
+    if workload is not None:
+        for response in asyncio.run(replay(workload, host, port, path)):
+            sys.stdout.buffer.write(response)
+        return
+
+    speed = parse_profile(_option(argv, '--speeds')) if '--speeds' in argv else SPEED_MPH
+    day = DeliveryDay(load_dataset(), auto_assign='--auto-assign' in argv, deadline_aware='--deadlines' in argv,
+                      speed=speed)
+    snapshot = _option(argv, '--snapshot')
+    if snapshot is not None:
+        from wgups.snapshot import cached_day
+        cached_day(snapshot, day)
+    service = StatusService(day)
+
+    async def run():
+        server = await start_server(service, host, port, path)
+        print("WGUPS status server listening on", path or "%s:%d" % (host, port))
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,562 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from wgups import instrument
+from wgups.assign import LoadSlot, _build_units, assign_loads, parse_note
+from wgups.clock import format_minutes, to_minutes
+from wgups.router import RoutePlan, plan_fleet, plan_route
+from wgups.speeds import SPEED_MPH, as_profile
+from wgups.windows import plan_route_windows
+
+# Trucks leave the hub for their first trip at 08:00 and, unless given a SpeedProfile, drive at 18 miles per hour.
+DAY_START = 8 * 60
+
+# Event kinds.
+DEPART = 0
+DELIVER = 1
+RETURN = 2
+
+# Package states, in the order a package passes through them.
+AT_HUB = 'at hub'
+EN_ROUTE = 'en route'
+DELIVERED = 'Delivered'
+STATES = (AT_HUB, EN_ROUTE, DELIVERED)
+
+
+# Record of the delivery day. Every truck trip added with add_trip is turned into timestamped events (departure, one
+# delivery per package, return) kept in time-sorted arrays, so the state of the day at any time T is found by bisect
+# instead of re-deriving it from strings and globals. Times are minutes after midnight; package times are whole minutes
+# (a package counts as delivered from the minute it is dropped off), truck times keep their fractions so mileage can be
+# interpolated. Trips of the same truck must be added in the order they are driven. speed is miles per hour or a
+# SpeedProfile (kept as a SpeedProfile in speed), from which every arrival time and every mileage at a given time comes.
+# O(1) run-time complexity, since the timeline starts empty.
+class Timeline:
+    def __init__(self, speed=SPEED_MPH, day_start=DAY_START):
+        self.speed = as_profile(speed)
+        self.day_start = day_start
+        # the event log, sorted by time when first queried after a change.
+        self.times = array('d')
+        self.kinds = array('b')
+        self.loads = array('l')
+        self.packages = array('l')  # -1 for departures and returns
+        self._sorted = True
+        # per truck: event times and miles driven by then, in driving order.
+        self.truck_times = {}
+        self.truck_miles = {}
+        self.truck_kinds = {}
+        # per load: (truck_id, departure, return, miles at departure, round-trip miles).
+        self.trips = {}
+        # per package: row in the columns below.
+        self.row_of = {}
+        self.p_ids = array('l')
+        self.departs = array('l')
+        self.delivers = array('l')
+        self.load_of = array('l')
+        # all package departure and delivery minutes, sorted when first counted after a change.
+        self._sorted_departs = array('l')
+        self._sorted_delivers = array('l')
+
+    def _log(self, time, kind, load_id, p_id=-1):
+        if self.times and time < self.times[-1]:
+            self._sorted = False
+        self.times.append(time)
+        self.kinds.append(kind)
+        self.loads.append(load_id)
+        self.packages.append(p_id)
+
+    # Records one trip of truck_id driving plan (a RoutePlan). deliveries[i] lists the package IDs dropped off at
+    # plan.stops[i]. departure defaults to day_start for the truck's first trip and to the time it is back at the hub
+    # otherwise, but no earlier than ready when that is given (e.g. a package that arrives late); an explicit departure
+    # before the truck is back raises ValueError. Returns the time the truck is back at the hub.
+    # O(s + p) run-time complexity, s stops and p packages on the trip.
+    def add_trip(self, truck_id, load_id, plan, deliveries, departure=None, ready=None):
+        if load_id in self.trips:
+            raise ValueError("load %s is already on the timeline" % load_id)
+        times = self.truck_times.setdefault(truck_id, array('d'))
+        miles = self.truck_miles.setdefault(truck_id, array('d'))
+        kinds = self.truck_kinds.setdefault(truck_id, array('b'))
+        back = self.free_at(truck_id)
+        if departure is None:
+            departure = back if ready is None else max(back, ready)
+        elif departure < back:
+            raise ValueError("truck %s is not back at the hub until %s" % (truck_id, format_minutes(back)))
+        start_miles = miles[-1] if miles else 0.0
+
+        times.append(departure)
+        miles.append(start_miles)
+        kinds.append(DEPART)
+        self._log(departure, DEPART, load_id)
+        for stop_miles, p_ids in zip(plan.arrival_miles, deliveries):
+            arrival = self.speed.arrival(departure, stop_miles)
+            times.append(arrival)
+            miles.append(start_miles + stop_miles)
+            kinds.append(DELIVER)
+            for p_id in p_ids:
+                self._add_package(p_id, load_id, departure, arrival)
+                self._log(arrival, DELIVER, load_id, p_id)
+        back = self.speed.arrival(departure, plan.total_distance)
+        times.append(back)
+        miles.append(start_miles + plan.total_distance)
+        kinds.append(RETURN)
+        self._log(back, RETURN, load_id)
+        self.trips[load_id] = (truck_id, departure, back, start_miles, plan.total_distance)
+        return back
+
+    def _add_package(self, p_id, load_id, departure, arrival):
+        if p_id in self.row_of:
+            raise ValueError("package %s is already on the timeline" % p_id)
+        self.row_of[p_id] = len(self.departs)
+        self.p_ids.append(p_id)
+        self.departs.append(int(departure))
+        self.delivers.append(int(arrival))
+        self.load_of.append(load_id)
+
+    # Time a truck is next free at the hub: day_start before its first trip, else when it is back from its last one.
+    # O(1) run-time complexity.
+    def free_at(self, truck_id):
+        times = self.truck_times.get(truck_id)
+        return times[-1] if times else self.day_start
+
+    # Time a load leaves the hub.
+    # O(1) run-time complexity.
+    def departure(self, load_id):
+        return self.trips[load_id][1]
+
+    # Time a load's truck is back at the hub.
+    # O(1) run-time complexity.
+    def return_time(self, load_id):
+        return self.trips[load_id][2]
+
+    # Minute a package is delivered.
+    # O(1) average run-time complexity.
+    def delivery_time(self, p_id):
+        return self.delivers[self.row_of[p_id]]
+
+    # State of a package at minute t, as (state, minute): (AT_HUB, departure), (EN_ROUTE, expected delivery) or
+    # (DELIVERED, delivery). Raises KeyError for a package that is on no trip.
+    # O(1) average run-time complexity.
+    def package_status(self, p_id, t):
+        i = self.row_of[p_id]
+        marks = (self.departs[i], self.delivers[i])
+        state = bisect_right(marks, t)
+        return STATES[state], marks[min(state, 1)]
+
+    # Package departure and delivery minutes, each sorted.
+    # O(n log n) run-time complexity after packages were added, O(1) otherwise.
+    def sorted_minutes(self):
+        if len(self._sorted_departs) != len(self.departs):
+            self._sorted_departs = array('l', sorted(self.departs))
+            self._sorted_delivers = array('l', sorted(self.delivers))
+        return self._sorted_departs, self._sorted_delivers
+
+    # Number of packages in each state at minute t, as {AT_HUB: n, EN_ROUTE: n, DELIVERED: n}.
+    # O(log n) run-time complexity.
+    def status_counts(self, t):
+        departs, delivers = self.sorted_minutes()
+        departed = bisect_right(departs, t)
+        delivered = bisect_right(delivers, t)
+        return {AT_HUB: len(self.departs) - departed, EN_ROUTE: departed - delivered, DELIVERED: delivered}
+
+    # Miles a truck has driven by time t (minutes, may be fractional), counting from day_start. Between events the
+    # truck is driving at the speed of the hour, except between a return and the next departure, when it waits at
+    # the hub.
+    # O(log e) run-time complexity, e being the number of events of this truck.
+    def miles_at(self, truck_id, t):
+        times = self.truck_times.get(truck_id)
+        if not times:
+            return 0.0
+        miles = self.truck_miles[truck_id]
+        i = bisect_right(times, t) - 1
+        if i < 0:
+            return 0.0
+        if i == len(times) - 1 or self.truck_kinds[truck_id][i] == RETURN:
+            return miles[i]
+        return min(miles[i + 1], miles[i] + self.speed.miles_between(times[i], t))
+
+    # Miles driven on one load's trip by time t: 0 before it leaves, its round-trip miles once it is back.
+    # O(log e) run-time complexity.
+    def load_miles_at(self, load_id, t):
+        truck_id, departure, back, start_miles, total = self.trips[load_id]
+        if t < departure:
+            return 0.0
+        return min(total, self.miles_at(truck_id, t) - start_miles)
+
+    def _sort_events(self):
+        if self._sorted:
+            return
+        order = sorted(range(len(self.times)), key=self.times.__getitem__)
+        for name in ('times', 'kinds', 'loads', 'packages'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[i] for i in order)))
+        self._sorted = True
+
+    # Events with start <= time < end, as (time, kind, load_id, p_id) tuples in time order; p_id is -1 for
+    # departures and returns.
+    # O(log e + k) run-time complexity, k being the number of events returned.
+    def events_between(self, start, end):
+        self._sort_events()
+        lo = bisect_left(self.times, start)
+        hi = bisect_left(self.times, end)
+        return [(self.times[i], self.kinds[i], self.loads[i], self.packages[i]) for i in range(lo, hi)]
+
+    def __len__(self):
+        return len(self.times)
+
+
+# The day's loads: one slot per truck trip, loads 1 and 2 first, leaving at day_start, then truck 2's second load (3)
+# and truck 1's (4).
+def default_load_slots(day_start=DAY_START):
+    return (LoadSlot(1, 1, trip=1, departure=day_start), LoadSlot(2, 2, trip=1, departure=day_start),
+            LoadSlot(3, 2, trip=2), LoadSlot(4, 1, trip=2))
+
+
+LOAD_SLOTS = default_load_slots()
+
+# The hand-picked package IDs of each load, used unless the loads are assigned automatically.
+HAND_PICKED_LOADS = {
+    1: [13, 14, 15, 16, 19, 20, 21, 27, 34, 35, 39],  # First load for Truck 1
+    2: [1, 5, 8, 29, 30, 31, 37, 38, 40],  # First load for Truck 2
+    3: [3, 6, 9, 10, 11, 18, 23, 25, 32, 36],  # Second Load for Truck 2
+    4: [2, 4, 7, 12, 17, 22, 26, 24, 28, 33],  # Second Load for Truck 1
+}
+
+
+# This Truck class holds a list of loaded packages, a truck_id, the load_id of the trip and a message about distance.
+# departure_time is the earliest minute after midnight the trip may leave the hub (None: as soon as the truck is
+# free), so each truck can start its day at its own time.
+# O(1), since once Truck instance is created each time init is called.
+class Truck:
+    def __init__(self, truck_id, load_id, packages, departure_time=None):
+        self.message = {}  # {minute of arrival: miles driven}
+        self.truck_id = truck_id
+        self.load_id = load_id
+        self.loaded_packages_list = list(packages)
+        self.departure_time = departure_time
+
+    def __repr__(self):
+        return f'Truck({self.truck_id})'  # ,"{self.load_id}",{self.loaded_packages_list})'
+
+
+# One delivery day over a Dataset: which packages go on which load, the route of each load and the resulting
+# timeline. Nothing is computed until plan() is called; plan() loads the data it needs, assigns the loads (by hand or,
+# with auto_assign, with assign_loads), routes them with plan_fleet and drives them in order, recording every trip on
+# the timeline. Trips are driven first trips first, so each second load leaves when its truck is back, and a load
+# with a package that only reaches the hub later ("Delayed on flight---will not arrive to depot until 9:05 am") not
+# before that package is there.
+# Once planned, correct_address, delay_package and cancel_package apply a mid-day change: only the affected loads'
+# remaining stops are routed again, from where the truck is at that time, and the trips are then driven again on a
+# fresh timeline from the stored plans.
+# With deadline_aware, a load whose shortest route would deliver a package after its deadline is routed again with
+# plan_route_windows, from the time it actually leaves the hub; late_packages lists any deadline still missed.
+# depot is the vertex of the hub the trucks leave from and return to, and day_start the time their first trips leave;
+# without load_slots, the default_load_slots for that day_start are used.
+# speed is the trucks' miles per hour or a SpeedProfile with a speed for each hour of the day (see wgups.speeds).
+# O(1) run-time complexity to create.
+class DeliveryDay:
+    def __init__(self, dataset, load_slots=None, auto_assign=False, improve=True, workers=1,
+                 deadline_aware=False, depot=0, day_start=DAY_START, speed=SPEED_MPH):
+        self.dataset = dataset
+        self.load_slots = list(load_slots if load_slots is not None else default_load_slots(day_start))
+        self.auto_assign = auto_assign
+        self.improve = improve
+        self.workers = workers
+        self.deadline_aware = deadline_aware
+        self.depot = depot
+        self.day_start = day_start
+        self.speed = as_profile(speed)
+        self.trucks = {}  # {load_id: Truck}
+        self.distances = {}  # {load_id: round-trip miles}
+        self.plans = {}  # {load_id: RoutePlan}
+        self.deliveries = {}  # {load_id: [package IDs dropped off at each stop of the plan]}
+        self.ready = {}  # {load_id: minutes}, loads held at the hub until then
+        self.order = []  # load IDs in the order they are driven
+        self.timeline = None
+
+    @property
+    def packages(self):
+        return self.dataset.packages
+
+    # Plans and drives the day, once. Returns the DeliveryDay. Each stage is timed when instrumentation is on, and the
+    # whole run is profiled when profiling is (see wgups.instrument).
+    # O(L * plan_route) run-time complexity, L being the number of loads.
+    def plan(self):
+        if self.timeline is not None:
+            return self
+        with instrument.capture('plan'), instrument.stage('plan'):
+            self._plan()
+        return self
+
+    def _plan(self):
+        dist = self.dataset.shortest.dist
+        with instrument.stage('assign_loads'):
+            if self.auto_assign:
+                loads = assign_loads([self.packages.search(p_id) for p_id in sorted(self.packages)],
+                                     self.dataset.vertex_of, dist, self.load_slots, depot=self.depot)
+            else:
+                loads = {load_id: [self.packages.search(p_id) for p_id in p_ids]
+                         for load_id, p_ids in HAND_PICKED_LOADS.items()}
+            # a load carrying a package that only reaches the hub later ("Delayed on flight") waits for it.
+            for load_id, packages in loads.items():
+                arrivals = [ready for ready in (parse_note(p.note)[1] for p in packages) if ready is not None]
+                if arrivals:
+                    self.ready[load_id] = max(self.ready.get(load_id, 0), *arrivals)
+
+        fleet = [Truck(slot.truck_id, slot.load_id, loads[slot.load_id], slot.departure)
+                 for slot in sorted(self.load_slots, key=lambda slot: (slot.trip, slot.truck_id))]
+        with instrument.stage('route_stops'):
+            stops = [self.route_stops(truck) for truck in fleet]
+        with instrument.stage('plan_fleet'):
+            fleet_plans = plan_fleet(stops, dist, workers=self.workers, depot=self.depot, improve=self.improve)
+        with instrument.stage('drive'):
+            self.timeline = Timeline(self.speed, self.day_start)
+            for truck, plan in zip(fleet, fleet_plans):
+                self.trucks[truck.load_id] = truck
+                self.order.append(truck.load_id)
+                if self.deadline_aware:
+                    departure = self.timeline.free_at(truck.truck_id)
+                    if self.ready_at(truck) is not None:
+                        departure = max(departure, self.ready_at(truck))
+                    plan = self._route(truck.loaded_packages_list, plan.stops, departure, depot=self.depot, plan=plan)
+                self.distances[truck.load_id] = self.apply_route(truck, plan)
+
+    # Drives the day from loads and routes computed earlier (e.g. read from a snapshot) instead of planning it: trucks
+    # is {load_id: Truck}, plans {load_id: RoutePlan}, deliveries {load_id: [package IDs per stop]}, order the load IDs
+    # in driving order and ready {load_id: minutes} for held loads. Returns the DeliveryDay.
+    # O(E) run-time complexity, E being the number of events of the day.
+    def resume(self, trucks, plans, deliveries, order, ready=None):
+        self.trucks = dict(trucks)
+        self.plans = dict(plans)
+        self.deliveries = dict(deliveries)
+        self.order = list(order)
+        self.ready = dict(ready or {})
+        self._drive()
+        return self
+
+    # Earliest minute a Truck's load may leave the hub: its departure_time, or later while the load is held for a
+    # package that is not at the hub yet. None when the load just leaves as soon as the truck is free.
+    # O(1) run-time complexity.
+    def ready_at(self, truck):
+        held = self.ready.get(truck.load_id)
+        if truck.departure_time is None or held is not None and held > truck.departure_time:
+            return held
+        return truck.departure_time
+
+    # Earliest deadline (minutes after midnight) of the given packages at each of their vertices.
+    # O(n) run-time complexity.
+    def stop_deadlines(self, packages):
+        deadlines = {}
+        for pkg in packages:
+            vertex = self.dataset.vertex_of(pkg)
+            deadline = self.packages.deadline_of[pkg.p_id]
+            if deadline < deadlines.get(vertex, deadline + 1):
+                deadlines[vertex] = deadline
+        return deadlines
+
+    # Routes stops, the vertices of packages, leaving start (the hub unless given) at minute departure: plan_route,
+    # or plan_route_windows with the packages' deadlines when the day is deadline_aware. plan is the plan_route
+    # result when it is already known.
+    # O(plan_route) run-time complexity, O(plan_route_windows) when it has to meet deadlines.
+    def _route(self, packages, stops, departure, start=None, depot=0, plan=None):
+        dist = self.dataset.shortest.dist
+        if not self.deadline_aware:
+            return plan or plan_route(dist, stops, depot, self.improve, start=start)
+        return plan_route_windows(dist, stops, self.stop_deadlines(packages), departure, depot, self.improve,
+                                  start=start, speed=self.speed, plain=plan)
+
+    # This method accepts a Truck object and returns the list of vertices its packages go to, in load order. Each
+    # package is marked "en route" and given the truck's load number, used later in displaying results.
+    # O(n) run-time complexity, n being the number of packages on the truck: each address is found in the dataset's
+    # address index and the vertices already seen are kept in a dict.
+    def route_stops(self, truck):
+        # verts_to_visit will be made from the package addresses; a dict keeps them in load order without repeats.
+        verts_to_visit = {}
+        # for every package on the Truck:
+        for i in truck.loaded_packages_list:  # O(n)
+            # change package status from "at hub" to "en route" and record the truck; update keeps the indexes current.
+            self.packages.update(i.p_id, status="en route", truck=truck.load_id)
+            verts_to_visit.setdefault(self.dataset.vertex_of(i))
+        if instrument.ENABLED:
+            instrument.count('route_stops.packages', len(truck.loaded_packages_list))
+        return list(verts_to_visit)
+
+    # This method drives a Truck along a RoutePlan: the trip is recorded on the timeline, leaving when the truck is
+    # back from its previous trip but not before ready_at(truck), and at each stop the truck's packages for that
+    # address (or, when given, deliveries[i] for stop i) are marked 'Delivered' with the minute of arrival from the
+    # timeline. The truck's message records the miles driven by each arrival. Returns the number of miles for the round
+    # trip.
+    # O(n + p) run-time complexity, n being the number of stops and p the packages on the truck, which are grouped by
+    # vertex once instead of being looked up per stop.
+    def apply_route(self, truck, plan, deliveries=None):
+        if deliveries is None:
+            # multiple packages may be going to the same address, but only those on this truck are delivered here.
+            at_vertex = {}
+            for pack in sorted(truck.loaded_packages_list, key=lambda pack: pack.p_id):
+                at_vertex.setdefault(self.dataset.vertex_of(pack), []).append(pack.p_id)
+            deliveries = [at_vertex.get(this_ve, []) for this_ve in plan.stops]
+        for delivered in deliveries:
+            for p_id in delivered:
+                self.packages.update(p_id, status='Delivered')
+        self.timeline.add_trip(truck.truck_id, truck.load_id, plan, deliveries, ready=self.ready_at(truck))
+        self.plans[truck.load_id] = plan
+        self.deliveries[truck.load_id] = deliveries
+
+        departure = self.timeline.departure(truck.load_id)
+        for total_distance, delivered in zip(plan.arrival_miles, deliveries):
+            for p_id in delivered:
+                self.packages.search(p_id).time_mod = self.timeline.delivery_time(p_id)
+            # add a message to the truck.
+            truck.message[int(self.speed.arrival(departure, total_distance))] = total_distance
+        # the sum of the path and the return trip.
+        return plan.total_distance
+
+    # Drives every load again, in order, from the stored plans onto a new timeline.
+    # O(E) run-time complexity, E being the number of events of the day.
+    def _drive(self):
+        self.timeline = Timeline(self.speed, self.day_start)
+        for load_id in self.order:
+            truck = self.trucks[load_id]
+            truck.message = {}
+            self.distances[load_id] = self.apply_route(truck, self.plans[load_id], self.deliveries[load_id])
+
+    # Number of stops of a load's plan the truck has reached, or is driving to, at minute t.
+    # O(log s) run-time complexity.
+    def _committed_stops(self, load_id, t):
+        departure = self.timeline.departure(load_id)
+        if t < departure:
+            return 0
+        plan = self.plans[load_id]
+        driven = self.speed.miles_between(departure, t)
+        return min(len(plan.stops), bisect_right(plan.arrival_miles, driven) + 1)
+
+    # Routes again the stops of a load that are still ahead of the truck at minute t, from the stop it has reached or
+    # is driving to (or the hub, before it leaves), using the cached all-pairs matrix. Packages that were to be
+    # delivered at a committed stop but now go elsewhere, or are no longer on the truck, are dropped from that stop.
+    # With deadline_aware, the remaining stops keep their deadlines counting from when the truck reaches that stop.
+    # O(plan_route) run-time complexity over the remaining stops.
+    def _replan(self, load_id, t):
+        truck = self.trucks[load_id]
+        plan = self.plans[load_id]
+        vertex = {p.p_id: self.dataset.vertex_of(p) for p in truck.loaded_packages_list}
+        fixed = self._committed_stops(load_id, t)
+        prefix = [[p_id for p_id in delivered if vertex.get(p_id) == stop]
+                  for stop, delivered in zip(plan.stops[:fixed], self.deliveries[load_id][:fixed])]
+        done = {p_id for delivered in prefix for p_id in delivered}
+
+        ahead = {}  # {vertex: [package IDs]}, in load order
+        for p in truck.loaded_packages_list:
+            if p.p_id not in done:
+                ahead.setdefault(vertex[p.p_id], []).append(p.p_id)
+        offset = plan.arrival_miles[fixed - 1] if fixed else 0.0
+        rest = self._route([p for p in truck.loaded_packages_list if p.p_id not in done], list(ahead),
+                           self.speed.arrival(self.timeline.departure(load_id), offset),
+                           start=plan.stops[fixed - 1] if fixed else None, depot=plan.depot)
+        self.plans[load_id] = RoutePlan(plan.stops[:fixed] + rest.stops,
+                                        plan.arrival_miles[:fixed] + [offset + miles for miles in rest.arrival_miles],
+                                        rest.return_distance, plan.depot)
+        self.deliveries[load_id] = prefix + [ahead[stop] for stop in rest.stops]
+
+    # The package with this ID, checking it is on a load and not yet delivered at minute t.
+    def _pending(self, p_id, t):
+        pkg = self.packages.search(p_id)
+        if pkg is None:
+            raise KeyError(p_id)
+        if pkg.truck not in self.trucks:
+            raise ValueError("package %s is not on any truck" % p_id)
+        state, minute = self.timeline.package_status(p_id, t)
+        if state == DELIVERED:
+            raise ValueError("package %s was delivered at %s" % (p_id, format_minutes(minute)))
+        return pkg
+
+    # Changes the delivery address of a package that is not delivered yet at time at (minutes or 'HH:MM'), e.g. for
+    # a "Wrong address listed" note, and routes its load's remaining stops again. city and zipcode are changed too when
+    # given. Raises ValueError for an address that is not in addresses.csv. Returns the IDs of the re-planned loads.
+    # O(plan_route) run-time complexity over the load's remaining stops.
+    def correct_address(self, p_id, at, address, city=None, zipcode=None):
+        t = to_minutes(at)
+        self.plan()
+        pkg = self._pending(p_id, t)
+        self.dataset.vertex_of_address(address)  # raises ValueError for an unknown address
+        fields = {'address': address}
+        if city is not None:
+            fields['city'] = city
+        if zipcode is not None:
+            fields['zipcode'] = zipcode
+        self.packages.update(p_id, **fields)
+        self._replan(pkg.truck, t)
+        self._drive()
+        return [pkg.truck]
+
+    # Records that a package still at the hub at time at will only reach it at ready (minutes or 'HH:MM'), e.g. for a
+    # "Delayed on flight" note. If its load leaves before ready, the package moves, together with the packages it must
+    # be delivered with, to the earliest load that has not left yet, leaves at or after ready, has room for all of them
+    # in its slot and is on an allowed truck ("Can only be on truck N"); both loads are routed again, and the new load
+    # is held at the hub until ready should its truck now be back sooner. If there is no such load, the package's own
+    # load is held at the hub until ready instead. Raises ValueError for a package whose load has already left. Returns
+    # the IDs of the re-planned loads.
+    # O(L + plan_route) run-time complexity, L being the number of loads.
+    def delay_package(self, p_id, at, ready):
+        t, ready = to_minutes(at), to_minutes(ready)
+        self.plan()
+        pkg = self._pending(p_id, t)
+        load_id = pkg.truck
+        departure = self.timeline.departure(load_id)
+        if t >= departure:
+            raise ValueError("package %s left the hub at %s" % (p_id, format_minutes(departure)))
+        if departure >= ready:
+            return []
+        truck = self.trucks[load_id]
+        unit = next(unit for unit in _build_units(truck.loaded_packages_list, self.dataset.vertex_of)
+                    if pkg in unit.packages)
+        slots = {slot.load_id: slot for slot in self.load_slots}
+        later = [other for other in self.order
+                 if other != load_id and self.timeline.departure(other) >= ready and unit.allows(slots[other])
+                 and len(self.trucks[other].loaded_packages_list) + unit.size <= slots[other].capacity]
+        if later:
+            target = min(later, key=self.timeline.departure)
+            for moved in unit.packages:
+                truck.loaded_packages_list.remove(moved)
+                self.trucks[target].loaded_packages_list.append(moved)
+                self.packages.update(moved.p_id, truck=target)
+            self._replan(load_id, t)
+            self._replan(target, t)
+            # the lighter source load may bring the same truck back sooner, so the new load waits for ready itself.
+            self.ready[target] = max(self.ready.get(target, ready), ready)
+            self._drive()
+            return [load_id, target]
+        self.ready[load_id] = max(self.ready.get(load_id, ready), ready)
+        self._drive()
+        return [load_id]
+
+    # Takes a package that is not delivered yet at time at (minutes or 'HH:MM') off its load, marks it 'cancelled'
+    # and routes the load's remaining stops again. Returns the IDs of the re-planned loads.
+    # O(plan_route) run-time complexity over the load's remaining stops.
+    def cancel_package(self, p_id, at):
+        t = to_minutes(at)
+        self.plan()
+        pkg = self._pending(p_id, t)
+        load_id = pkg.truck
+        self.trucks[load_id].loaded_packages_list.remove(pkg)
+        self.packages.update(p_id, status='cancelled', truck=None)
+        pkg.time_mod = int(t)
+        self._replan(load_id, t)
+        self._drive()
+        return [load_id]
+
+    # Packages delivered after their deadline, as (p_id, deadline, delivery) in minutes after midnight, by package ID.
+    # O(n) run-time complexity.
+    def late_packages(self):
+        self.plan()
+        timeline = self.timeline
+        deadline_of = self.packages.deadline_of
+        return [(p_id, deadline_of[p_id], timeline.delivers[timeline.row_of[p_id]]) for p_id in sorted(timeline.row_of)
+                if timeline.delivers[timeline.row_of[p_id]] > deadline_of[p_id]]
+
+    # Miles driven by one truck over all of its trips.
+    # O(L) run-time complexity, L being the number of loads.
+    def truck_distance(self, truck_id):
+        return sum(miles for load_id, miles in self.distances.items() if self.trucks[load_id].truck_id == truck_id)
+
+    # Miles driven by the whole fleet.
+    @property
+    def total_distance(self):
+        return sum(self.distances.values())
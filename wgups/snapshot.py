@@ -0,0 +1,254 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from wgups.graph import MatrixGraph
+from wgups.loaders import ADDRESSES_CSV, DISTANCES_CSV
+from wgups.matrix import AllPairs, DistanceMatrix, file_hash
+from wgups.package import PackageStore, PackageTable
+from wgups.router import RoutePlan
+from wgups.simulation import LoadSlot, Truck
+
+# A snapshot is one binary file holding a planned delivery day: the direct and all-pairs distance matrices, the
+# addresses, the package columns of a PackageStore, the routes of every load and the timeline's package columns.
+# Layout: MAGIC, then '<IQQ' (format version, offset and length of the JSON header), then every array section at an
+# 8-byte aligned offset, then the JSON header describing them. The header records the SHA-256 of each source csv so
+# a snapshot is only used while those files are unchanged. Sections are read through mmap: arrays come back as
+# zero-copy memoryviews (or numpy views, with array()/numpy()), and nothing but the header is parsed on open.
+MAGIC = b'WGUPSNAP'
+VERSION = 2
+_PREFIX = struct.Struct('<IQQ')
+_ALIGN = 8
+
+# DeliveryDay settings a snapshot was planned with; a snapshot is only reused for a day with the same ones.
+OPTIONS = ('auto_assign', 'improve', 'deadline_aware', 'depot', 'day_start', 'speed')
+
+
+# A day's OPTIONS as JSON-ready values, the speed profile as its hourly speeds.
+def _options(day):
+    options = {name: getattr(day, name) for name in OPTIONS}
+    options['speed'] = day.speed.as_list()
+    return options
+
+
+def _pad(f):
+    f.write(b'\0' * (-f.tell() % _ALIGN))
+
+
+# Writes a planned DeliveryDay to path (through a temporary file, so readers never see a partial snapshot). The
+# network and manifest it was planned from are hashed into the header.
+# O(V^2 + n + E) run-time complexity, V addresses, n packages and E timeline events.
+def save_snapshot(day, path):
+    day.plan()
+    dataset = day.dataset
+    packages = dataset.packages
+    store = PackageStore.from_packages([packages.search(p_id) for p_id in sorted(packages)])
+    timeline = day.timeline
+    order = list(day.order)
+
+    stop_offsets, stops, arrival_miles, returns, depots, starts = array('l', [0]), array('l'), array('d'), \
+        array('d'), array('l'), array('l')
+    delivery_offsets, deliveries = array('l', [0]), array('l')
+    trucks, package_offsets, load_packages = array('l'), array('l', [0]), array('l')
+    for load_id in order:
+        plan = day.plans[load_id]
+        stops.extend(plan.stops)
+        stop_offsets.append(len(stops))
+        arrival_miles.extend(plan.arrival_miles)
+        returns.append(plan.return_distance)
+        depots.append(plan.depot)
+        starts.append(plan.start)
+        for delivered in day.deliveries[load_id]:
+            deliveries.extend(delivered)
+            delivery_offsets.append(len(deliveries))
+        truck = day.trucks[load_id]
+        trucks.append(truck.truck_id)
+        load_packages.extend(p.p_id for p in truck.loaded_packages_list)
+        package_offsets.append(len(load_packages))
+
+    n = dataset.graph.matrix.n
+    sections = [
+        ('graph.distance', dataset.graph.matrix.data),
+        ('shortest.dist', dataset.shortest.dist.data),
+        ('shortest.pred', dataset.shortest.pred.data),
+        ('plan.load', array('l', order)), ('plan.truck', trucks), ('plan.depot', depots), ('plan.start', starts),
+        ('plan.return', returns), ('plan.stop_offsets', stop_offsets), ('plan.stops', stops),
+        ('plan.arrival_miles', arrival_miles), ('plan.delivery_offsets', delivery_offsets),
+        ('plan.deliveries', deliveries), ('plan.package_offsets', package_offsets), ('plan.packages', load_packages),
+        ('timeline.p_ids', timeline.p_ids), ('timeline.load_of', timeline.load_of),
+        ('timeline.departs', timeline.departs), ('timeline.delivers', timeline.delivers),
+    ]
+    sections += [('packages.' + name, getattr(store, name)) for name in
+                 ('p_id', 'deadline', 'mass_k', 'truck', 'time_mod') + PackageStore.TEXT_COLUMNS]
+    header = {
+        'version': VERSION,
+        'byteorder': sys.byteorder,
+        'sources': {name: file_hash(dataset.path(name))
+                    for name in (ADDRESSES_CSV, DISTANCES_CSV, dataset.packages_file)},
+        'packages_file': dataset.packages_file,
+        'options': _options(day),
+        'slots': [[slot.load_id, slot.truck_id, slot.trip, slot.departure] for slot in day.load_slots],
+        'ready': {str(load_id): minutes for load_id, minutes in day.ready.items()},
+        'vertices': n,
+        'addresses': list(dataset.addresses),
+        'pools': {name: store.pools[name].strings for name in PackageStore.TEXT_COLUMNS},
+        'sections': {},
+    }
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + _PREFIX.pack(0, 0, 0))
+        for name, data in sections:
+            _pad(f)
+            view = memoryview(data)
+            header['sections'][name] = [f.tell(), view.format, view.itemsize, len(view)]
+            f.write(view.cast('B'))
+        _pad(f)
+        offset = f.tell()
+        encoded = json.dumps(header, separators=(',', ':')).encode()
+        f.write(encoded)
+        f.seek(len(MAGIC))
+        f.write(_PREFIX.pack(VERSION, offset, len(encoded)))
+    os.replace(tmp, path)
+    return path
+
+
+# An open snapshot file. Nothing but the JSON header is read up front; every section is a view into the mapped file.
+# O(1) run-time complexity to open, apart from the header and the source hashes.
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError("%s is not a snapshot" % path)
+        version, offset, length = _PREFIX.unpack_from(self._mm, len(MAGIC))
+        if version != VERSION:
+            raise ValueError("%s is snapshot version %d, expected %d" % (path, version, VERSION))
+        self.header = json.loads(self._mm[offset:offset + length])
+        if self.header['byteorder'] != sys.byteorder:
+            raise ValueError("%s was written on a %s-endian machine" % (path, self.header['byteorder']))
+
+    @property
+    def options(self):
+        return self.header['options']
+
+    @property
+    def addresses(self):
+        return self.header['addresses']
+
+    # Zero-copy memoryview of a section, cast to its element type.
+    def array(self, name):
+        offset, typecode, itemsize, count = self.header['sections'][name]
+        if array(typecode).itemsize != itemsize:
+            raise ValueError("section %s has %d-byte items, this platform's %r are %d bytes" % (
+                name, itemsize, typecode, array(typecode).itemsize))
+        return memoryview(self._mm)[offset:offset + itemsize * count].cast(typecode)
+
+    # Zero-copy read-only numpy array over a section.
+    def numpy(self, name):
+        import numpy
+        offset, typecode, itemsize, count = self.header['sections'][name]
+        return numpy.frombuffer(self._mm, dtype=numpy.dtype(typecode), count=count, offset=offset)
+
+    @property
+    def matrix(self):
+        return DistanceMatrix(self.header['vertices'], self.array('graph.distance'))
+
+    @property
+    def shortest(self):
+        n = self.header['vertices']
+        return AllPairs(DistanceMatrix(n, self.array('shortest.dist')), DistanceMatrix(n, self.array('shortest.pred')))
+
+    # The package columns as a read-only PackageStore whose columns are views into the snapshot.
+    # O(s) run-time complexity for s distinct strings.
+    @property
+    def packages(self):
+        store = PackageStore()
+        for name in ('p_id', 'deadline', 'mass_k', 'truck', 'time_mod') + PackageStore.TEXT_COLUMNS:
+            setattr(store, name, self.array('packages.' + name))
+        for name, strings in self.header['pools'].items():
+            for text in strings:
+                store.pools[name].code(text)
+        if any(p_id != row + 1 for row, p_id in enumerate(store.p_id)):
+            store.row_of = {p_id: row for row, p_id in enumerate(store.p_id)}
+        return store
+
+    # Sources whose content no longer matches the snapshot, among those present in directory.
+    # O(size of the source files) run-time complexity.
+    def stale_sources(self, directory='.'):
+        stale = []
+        for name, digest in self.header['sources'].items():
+            source = os.path.join(directory, name)
+            if os.path.exists(source) and file_hash(source) != digest:
+                stale.append(name)
+        return stale
+
+
+# Opens a snapshot, checked against the source csv files in directory unless validate is False. Raises ValueError
+# for a file that is not a snapshot, of another version, or made from csv files that have changed since.
+def open_snapshot(path, directory='.', validate=True):
+    snapshot = Snapshot(path)
+    if validate:
+        stale = snapshot.stale_sources(directory)
+        if stale:
+            raise ValueError("snapshot %s is out of date: %s changed" % (path, ', '.join(stale)))
+    return snapshot
+
+
+def _split(offsets, values):
+    return [values[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+
+
+# Fills an unplanned DeliveryDay from a snapshot: its dataset gets the snapshot's addresses, matrices and packages
+# instead of reading the csv files, and the stored loads and routes are driven onto a new timeline without any
+# assignment or routing. Returns the day.
+# O(V + n + E) run-time complexity.
+def restore_day(snapshot, day):
+    store = snapshot.packages
+    table = PackageTable()
+    table.insert_many((p_id, store.package(p_id)) for p_id in store.p_id)
+    day.dataset.preload(addresses=snapshot.addresses, graph=MatrixGraph(snapshot.matrix), shortest=snapshot.shortest,
+                        packages=table)
+    day.load_slots = [LoadSlot(load_id, truck_id, trip, departure=departure)
+                      for load_id, truck_id, trip, departure in snapshot.header['slots']]
+    departure_time = {slot.load_id: slot.departure for slot in day.load_slots}
+
+    order = snapshot.array('plan.load').tolist()
+    stop_offsets = snapshot.array('plan.stop_offsets')
+    stops = _split(stop_offsets, snapshot.array('plan.stops'))
+    miles = _split(stop_offsets, snapshot.array('plan.arrival_miles'))
+    returns, depots, starts = snapshot.array('plan.return'), snapshot.array('plan.depot'), snapshot.array('plan.start')
+    delivered = _split(snapshot.array('plan.delivery_offsets'), snapshot.array('plan.deliveries'))
+    on_load = _split(snapshot.array('plan.package_offsets'), snapshot.array('plan.packages'))
+    trucks, plans, deliveries = {}, {}, {}
+    for i, load_id in enumerate(order):
+        trucks[load_id] = Truck(snapshot.array('plan.truck')[i], load_id, [table.search(p_id) for p_id in on_load[i]],
+                                departure_time.get(load_id))
+        plans[load_id] = RoutePlan(stops[i], miles[i], returns[i], depots[i],
+                                   None if starts[i] == depots[i] else starts[i])
+        deliveries[load_id] = delivered[stop_offsets[i]:stop_offsets[i + 1]]
+        # loading order, as when the day was planned, so by_truck lists each load's packages in the same order.
+        for p_id in on_load[i]:
+            table.update(p_id, truck=load_id)
+    ready = {int(load_id): minutes for load_id, minutes in snapshot.header['ready'].items()}
+    return day.resume(trucks, plans, deliveries, order, ready)
+
+
+# The day from the snapshot at path when it matches the day's csv files and settings; otherwise the day is planned
+# from the csv files and the snapshot (re)written. Lets a dispatch process or query server restart without parsing
+# or planning anything. day must not be planned yet. Returns the planned day.
+def cached_day(path, day):
+    try:
+        snapshot = open_snapshot(path, day.dataset.directory)
+    except (OSError, ValueError, KeyError):
+        snapshot = None
+    if snapshot is not None and snapshot.options == _options(day) and \
+            snapshot.header['packages_file'] == day.dataset.packages_file:
+        return restore_day(snapshot, day)
+    day.plan()
+    save_snapshot(day, path)
+    return day
@@ -0,0 +1,103 @@
+from array import array
+from numbers import Real
+
+# Trucks drive at 18 miles per hour unless a SpeedProfile says otherwise.
+SPEED_MPH = 18
+BUCKET_MINUTES = 60
+BUCKETS = 24 * 60 // BUCKET_MINUTES
+
+
+# Truck speed through the day, one speed per hour of the day (24 doubles), the same on every road. Times are minutes
+# after midnight and wrap around at midnight. Travel is integrated over the hours a trip spans, so a truck that leaves
+# at 07:50 drives its first ten minutes at the 07:00 speed and the rest at the 08:00 one; arrival(departure, miles) and
+# miles_between(departure, t) are exact inverses of each other. With the same speed every hour both are a single
+# division, as with the old fixed speed.
+class SpeedProfile:
+    def __init__(self, hourly):
+        self.hourly = array('d', hourly)
+        if len(self.hourly) != BUCKETS:
+            raise ValueError("a speed profile needs %d hourly speeds, got %d" % (BUCKETS, len(self.hourly)))
+        if min(self.hourly) <= 0:
+            raise ValueError("speeds must be positive")
+        self.mph = self.hourly[0] if min(self.hourly) == max(self.hourly) else None  # the speed, when constant
+
+    @classmethod
+    def constant(cls, mph=SPEED_MPH):
+        return cls([mph] * BUCKETS)
+
+    # Speed in miles per hour at minute t.
+    # O(1) run-time complexity.
+    def speed_at(self, t):
+        return self.hourly[int(t // BUCKET_MINUTES) % BUCKETS]
+
+    # Minute a truck leaving at departure has driven miles.
+    # O(1) run-time complexity for a constant profile, O(h) otherwise, h being the hours the trip spans.
+    def arrival(self, departure, miles):
+        if self.mph is not None:
+            return departure + (miles / self.mph) * 60
+        t = departure
+        while True:
+            mph = self.speed_at(t)
+            end = (t // BUCKET_MINUTES + 1) * BUCKET_MINUTES
+            reach = mph * (end - t) / 60
+            if miles <= reach:
+                return t + (miles / mph) * 60
+            miles -= reach
+            t = end
+
+    # Miles a truck leaving at departure has driven by minute t (negative before departure, at the departure hour's
+    # speed, so deadlines before it still order correctly).
+    # O(1) run-time complexity for a constant profile, O(h) otherwise.
+    def miles_between(self, departure, t):
+        if self.mph is not None:
+            return (t - departure) * self.mph / 60
+        if t <= departure:
+            return (t - departure) * self.speed_at(departure) / 60
+        miles = 0.0
+        while departure < t:
+            end = min(t, (departure // BUCKET_MINUTES + 1) * BUCKET_MINUTES)
+            miles += self.speed_at(departure) * (end - departure) / 60
+            departure = end
+        return miles
+
+    # The hourly speeds as a list, e.g. for JSON.
+    def as_list(self):
+        return self.hourly.tolist()
+
+    def __eq__(self, other):
+        return isinstance(other, SpeedProfile) and self.hourly == other.hourly
+
+    def __hash__(self):
+        return hash(self.hourly.tobytes())
+
+    def __repr__(self):
+        if self.mph is not None:
+            return 'SpeedProfile.constant(%g)' % self.mph
+        return 'SpeedProfile(%r)' % self.as_list()
+
+
+# A SpeedProfile from a number of miles per hour (the same all day) or a profile, which is returned as is.
+def as_profile(speed):
+    if isinstance(speed, SpeedProfile):
+        return speed
+    if isinstance(speed, Real):
+        return SpeedProfile.constant(speed)
+    raise TypeError("speed must be miles per hour or a SpeedProfile, not %r" % (speed,))
+
+
+# Parses a speed profile written as 'MPH[,FROM-TO:MPH...]': the speed for the whole day, then the speed for the hours
+# FROM up to TO (whole hours, 0-24), later ranges overriding earlier ones, e.g. '18,7-9:12,16-18:10' for rush hours at
+# 12 and 10 mph. Raises ValueError for anything else.
+def parse_profile(text):
+    parts = text.replace(' ', '').split(',')
+    try:
+        hourly = [float(parts[0])] * BUCKETS
+        for part in parts[1:]:
+            hours, mph = part.split(':')
+            first, last = (int(h) for h in hours.split('-'))
+            if not 0 <= first < last <= BUCKETS:
+                raise ValueError
+            hourly[first:last] = [float(mph)] * (last - first)
+    except ValueError:
+        raise ValueError("bad speed profile %r, expected MPH[,FROM-TO:MPH...]" % text) from None
+    return SpeedProfile(hourly)
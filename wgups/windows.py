@@ -0,0 +1,238 @@
+import time
+
+from wgups import instrument
+from wgups.improve import EPSILON
+from wgups.router import RoutePlan, plan_route
+from wgups.speeds import SPEED_MPH, as_profile
+
+_INF = float('inf')
+
+
+# Minimum of any range of a fixed list of values in O(1), after an O(n log n) build (sparse table).
+class _RangeMin:
+    def __init__(self, values):
+        self.levels = [list(values)]
+        width = 1
+        while 2 * width <= len(values):
+            prev = self.levels[-1]
+            self.levels.append([min(prev[i], prev[i + width]) for i in range(len(prev) - width)])
+            width *= 2
+
+    # Minimum of values[lo..hi], inclusive; infinity for an empty range.
+    def query(self, lo, hi):
+        if lo > hi:
+            return _INF
+        k = (hi - lo + 1).bit_length() - 1
+        row = self.levels[k]
+        return min(row[lo], row[hi - (1 << k) + 1])
+
+
+# Arrival times along a route and how much later each stop could be reached without any deadline from it onwards being
+# missed. With these, whether inserting, moving or swapping stops keeps every deadline is answered in O(1): a change
+# delays the stops after it by a fixed number of minutes, which must fit in the slack of that stretch.
+# O(n log n) run-time complexity to build, n being the number of stops.
+class _Schedule:
+    def __init__(self, d, route, start, depot, departure, deadline, per_mile):
+        self.d = d
+        self.route = route
+        self.start = start
+        self.depot = depot
+        self.departure = departure
+        self.deadline = deadline
+        self.per_mile = per_mile
+        self.arrive = []
+        t, prev = departure, start
+        for v in route:
+            t += d(prev, v) * per_mile
+            self.arrive.append(t)
+            prev = v
+        margin = [deadline(v) - a for v, a in zip(route, self.arrive)]
+        self.margins = _RangeMin(margin)
+        self.suffix = margin + [_INF]  # suffix[i]: least margin of the stops from i onwards
+        for i in range(len(route) - 1, -1, -1):
+            self.suffix[i] = min(margin[i], self.suffix[i + 1])
+
+    def _prev(self, i):
+        return self.route[i - 1] if i > 0 else self.start
+
+    def _next(self, i):
+        return self.route[i + 1] if i + 1 < len(self.route) else self.depot
+
+    def _time(self, i):
+        return self.arrive[i] if i >= 0 else self.departure
+
+    # Extra miles of putting v before position i (i == len(route) for the end), and whether every deadline still holds.
+    # O(1) run-time complexity.
+    def insertion(self, v, i):
+        d = self.d
+        prev = self.route[i - 1] if i > 0 else self.start
+        nxt = self.route[i] if i < len(self.route) else self.depot
+        extra = d(prev, v) + d(v, nxt) - d(prev, nxt)
+        ok = (self._time(i - 1) + d(prev, v) * self.per_mile <= self.deadline(v) + EPSILON and
+              extra * self.per_mile <= self.suffix[i] + EPSILON)
+        return extra, ok
+
+    # Change in miles of moving the stop at i to the gap before original position k (k == len(route) for the end;
+    # k is neither i nor i + 1), and whether every deadline still holds.
+    # O(1) run-time complexity.
+    def relocation(self, i, k):
+        d, route, pm = self.d, self.route, self.per_mile
+        v = route[i]
+        p, n = self._prev(i), self._next(i)
+        saved = d(p, v) + d(v, n) - d(p, n)
+        if k < i:
+            prev = route[k - 1] if k > 0 else self.start
+            nxt = route[k]
+            extra = d(prev, v) + d(v, nxt) - d(prev, nxt)
+            ok = (self._time(k - 1) + d(prev, v) * pm <= self.deadline(v) + EPSILON and
+                  extra * pm <= self.margins.query(k, i - 1) + EPSILON and
+                  (extra - saved) * pm <= self.suffix[i + 1] + EPSILON)
+        else:
+            prev = route[k - 1]
+            nxt = route[k] if k < len(route) else self.depot
+            extra = d(prev, v) + d(v, nxt) - d(prev, nxt)
+            ok = (self.arrive[k - 1] - saved * pm + d(prev, v) * pm <= self.deadline(v) + EPSILON and
+                  (extra - saved) * pm <= self.suffix[k] + EPSILON)
+        return extra - saved, ok
+
+    # Change in miles of swapping the stops at i and j (i < j), and whether every deadline still holds.
+    # O(1) run-time complexity.
+    def swap(self, i, j):
+        d, route, pm = self.d, self.route, self.per_mile
+        a, b = route[i], route[j]
+        p, n = self._prev(i), self._next(j)
+        if j == i + 1:
+            change = d(p, b) + d(b, a) + d(a, n) - d(p, a) - d(a, b) - d(b, n)
+            arrive_b = self._time(i - 1) + d(p, b) * pm
+            ok = (arrive_b <= self.deadline(b) + EPSILON and arrive_b + d(b, a) * pm <= self.deadline(a) + EPSILON and
+                  change * pm <= self.suffix[j + 1] + EPSILON)
+            return change, ok
+        after_i, before_j = route[i + 1], route[j - 1]
+        first = d(p, b) + d(b, after_i) - d(p, a) - d(a, after_i)
+        second = d(before_j, a) + d(a, n) - d(before_j, b) - d(b, n)
+        ok = (self._time(i - 1) + d(p, b) * pm <= self.deadline(b) + EPSILON and
+              first * pm <= self.margins.query(i + 1, j - 1) + EPSILON and
+              self.arrive[j - 1] + (first + d(before_j, a)) * pm <= self.deadline(a) + EPSILON and
+              (first + second) * pm <= self.suffix[j + 1] + EPSILON)
+        return first + second, ok
+
+
+# Stops of a plan reached after their deadline, as (vertex, arrival minute, deadline minute) in driving order, for a
+# plan leaving its start at departure (minutes after midnight) and driving at speed (miles per hour or a SpeedProfile).
+# O(n) run-time complexity.
+def late_stops(plan, deadlines, departure, speed=SPEED_MPH):
+    profile = as_profile(speed)
+    late = []
+    for v, miles in zip(plan.stops, plan.arrival_miles):
+        arrival = profile.arrival(departure, miles)
+        if arrival > deadlines.get(v, _INF) + EPSILON:
+            late.append((v, arrival, deadlines[v]))
+    return late
+
+
+# Deadline-aware route construction: the stops are taken earliest deadline first and each is inserted where it adds
+# the fewest miles without making it or any stop already placed late. A stop that cannot be on time is placed where it
+# is least late without delaying the others past their deadlines (or, failing that, where it adds the fewest miles),
+# and is not treated as having a deadline afterwards. Returns the route and the set of such stops.
+# O(n^2 log n) run-time complexity.
+def _construct(d, stops, start, depot, departure, deadlines, per_mile):
+    late = set()
+
+    def deadline(v):
+        return _INF if v in late else deadlines.get(v, _INF)
+
+    route = []
+    for v in sorted(stops, key=lambda v: (deadlines.get(v, _INF), d(start, v))):
+        schedule = _Schedule(d, route, start, depot, departure, deadline, per_mile)
+        best = None
+        for i in range(len(route) + 1):
+            extra, ok = schedule.insertion(v, i)
+            if ok and (best is None or extra < best[0]):
+                best = (extra, i)
+        if best is None:
+            late.add(v)
+            keeps = [i for i in range(len(route) + 1) if schedule.insertion(v, i)[1]]
+            if keeps:
+                best = (0, min(keeps, key=lambda i: schedule._time(i - 1) + d(schedule._prev(i), v) * per_mile))
+            else:
+                best = min((schedule.insertion(v, i)[0], i) for i in range(len(route) + 1))
+        route.insert(best[1], v)
+    return route, late
+
+
+# Local search that keeps deadlines: moves a stop elsewhere (relocate) or swaps two stops while that shortens the
+# route and the O(1) schedule checks say no deadline (other than those of stops already late) is missed.
+# O(max_iterations * n^2) run-time complexity.
+def _improve(d, route, start, depot, departure, deadlines, late, per_mile, time_budget, max_iterations):
+    def deadline(v):
+        return _INF if v in late else deadlines.get(v, _INF)
+
+    stop_at = time.perf_counter() + time_budget
+    for iteration in range(max_iterations):
+        if time.perf_counter() > stop_at:
+            break
+        schedule = _Schedule(d, route, start, depot, departure, deadline, per_mile)
+        n = len(route)
+        best = None
+        for i in range(n):
+            for k in range(n + 1):
+                if k in (i, i + 1):
+                    continue
+                change, ok = schedule.relocation(i, k)
+                if ok and change < -EPSILON and (best is None or change < best[0]):
+                    best = (change, 'move', i, k)
+            for j in range(i + 1, n):
+                change, ok = schedule.swap(i, j)
+                if ok and change < -EPSILON and (best is None or change < best[0]):
+                    best = (change, 'swap', i, j)
+        if instrument.ENABLED:
+            instrument.count('windows.iterations')
+        if best is None:
+            break
+        change, kind, i, k = best
+        if kind == 'swap':
+            route[i], route[k] = route[k], route[i]
+        else:
+            v = route.pop(i)
+            route.insert(k if k < i else k - 1, v)
+    return route
+
+
+# Time-window aware version of plan_route. deadlines maps vertices to the latest arrival (minutes after midnight) and
+# departure is when the trip leaves start (depot unless given); speed is in miles per hour or a SpeedProfile. A truck
+# drives on without waiting, so its arrival time only grows with the miles driven, and each deadline is turned into
+# the miles that can be driven by then; the schedule checks then work in miles, exactly even when the speed changes
+# through the day. The plain shortest route
+# from plan_route is kept whenever it already reaches every stop by its deadline. Otherwise a route is built earliest
+# deadline first with cheapest feasible insertion and then shortened by relocate and swap moves that keep every
+# deadline, each checked in O(1); the route with fewer late stops (then fewer miles) is returned. Use late_stops to
+# report any stop that still cannot be reached in time. plain may pass in the plan_route result when already known.
+# O(n^2 log n + max_iterations * n^2) run-time complexity.
+def plan_route_windows(dist, stops, deadlines, departure, depot=0, improve=True, start=None, speed=SPEED_MPH,
+                       time_budget=0.05, max_iterations=200, plain=None):
+    profile = as_profile(speed)
+    stops = list(dict.fromkeys(stops))
+    if plain is None:
+        plain = plan_route(dist, stops, depot, improve, start)
+    plain_late = late_stops(plain, deadlines, departure, profile)
+    if not plain_late:
+        return plain
+
+    origin = depot if start is None else start
+    budgets = {v: profile.miles_between(departure, deadline) for v, deadline in deadlines.items()}
+    route, late = _construct(dist.get, stops, origin, depot, 0.0, budgets, 1.0)
+    if improve:
+        route = _improve(dist.get, route, origin, depot, 0.0, budgets, late, 1.0, time_budget, max_iterations)
+
+    arrival_miles = []
+    miles = 0.0
+    current = origin
+    for stop in route:
+        miles += dist.get(current, stop)
+        arrival_miles.append(miles)
+        current = stop
+    plan = RoutePlan(route, arrival_miles, dist.get(current, depot), depot, start)
+    if (len(late_stops(plan, deadlines, departure, profile)), plan.total_distance) < \
+            (len(plain_late), plain.total_distance):
+        return plan
+    return plain